@@ -0,0 +1,105 @@
+"""Measures the CPU cost of the controller handlers without a database or Slack.
+
+Run with `poetry run python benchmarks/benchmark_controller_handlers.py`.
+
+Schedules are kept in an InMemoryScheduleAccess and the Slack client is a mock, so the timings only contain the work
+of the bot itself: loading schedules, rendering the app home and advancing rotations.
+"""
+
+import argparse
+import datetime
+import time
+import uuid
+from typing import List, Callable
+from unittest import mock
+
+from slack_sdk import WebClient
+
+from sched_slack_bot.controller import AppController
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.model.app_home_state import AppHomeState
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.utils.slack_typing_stubs import SlackEvent, SlackView
+
+
+def _create_schedules(count: int) -> List[Schedule]:
+    first_rotation = datetime.datetime.now() + datetime.timedelta(hours=1)
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Schedule {i}",
+            # every user is a member of a few schedules
+            members=[f"U{i % 100}", f"U{(i + 1) % 100}"],
+            next_rotation=first_rotation + datetime.timedelta(minutes=i),
+            time_between_rotations=datetime.timedelta(days=7),
+            channel_id_to_notify_in="C1",
+            created_by="benchmark",
+        )
+        for i in range(count)
+    ]
+
+
+def _create_controller(schedules: List[Schedule]) -> AppController:
+    schedule_access = InMemoryScheduleAccess()
+    schedule_access.bulk_save_schedules(schedules=schedules)
+
+    controller = AppController()
+    controller._schedule_access = schedule_access
+    controller._slack_client = mock.MagicMock(spec=WebClient)
+
+    return controller
+
+
+def _benchmark(name: str, size: int, repetitions: int, handler: Callable[[int], None], warm_up: bool = False) -> None:
+    # the first calls fill the rendered app home cache, the steady state is measured afterwards
+    for i in range(repetitions if warm_up else 0):
+        handler(i)
+
+    start = time.perf_counter()
+    for i in range(repetitions):
+        handler(i)
+    seconds = time.perf_counter() - start
+
+    print(f"{name:<22} {size:>9} {repetitions:>11} {seconds / repetitions * 1000:>11.3f}ms {repetitions / seconds:>10.0f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repetitions", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'handler':<22} {'schedules':>9} {'repetitions':>11} {'per call':>13} {'rate':>12}")
+    for size in args.sizes:
+        schedules = _create_schedules(count=size)
+        controller = _create_controller(schedules=schedules)
+
+        _benchmark(
+            name="app_home_opened",
+            size=size,
+            repetitions=args.repetitions,
+            handler=lambda i: controller.handle_app_home_opened(event=SlackEvent(user=f"U{i % 100}")),
+            warm_up=True,
+        )
+        _benchmark(
+            name="app_home_opened_all",
+            size=size,
+            repetitions=args.repetitions,
+            handler=lambda i: controller.handle_app_home_opened(
+                event=SlackEvent(
+                    user="all",
+                    view=SlackView(private_metadata=AppHomeState(show_all_schedules=True).as_private_metadata()),
+                )
+            ),
+            warm_up=True,
+        )
+        _benchmark(
+            name="reminder_executed",
+            size=size,
+            repetitions=min(args.repetitions, size),
+            handler=lambda i: controller.handle_reminder_executed(next_schedule=schedules[i].next_schedule),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compares arming and cancelling reminders across the reminder scheduler backends.
+
+Run with `poetry run python benchmarks/benchmark_reminder_schedulers.py`.
+
+The timer backend starts one OS thread per schedule, so it is skipped for sizes above `--max-timer-schedules`,
+most systems cannot start hundreds of thousands of threads.
+"""
+
+import argparse
+import datetime
+import gc
+import resource
+import threading
+import time
+import uuid
+from typing import List
+from unittest import mock
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.scheduler_type import ReminderSchedulerType, get_reminder_scheduler
+from sched_slack_bot.reminder.sender import ReminderSender
+
+BACKENDS = [ReminderSchedulerType.TIMER, ReminderSchedulerType.HEAP, ReminderSchedulerType.TIMING_WHEEL]
+
+
+def _create_schedules(count: int) -> List[Schedule]:
+    # spread over ~60 days so every wheel of the timing wheel gets used
+    first_rotation = datetime.datetime.now() + datetime.timedelta(hours=1)
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Schedule {i}",
+            members=["U1", "U2"],
+            next_rotation=first_rotation + datetime.timedelta(minutes=i % (60 * 24 * 60)),
+            time_between_rotations=datetime.timedelta(days=7),
+            channel_id_to_notify_in="C1",
+            created_by="benchmark",
+        )
+        for i in range(count)
+    ]
+
+
+def _get_rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        resident_pages = int(statm.read().split()[1])
+
+    return resident_pages * resource.getpagesize() / 1024 / 1024
+
+
+def _benchmark(scheduler_type: ReminderSchedulerType, schedules: List[Schedule]) -> None:
+    reminder_sender = mock.MagicMock(spec=ReminderSender)
+    scheduler = get_reminder_scheduler(scheduler_type=scheduler_type)
+
+    gc.collect()
+    rss_before = _get_rss_mb()
+    threads_before = threading.active_count()
+
+    start = time.perf_counter()
+    scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+    arm_seconds = time.perf_counter() - start
+
+    rss_after = _get_rss_mb()
+    threads_after = threading.active_count()
+
+    start = time.perf_counter()
+    for schedule in schedules:
+        scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+    cancel_seconds = time.perf_counter() - start
+
+    # cancelled timer threads need a moment to exit, otherwise they skew the thread count of the next backend
+    while threading.active_count() > threads_before + 1:
+        time.sleep(0.01)
+
+    print(
+        f"{scheduler_type:<13} {len(schedules):>9} {arm_seconds:>9.3f}s {cancel_seconds:>9.3f}s"
+        f" {len(schedules) / arm_seconds:>12.0f}/s {threads_after - threads_before:>9} {rss_after - rss_before:>9.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-timer-schedules", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'backend':<13} {'schedules':>9} {'arm':>10} {'cancel':>10} {'arm rate':>14} {'threads':>9} {'rss':>11}")
+    for size in args.sizes:
+        schedules = _create_schedules(count=size)
+        for scheduler_type in BACKENDS:
+            if scheduler_type == ReminderSchedulerType.TIMER and size > args.max_timer_schedules:
+                print(f"{scheduler_type:<13} {size:>9} skipped, would start {size} threads")
+                continue
+
+            _benchmark(scheduler_type=scheduler_type, schedules=schedules)
+
+
+if __name__ == "__main__":
+    main()
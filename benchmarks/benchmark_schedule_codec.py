@@ -0,0 +1,104 @@
+"""Compares decoding schedule documents with the previous strptime based decoding.
+
+Run with `poetry run python benchmarks/benchmark_schedule_codec.py`.
+
+Documents with string dates are what the sqlite storage, snapshots and not yet migrated mongo documents contain,
+documents with native dates are what mongo returns after the migration.
+"""
+
+import argparse
+import datetime
+import gc
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import SERIALIZATION_DATE_FORMAT, format_date, decode_schedule, decode_schedules
+
+
+def _decode_previous(documents: List[Dict[str, Any]]) -> List[Schedule]:
+    schedules = []
+    for document in documents:
+        next_rotation = document["next_rotation"]
+        if isinstance(next_rotation, str):
+            next_rotation = datetime.datetime.strptime(next_rotation, SERIALIZATION_DATE_FORMAT)
+
+        schedules.append(
+            Schedule(
+                id=document["id"],
+                display_name=document["display_name"],
+                members=document["members"],
+                next_rotation=next_rotation,
+                time_between_rotations=datetime.timedelta(seconds=document["time_between_rotations"]),
+                channel_id_to_notify_in=document["channel_id_to_notify_in"],
+                created_by=document["created_by"],
+                current_index=document["current_index"],
+                version=document.get("version", 0),
+            )
+        )
+
+    return schedules
+
+
+def _decode_one_by_one(documents: List[Dict[str, Any]]) -> List[Schedule]:
+    return [decode_schedule(document=d) for d in documents]
+
+
+def _decode_page(documents: List[Dict[str, Any]]) -> List[Schedule]:
+    return decode_schedules(documents=documents)
+
+
+def _create_documents(count: int, string_dates: bool) -> List[Dict[str, Any]]:
+    first_rotation = datetime.datetime.now()
+    documents = [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Schedule {i}",
+            members=["U1", "U2", "U3"],
+            next_rotation=first_rotation + datetime.timedelta(minutes=i),
+            time_between_rotations=datetime.timedelta(days=7),
+            channel_id_to_notify_in="C1",
+            created_by="benchmark",
+        ).as_json()
+        for i in range(count)
+    ]
+    if string_dates:
+        for document in documents:
+            document["next_rotation"] = format_date(date=document["next_rotation"])
+
+    return documents
+
+
+def _benchmark(
+    name: str, documents: List[Dict[str, Any]], decode: Callable[[List[Dict[str, Any]]], List[Schedule]], repetitions: int
+) -> None:
+    # the fastest run is the least disturbed by garbage collections of the previously decoded schedules
+    seconds = float("inf")
+    for _ in range(repetitions):
+        gc.collect()
+        start = time.perf_counter()
+        decode(documents)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    print(f"{name:<28} {len(documents):>9} {seconds:>9.3f}s {len(documents) / seconds:>12.0f}/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'decoding':<28} {'documents':>9} {'time':>10} {'throughput':>14}")
+    for string_dates in (True, False):
+        documents = _create_documents(count=args.documents, string_dates=string_dates)
+        dates = "string dates" if string_dates else "native dates"
+
+        _benchmark(name=f"previous, {dates}", documents=documents, decode=_decode_previous, repetitions=args.repetitions)
+        _benchmark(name=f"codec, {dates}", documents=documents, decode=_decode_one_by_one, repetitions=args.repetitions)
+        _benchmark(name=f"codec page, {dates}", documents=documents, decode=_decode_page, repetitions=args.repetitions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Compares rendering the create and edit schedule dialog from templates with building it from the block models.
+
+Run with `poetry run python benchmarks/benchmark_schedule_dialog.py`.
+
+Built dialogs are serialized as well, like the web client does before sending them, the rendered templates are
+already serialized. The dialog has to be opened within 3 seconds of the click that triggered it.
+"""
+
+import argparse
+import datetime
+import gc
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.views.schedule_dialog import get_edit_schedule_block, ScheduleDialogCallback
+from sched_slack_bot.views.schedule_dialog_template import get_schedule_dialog_view
+
+
+def _build(schedule: Optional[Schedule], callback: ScheduleDialogCallback) -> Any:
+    return get_edit_schedule_block(schedule=schedule, callback=callback).to_dict()
+
+
+def _render(schedule: Optional[Schedule], callback: ScheduleDialogCallback) -> Any:
+    return get_schedule_dialog_view(schedule=schedule, callback=callback)
+
+
+def _benchmark(
+    name: str,
+    schedule: Optional[Schedule],
+    callback: ScheduleDialogCallback,
+    create_view: Callable[[Optional[Schedule], ScheduleDialogCallback], Any],
+    dialogs: int,
+    repetitions: int,
+) -> float:
+    # the fastest run is the least disturbed by garbage collections
+    seconds = float("inf")
+    for _ in range(repetitions):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(dialogs):
+            create_view(schedule, callback)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    print(f"{name:<18} {dialogs:>7} {seconds / dialogs * 1000:>11.3f}ms {dialogs / seconds:>10.0f}/s")
+
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dialogs", type=int, default=1_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    schedule = Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Benchmark Schedule",
+        members=["U1", "U2", "U3"],
+        next_rotation=datetime.datetime.now() + datetime.timedelta(hours=1),
+        time_between_rotations=datetime.timedelta(days=7),
+        channel_id_to_notify_in="C1",
+        created_by="benchmark",
+    )
+
+    print(f"{'dialog':<18} {'dialogs':>7} {'per dialog':>13} {'rate':>12}")
+    for dialog, dialog_schedule, callback in (
+        ("create", None, ScheduleDialogCallback.CREATE_DIALOG),
+        ("edit", schedule, ScheduleDialogCallback.EDIT_DIALOG),
+    ):
+        built_seconds = _benchmark(
+            name=f"{dialog}, built",
+            schedule=dialog_schedule,
+            callback=callback,
+            create_view=_build,
+            dialogs=args.dialogs,
+            repetitions=args.repetitions,
+        )
+        rendered_seconds = _benchmark(
+            name=f"{dialog}, template",
+            schedule=dialog_schedule,
+            callback=callback,
+            create_view=_render,
+            dialogs=args.dialogs,
+            repetitions=args.repetitions,
+        )
+        print(f"{dialog} speedup {built_seconds / rendered_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
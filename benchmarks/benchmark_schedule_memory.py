@@ -0,0 +1,94 @@
+"""Compares the memory of resident schedules and reminders with the previous representation.
+
+Run with `poetry run python benchmarks/benchmark_schedule_memory.py`.
+
+The previous representation was a frozen dataclass with an instance dict and a list of members, wrapped by a
+reminder with an instance dict. Member ids are created per schedule, like they are when decoded from the database.
+"""
+
+import argparse
+import dataclasses
+import datetime
+import gc
+import tracemalloc
+import uuid
+from typing import List, Any, Callable
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+
+
+@dataclasses.dataclass(frozen=True)
+class _PreviousSchedule:
+    id: str
+    display_name: str
+    members: List[str]
+    next_rotation: datetime.datetime
+    time_between_rotations: datetime.timedelta
+    channel_id_to_notify_in: str
+    created_by: str
+    current_index: int = 0
+    version: int = 0
+
+
+class _PreviousReminder:
+    def __init__(self, schedule: Any):
+        self._schedule = schedule
+
+
+def _create_schedules(count: int, users: int, schedule_type: Callable[..., Any]) -> List[Any]:
+    first_rotation = datetime.datetime.now()
+    return [
+        schedule_type(
+            id=str(uuid.uuid4()),
+            display_name=f"Schedule {i}",
+            # formatted per schedule, so equal ids are separate strings unless they are interned
+            members=[f"U{(i + j) % users:010d}" for j in range(4)],
+            next_rotation=first_rotation + datetime.timedelta(minutes=i),
+            time_between_rotations=datetime.timedelta(days=7),
+            channel_id_to_notify_in="C1",
+            created_by="benchmark",
+        )
+        for i in range(count)
+    ]
+
+
+def _measure(name: str, count: int, users: int, schedule_type: Callable[..., Any], reminder_type: Callable[..., Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+
+    schedules = _create_schedules(count=count, users=users, schedule_type=schedule_type)
+    reminders = [reminder_type(schedule=s) for s in schedules]
+
+    gc.collect()
+    allocated_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    print(f"{name:<10} {count:>9} {allocated_mb:>9.1f}MB {allocated_mb * 1024 * 1024 / len(reminders):>12.0f}B")
+
+    return allocated_mb
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedules", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'model':<10} {'schedules':>9} {'allocated':>11} {'per schedule':>13}")
+    previous_mb = _measure(
+        name="previous",
+        count=args.schedules,
+        users=args.users,
+        schedule_type=_PreviousSchedule,
+        reminder_type=_PreviousReminder,
+    )
+    current_mb = _measure(
+        name="current", count=args.schedules, users=args.users, schedule_type=Schedule, reminder_type=Reminder
+    )
+
+    print(f"saved {previous_mb - current_mb:.1f}MB ({1 - current_mb / previous_mb:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
 
 from fastapi import FastAPI, Request, Response
 from slack_bolt.adapter.fastapi import SlackRequestHandler
@@ -13,7 +15,16 @@ controller = AppController()
 controller.start()
 
 app_handler = SlackRequestHandler(controller.app)
-api = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await controller.start_async_reminder_scheduler()
+    yield
+    controller.stop()
+
+
+api = FastAPI(lifespan=lifespan)
 
 
 @api.post("/slack/events")
@@ -24,3 +35,13 @@ async def endpoint(req: Request) -> Response:
 @api.get("/health")
 async def health(req: Request) -> Response:
     return Response(status_code=200)
+
+
+@api.get("/metrics")
+async def metrics(req: Request) -> Dict[str, Dict[str, int]]:
+    return controller.get_metrics()
+
+
+@api.get("/on-duty")
+def on_duty(req: Request) -> Dict[str, str]:
+    return controller.get_members_on_duty()
@@ -1,27 +1,71 @@
+import asyncio
 import dataclasses
+import datetime
+import itertools
+import json
 import logging
 import os
-from typing import Optional
+import threading
+from typing import Optional, List, Dict, Tuple, Set, Any
 
 from slack_bolt import App, Ack
 from slack_bolt.request.payload_utils import is_view_submission
 from slack_sdk import WebClient
-
+from slack_sdk.web.async_client import AsyncWebClient
+
+from sched_slack_bot.data.async_schedule_access import AsyncScheduleAccess
+from sched_slack_bot.data.cached_schedule_access import CachedScheduleAccess
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.data.mongo.async_mongo_schedule_access import (
+    AsyncMongoScheduleAccess,
+    DEFAULT_MAX_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+)
+from sched_slack_bot.data.mongo.mongo_reminder_job_access import MongoReminderJobAccess
+from sched_slack_bot.data.mongo.mongo_replica_membership_access import MongoReplicaMembershipAccess
 from sched_slack_bot.data.mongo.mongo_schedule_access import MongoScheduleAccess
 from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.data.schedule_storage_type import ScheduleStorageType
+from sched_slack_bot.data.sqlite.sqlite_schedule_access import SqliteScheduleAccess
+from sched_slack_bot.model.app_home_state import AppHomeState
 from sched_slack_bot.model.reminder import Reminder
 from sched_slack_bot.model.schedule import Schedule
-from sched_slack_bot.reminder.scheduler import ReminderScheduler
-from sched_slack_bot.reminder.slack_sender import SlackReminderSender
-from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor, SchedulePage, get_schedule_page
+from sched_slack_bot.reminder.async_scheduler import AsyncReminderScheduler, AsyncReminderExecutedCallback
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler
+from sched_slack_bot.reminder.scheduler_type import ReminderSchedulerType, get_reminder_scheduler
+from sched_slack_bot.reminder.sender import AsyncReminderSender
+from sched_slack_bot.reminder.sharded_scheduler import ShardedReminderScheduler
+from sched_slack_bot.reminder.slack_sender import SlackReminderSender, AsyncSlackReminderSender
+from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedules_from_the_past
+from sched_slack_bot.utils.rotation_calendar import RotationCalendar
 from sched_slack_bot.utils.slack_typing_stubs import SlackBody, SlackEvent
-from sched_slack_bot.views.app_home import get_app_home_view, CREATE_BUTTON_ACTION_ID
+from sched_slack_bot.views.app_home import (
+    CREATE_BUTTON_ACTION_ID,
+    SHOW_MY_SCHEDULES_ACTION_ID,
+    SHOW_ALL_SCHEDULES_ACTION_ID,
+    SORT_BY_NEXT_ROTATION_ACTION_ID,
+    SORT_BY_DISPLAY_NAME_ACTION_ID,
+    PREVIOUS_PAGE_ACTION_ID,
+    NEXT_PAGE_ACTION_ID,
+    SCHEDULES_PER_PAGE,
+)
+from sched_slack_bot.views.app_home_publisher import AppHomePublisher, DEFAULT_PUBLISH_WINDOW
+from sched_slack_bot.views.app_home_render_cache import AppHomeRenderCache
 from sched_slack_bot.views.reminder_blocks import SKIP_CURRENT_MEMBER_ACTION_ID
 from sched_slack_bot.views.schedule_blocks import DELETE_SCHEDULE_ACTION_ID, EDIT_SCHEDULE_ACTION_ID
-from sched_slack_bot.views.schedule_dialog import get_edit_schedule_block, ScheduleDialogCallback
+from sched_slack_bot.views.schedule_dialog import ScheduleDialogCallback
+from sched_slack_bot.views.schedule_dialog_template import get_schedule_dialog_view
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REMINDER_QUEUE_SIZE = 1000
+SAVED_SCHEDULES_BATCH_SIZE = 1000
+DEFAULT_SQLITE_PATH = "sched_slack_bot.sqlite3"
+ROTATION_CALENDAR_RELOAD_INTERVAL = datetime.timedelta(seconds=30)
+
 
 class UnstartedControllerException(Exception):
     pass
@@ -31,27 +75,169 @@ class AppController:
     def __init__(self) -> None:
         self._schedule_access: Optional[ScheduleAccess] = None
         self._slack_client: Optional[WebClient] = None
-        self._reminder_scheduler: Optional[ReminderScheduler] = None
+        self._reminder_scheduler: Optional[BaseReminderScheduler] = None
+        self._reminder_executor: Optional[ReminderExecutor] = None
+        self._reminder_horizon: Optional[ReminderHorizon] = None
+        self._schedule_cache: Optional[CachedScheduleAccess] = None
         self._reminder_sender: Optional[SlackReminderSender] = None
+        self._async_reminder_scheduler: Optional[AsyncReminderScheduler] = None
+        self._async_reminder_sender: Optional[AsyncReminderSender] = None
+        self._async_schedule_access: Optional[AsyncScheduleAccess] = None
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
         self._app: Optional[App] = None
+        # the app home state each user acted on last, handed to the deferred render. The state is published with the
+        # app home and sent back with every action on it, so any replica continues from what the user is looking at
+        self._app_home_states: Dict[str, AppHomeState] = dict()
+        self._app_home_render_cache = AppHomeRenderCache()
+        # users whose schedules created before creators were stored by id were migrated by this process
+        self._users_with_migrated_schedules: Set[str] = set()
+        # who is on duty when, kept up to date with the changes of this process and reloaded to pick up other replicas'
+        self._rotation_calendar = RotationCalendar()
+        self._rotation_calendar_lock = threading.Lock()
+        self._rotation_calendar_loaded_at: Optional[datetime.datetime] = None
+        # publishes immediately until started with the configured window
+        self._app_home_publisher = AppHomePublisher(
+            render_view=self._render_app_home, publish_view=self._publish_app_home, window=datetime.timedelta(0)
+        )
 
     def start(self) -> None:
         mongo_url = os.environ.get("MONGO_URL")
         slack_bot_token = os.environ.get("SLACK_BOT_TOKEN")
         slack_signing_secret = os.environ.get("SLACK_SIGNING_SECRET")
+        reminder_scheduler_type = ReminderSchedulerType(os.environ.get("REMINDER_SCHEDULER", ReminderSchedulerType.TIMER))
+        reminder_workers = os.environ.get("REMINDER_WORKERS")
+        reminder_queue_size = os.environ.get("REMINDER_QUEUE_SIZE", DEFAULT_REMINDER_QUEUE_SIZE)
+        reminder_horizon_minutes = os.environ.get("REMINDER_HORIZON_MINUTES")
+        reminder_sharding = os.environ.get("REMINDER_SHARDING", "false")
+        schedule_cache = os.environ.get("SCHEDULE_CACHE", "false")
+        mongo_max_pool_size = os.environ.get("MONGO_MAX_POOL_SIZE", DEFAULT_MAX_POOL_SIZE)
+        mongo_timeout_seconds = os.environ.get("MONGO_TIMEOUT_SECONDS", DEFAULT_TIMEOUT.total_seconds())
+        schedule_storage_type = ScheduleStorageType(os.environ.get("SCHEDULE_STORAGE", ScheduleStorageType.MONGO))
+        sqlite_path = os.environ.get("SQLITE_PATH", DEFAULT_SQLITE_PATH)
+        schedule_snapshot_path = os.environ.get("SCHEDULE_SNAPSHOT_PATH")
+        app_home_publish_window_ms = os.environ.get(
+            "APP_HOME_PUBLISH_WINDOW_MS", DEFAULT_PUBLISH_WINDOW / datetime.timedelta(milliseconds=1)
+        )
 
-        if mongo_url is None or slack_bot_token is None or slack_signing_secret is None:
-            raise RuntimeError("Environment variables 'MONGO_URL', 'SLACK_BOT_TOKEN' and 'SLACK_SIGNING_SECRET' are required")
-
-        self._schedule_access = MongoScheduleAccess(mongo_url=mongo_url)
+        if slack_bot_token is None or slack_signing_secret is None:
+            raise RuntimeError("Environment variables 'SLACK_BOT_TOKEN' and 'SLACK_SIGNING_SECRET' are required")
+
+        storage_schedule_access: ScheduleAccess
+        if schedule_storage_type == ScheduleStorageType.SQLITE:
+            storage_schedule_access = SqliteScheduleAccess(database_path=sqlite_path)
+        elif schedule_storage_type == ScheduleStorageType.MEMORY:
+            in_memory_schedule_access = InMemoryScheduleAccess(snapshot_path=schedule_snapshot_path)
+            in_memory_schedule_access.start_snapshots()
+            storage_schedule_access = in_memory_schedule_access
+        else:
+            mongo_schedule_access = MongoScheduleAccess(mongo_url=self._require_mongo_url(mongo_url=mongo_url))
+            mongo_schedule_access.ensure_indexes()
+            # schedules are readable while they are migrated, so startup does not have to wait for it
+            threading.Thread(
+                target=mongo_schedule_access.migrate_string_dates, name="schedule-date-migration", daemon=True
+            ).start()
+            storage_schedule_access = mongo_schedule_access
+        self._schedule_access = storage_schedule_access
+        if schedule_cache == "true":
+            self._schedule_cache = CachedScheduleAccess(schedule_access=storage_schedule_access)
+            self._schedule_cache.start_watching()
+            self._schedule_access = self._schedule_cache
         self._slack_client = WebClient(token=slack_bot_token)
         self._reminder_sender = SlackReminderSender(client=self._slack_client)
-        self._reminder_scheduler = ReminderScheduler(reminder_executed_callback=self.handle_reminder_executed)
+        # other replicas publish app homes as well, the views this one published last are not necessarily shown
+        multiple_replicas = reminder_sharding == "true" or reminder_scheduler_type == ReminderSchedulerType.DISTRIBUTED
+        self._app_home_publisher = AppHomePublisher(
+            render_view=self._render_app_home,
+            publish_view=self._publish_app_home,
+            window=datetime.timedelta(milliseconds=float(app_home_publish_window_ms)),
+            skip_unchanged_views=not multiple_replicas,
+        )
         self._app = App(name="sched_slack_bot", token=slack_bot_token, signing_secret=slack_signing_secret, logger=logger)
 
-        self._start_all_saved_schedules()
+        if reminder_horizon_minutes is not None:
+            self._reminder_horizon = ReminderHorizon(horizon=datetime.timedelta(minutes=int(reminder_horizon_minutes)))
+
+        if reminder_scheduler_type == ReminderSchedulerType.ASYNCIO:
+            # reminders are started with start_async_reminder_scheduler as soon as the event loop is running
+            self._async_reminder_sender = AsyncSlackReminderSender(client=AsyncWebClient(token=slack_bot_token))
+            # other storages are local, their schedules are read and written on the event loop with the synchronous access
+            if schedule_storage_type == ScheduleStorageType.MONGO:
+                self._async_schedule_access = AsyncMongoScheduleAccess(
+                    mongo_url=self._require_mongo_url(mongo_url=mongo_url),
+                    max_pool_size=int(mongo_max_pool_size),
+                    timeout=datetime.timedelta(seconds=float(mongo_timeout_seconds)),
+                )
+        else:
+            reminder_job_access = None
+            if reminder_scheduler_type == ReminderSchedulerType.DISTRIBUTED:
+                reminder_job_access = MongoReminderJobAccess(mongo_url=self._require_mongo_url(mongo_url=mongo_url))
+                reminder_job_access.create_indexes()
+
+            if reminder_workers is not None:
+                self._reminder_executor = ReminderExecutor(
+                    max_workers=int(reminder_workers), max_queue_size=int(reminder_queue_size)
+                )
+            self._reminder_scheduler = get_reminder_scheduler(
+                scheduler_type=reminder_scheduler_type,
+                reminder_executed_callback=self.handle_reminder_executed,
+                reminder_executor=self._reminder_executor,
+                reminder_job_access=reminder_job_access,
+                reminder_horizon=self._reminder_horizon,
+            )
+            if reminder_sharding == "true":
+                self._reminder_scheduler = ShardedReminderScheduler(
+                    reminder_scheduler=self._reminder_scheduler,
+                    replica_membership_access=MongoReplicaMembershipAccess(
+                        mongo_url=self._require_mongo_url(mongo_url=mongo_url)
+                    ),
+                    schedule_access=self._schedule_access,
+                    reminder_horizon=self._reminder_horizon,
+                )
+            self._start_all_saved_schedules()
+
         self._register_listeners()
 
+    async def start_async_reminder_scheduler(self) -> None:
+        if self._async_reminder_sender is None:
+            return
+
+        reminder_executed_callback: AsyncReminderExecutedCallback = self.handle_reminder_executed
+        if self._async_schedule_access is not None:
+            reminder_executed_callback = self.handle_reminder_executed_async
+
+        self._event_loop = asyncio.get_running_loop()
+        self._async_reminder_scheduler = AsyncReminderScheduler(
+            loop=self._event_loop,
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_horizon=self._reminder_horizon,
+        )
+
+        if self._async_schedule_access is None:
+            self._start_all_saved_schedules()
+            return
+
+        if self._reminder_horizon is None:
+            saved_schedules = await self._async_schedule_access.get_available_schedules()
+        else:
+            saved_schedules = await self._async_schedule_access.get_schedules_due_before(
+                before=self._reminder_horizon.due_before
+            )
+
+        schedules_to_start, fixed_schedules = self._fix_saved_schedules(saved_schedules=saved_schedules)
+        if len(fixed_schedules) > 0:
+            await self._async_schedule_access.bulk_update_schedules(schedules=fixed_schedules)
+
+        self._start_fixed_schedules(schedules_to_start=schedules_to_start)
+        self._start_reminder_horizon()
+
+    def stop(self) -> None:
+        if self._reminder_horizon is not None:
+            self._reminder_horizon.stop()
+
+        # other replicas take over the reminders of this one right away instead of waiting for its heartbeats to time out
+        if isinstance(self._reminder_scheduler, ShardedReminderScheduler):
+            self._reminder_scheduler.stop()
+
     @property
     def schedule_access(self) -> ScheduleAccess:
         if self._schedule_access is None:
@@ -67,7 +253,7 @@ class AppController:
         return self._slack_client
 
     @property
-    def reminder_scheduler(self) -> ReminderScheduler:
+    def reminder_scheduler(self) -> BaseReminderScheduler:
         if self._reminder_scheduler is None:
             raise UnstartedControllerException("Controller not yet started, please call start before!")
 
@@ -87,24 +273,140 @@ class AppController:
 
         return self._app
 
+    def get_metrics(self) -> Dict[str, Dict[str, int]]:
+        metrics: Dict[str, Dict[str, int]] = dict()
+
+        if self._reminder_executor is not None:
+            metrics["reminder_executor"] = dataclasses.asdict(self._reminder_executor.metrics)
+
+        if self._schedule_cache is not None:
+            metrics["schedule_cache"] = dataclasses.asdict(self._schedule_cache.metrics)
+
+        metrics["app_home_publisher"] = dataclasses.asdict(self._app_home_publisher.metrics)
+
+        return metrics
+
+    def get_members_on_duty(self, at: Optional[datetime.datetime] = None) -> Dict[str, str]:
+        return self._get_rotation_calendar().get_members_on_duty(
+            at=datetime.datetime.now(tz=datetime.timezone.utc) if at is None else at
+        )
+
+    def _get_rotation_calendar(self) -> RotationCalendar:
+        with self._rotation_calendar_lock:
+            now = datetime.datetime.now(tz=datetime.timezone.utc)
+            if (
+                self._rotation_calendar_loaded_at is None
+                or now - self._rotation_calendar_loaded_at >= ROTATION_CALENDAR_RELOAD_INTERVAL
+            ):
+                self._rotation_calendar = RotationCalendar(
+                    schedules=self.schedule_access.iter_schedules(batch_size=SAVED_SCHEDULES_BATCH_SIZE)
+                )
+                self._rotation_calendar_loaded_at = now
+
+            return self._rotation_calendar
+
     def _start_all_saved_schedules(self) -> None:
-        saved_schedules = self.schedule_access.get_available_schedules()
+        if self._reminder_horizon is None:
+            saved_schedules = self.schedule_access.iter_schedules(batch_size=SAVED_SCHEDULES_BATCH_SIZE)
+        else:
+            saved_schedules = iter(self.schedule_access.get_schedules_due_before(before=self._reminder_horizon.due_before))
+
+        # saved schedules are fixed and started batch by batch, so they never have to be held in memory all at once
+        while len(saved_schedules_batch := list(itertools.islice(saved_schedules, SAVED_SCHEDULES_BATCH_SIZE))) > 0:
+            schedules_to_start, fixed_schedules = self._fix_saved_schedules(saved_schedules=saved_schedules_batch)
+            if len(fixed_schedules) > 0:
+                self.schedule_access.bulk_update_schedules(schedules=fixed_schedules)
+
+            self._start_fixed_schedules(schedules_to_start=schedules_to_start)
+
+        self._start_reminder_horizon()
 
+    @staticmethod
+    def _fix_saved_schedules(saved_schedules: List[Schedule]) -> Tuple[List[Schedule], List[Schedule]]:
         logger.info(f"Found {len(saved_schedules)} schedules to start reminders for!")
 
-        schedules_to_start = list(map(fix_schedule_from_the_past, saved_schedules))
+        schedules_to_start = fix_schedules_from_the_past(schedules=saved_schedules)
+
+        # only schedules that were in the past have to be written back
+        fixed_schedules = [fixed for saved, fixed in zip(saved_schedules, schedules_to_start) if fixed != saved]
 
-        for schedule_to_update in schedules_to_start:
-            self.schedule_access.update_schedule(schedule_id_to_update=schedule_to_update.id, new_schedule=schedule_to_update)
+        return schedules_to_start, fixed_schedules
 
-        self.reminder_scheduler.schedule_all_reminders(schedules=schedules_to_start, reminder_sender=self.reminder_sender)
+    def _start_fixed_schedules(self, schedules_to_start: List[Schedule]) -> None:
+        self._schedule_all_reminders(schedules=schedules_to_start)
 
         logger.info(f"Started {len(schedules_to_start)} reminders!")
 
+    def _start_reminder_horizon(self) -> None:
+        if self._reminder_horizon is not None:
+            self._reminder_horizon.start(refill=self._start_reminders_due_before)
+
+    def _start_reminders_due_before(self, before: datetime.datetime) -> None:
+        # schedules that are already due are either executing right now or were fixed at startup
+        schedules_to_start = [
+            s
+            for s in self._get_schedules_due_between(start=datetime.datetime.now(), end=before)
+            if not self._has_reminder(schedule_id=s.id)
+        ]
+
+        self._schedule_all_reminders(schedules=schedules_to_start)
+
+        logger.info(f"Started {len(schedules_to_start)} reminders due before {before}!")
+
+    def _get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        if self._async_schedule_access is None or self._event_loop is None:
+            return self.schedule_access.get_schedules_due_between(start=start, end=end)
+
+        # the refill runs on the thread of the reminder horizon, the async schedule access only on the event loop
+        return asyncio.run_coroutine_threadsafe(
+            self._async_schedule_access.get_schedules_due_between(start=start, end=end), loop=self._event_loop
+        ).result()
+
+    def _schedule_reminder(self, schedule: Schedule) -> None:
+        # schedules outside the reminder horizon are armed by one of its next refills
+        if self._reminder_horizon is not None and not self._reminder_horizon.contains(date=schedule.next_rotation):
+            return
+
+        if self._async_reminder_scheduler is not None and self._async_reminder_sender is not None:
+            self._async_reminder_scheduler.schedule_reminder(schedule=schedule, reminder_sender=self._async_reminder_sender)
+            return
+
+        self.reminder_scheduler.schedule_reminder(schedule=schedule, reminder_sender=self.reminder_sender)
+
+    def _schedule_all_reminders(self, schedules: List[Schedule]) -> None:
+        if self._async_reminder_scheduler is not None and self._async_reminder_sender is not None:
+            self._async_reminder_scheduler.schedule_all_reminders(
+                schedules=schedules, reminder_sender=self._async_reminder_sender
+            )
+            return
+
+        self.reminder_scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=self.reminder_sender)
+
+    def _has_reminder(self, schedule_id: str) -> bool:
+        if self._async_reminder_scheduler is not None:
+            return self._async_reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule_id)
+
+        return self.reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule_id)
+
+    def _remove_reminder(self, schedule_id: str) -> None:
+        if self._async_reminder_scheduler is not None:
+            self._async_reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule_id)
+            return
+
+        # schedules outside the reminder horizon are not armed yet
+        if self.reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule_id):
+            self.reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule_id)
+
     def _register_listeners(self) -> None:
         self.app.event(event="app_home_opened")(self.handle_app_home_opened)
         self.app.block_action(constraints=DELETE_SCHEDULE_ACTION_ID)(self.handle_clicked_delete_button)
         self.app.block_action(constraints=CREATE_BUTTON_ACTION_ID)(self.handle_clicked_create_schedule)
+        self.app.block_action(constraints=SHOW_MY_SCHEDULES_ACTION_ID)(self.handle_clicked_show_my_schedules)
+        self.app.block_action(constraints=SHOW_ALL_SCHEDULES_ACTION_ID)(self.handle_clicked_show_all_schedules)
+        self.app.block_action(constraints=SORT_BY_NEXT_ROTATION_ACTION_ID)(self.handle_clicked_sort_by_next_rotation)
+        self.app.block_action(constraints=SORT_BY_DISPLAY_NAME_ACTION_ID)(self.handle_clicked_sort_by_display_name)
+        self.app.block_action(constraints=PREVIOUS_PAGE_ACTION_ID)(self.handle_clicked_change_page)
+        self.app.block_action(constraints=NEXT_PAGE_ACTION_ID)(self.handle_clicked_change_page)
         self.app.block_action(constraints=EDIT_SCHEDULE_ACTION_ID)(self.handle_clicked_edit_schedule)
         self.app.action(constraints=SKIP_CURRENT_MEMBER_ACTION_ID)(self.handle_clicked_confirm_skip)
         self.app.view(constraints=ScheduleDialogCallback.CREATE_DIALOG, matchers=[is_view_submission])(
@@ -114,18 +416,74 @@ class AppController:
             self.handle_submitted_edit_schedule
         )
 
+    @staticmethod
+    def _require_mongo_url(mongo_url: Optional[str]) -> str:
+        # reminder jobs and replicas are always shared through mongo, only the schedules can be stored elsewhere
+        if mongo_url is None:
+            raise RuntimeError("Environment variable 'MONGO_URL' is required unless schedules are stored in sqlite")
+
+        return mongo_url
+
     @staticmethod
     def _get_schedule_id_from_block_id(block_id: str) -> str:
         return block_id.split("_")[0]
 
     def handle_reminder_executed(self, next_schedule: Schedule) -> None:
-        self.schedule_access.update_schedule(schedule_id_to_update=next_schedule.id, new_schedule=next_schedule)
+        if not self.schedule_access.advance_rotation(
+            schedule_id=next_schedule.id,
+            next_rotation=next_schedule.next_rotation,
+            current_index=next_schedule.current_index,
+            expected_version=next_schedule.version - 1,
+        ):
+            logger.warning(f"Schedule {next_schedule.id} was changed or deleted while executing its reminder")
+            return
+
+        self._rotation_calendar.update_schedule(schedule=next_schedule)
+
+    async def handle_reminder_executed_async(self, next_schedule: Schedule) -> None:
+        if self._async_schedule_access is None:
+            raise UnstartedControllerException("Controller not yet started, please call start before!")
+
+        advanced = await self._async_schedule_access.advance_rotation(
+            schedule_id=next_schedule.id,
+            next_rotation=next_schedule.next_rotation,
+            current_index=next_schedule.current_index,
+            expected_version=next_schedule.version - 1,
+        )
+        if not advanced:
+            logger.warning(f"Schedule {next_schedule.id} was changed or deleted while executing its reminder")
+        else:
+            self._rotation_calendar.update_schedule(schedule=next_schedule)
+
+        if self._schedule_cache is not None:
+            # the cache is not written through the async schedule access, an outdated schedule is read again off the loop
+            await asyncio.to_thread(
+                self._schedule_cache.apply_advanced_rotation,
+                schedule_id=next_schedule.id,
+                next_rotation=next_schedule.next_rotation,
+                current_index=next_schedule.current_index,
+                expected_version=next_schedule.version - 1,
+                advanced=advanced,
+            )
 
     def handle_app_home_opened(self, event: SlackEvent) -> None:
         user = event["user"]
 
         logger.info(f"{user=} clicked on App.Home")
-        self._update_app_home(user_id=user)
+        self._migrate_created_by(user_id=user)
+        self._update_app_home(user_id=user, state=AppHomeState.from_view(view=event.get("view")))
+
+    def _migrate_created_by(self, user_id: str) -> None:
+        # the creators of older schedules are stored by their user name, they are migrated the first time they show up
+        if user_id in self._users_with_migrated_schedules:
+            return
+        self._users_with_migrated_schedules.add(user_id)
+
+        try:
+            user_name = self.slack_client.users_info(user=user_id)["user"]["name"]
+            self.schedule_access.migrate_created_by(user_name=user_name, user_id=user_id)
+        except Exception:
+            logger.exception(f"Failed to migrate the schedules created by {user_id=}, is the users:read scope granted?")
 
     def handle_clicked_delete_button(self, ack: Ack, body: SlackBody) -> None:
         ack()
@@ -138,15 +496,94 @@ class AppController:
         schedule_id = AppController._get_schedule_id_from_block_id(block_id=actions[0]["block_id"])
         logger.info(f"Confirmed Deletion of schedule {schedule_id}")
 
-        self.reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule_id)
+        self._remove_reminder(schedule_id=schedule_id)
         self.schedule_access.delete_schedule(schedule_id=schedule_id)
-        self._update_app_home(user_id=body["user"]["id"])
+        self._rotation_calendar.remove_schedule(schedule_id=schedule_id)
+        self._update_app_home(user_id=body["user"]["id"], state=AppHomeState.from_view(view=body.get("view")))
 
-    def _update_app_home(self, user_id: str) -> None:
-        self.slack_client.views_publish(
-            user_id=user_id, view=get_app_home_view(schedules=self.schedule_access.get_available_schedules())
+    def handle_clicked_show_my_schedules(self, ack: Ack, body: SlackBody) -> None:
+        ack()
+        state = AppHomeState.from_view(view=body.get("view"))
+
+        self._update_app_home(
+            user_id=body["user"]["id"], state=dataclasses.replace(state, show_all_schedules=False, cursor=None)
         )
 
+    def handle_clicked_show_all_schedules(self, ack: Ack, body: SlackBody) -> None:
+        ack()
+        state = AppHomeState.from_view(view=body.get("view"))
+
+        self._update_app_home(
+            user_id=body["user"]["id"], state=dataclasses.replace(state, show_all_schedules=True, cursor=None)
+        )
+
+    def handle_clicked_sort_by_next_rotation(self, ack: Ack, body: SlackBody) -> None:
+        ack()
+        self._sort_app_home(body=body, sort_order=ScheduleSortOrder.NEXT_ROTATION)
+
+    def handle_clicked_sort_by_display_name(self, ack: Ack, body: SlackBody) -> None:
+        ack()
+        self._sort_app_home(body=body, sort_order=ScheduleSortOrder.DISPLAY_NAME)
+
+    def _sort_app_home(self, body: SlackBody, sort_order: ScheduleSortOrder) -> None:
+        state = AppHomeState.from_view(view=body.get("view"))
+
+        self._update_app_home(user_id=body["user"]["id"], state=dataclasses.replace(state, sort_order=sort_order, cursor=None))
+
+    def handle_clicked_change_page(self, ack: Ack, body: SlackBody) -> None:
+        ack()
+        actions = body["actions"]
+
+        if len(actions) != 1 or actions[0]["action_id"] not in (PREVIOUS_PAGE_ACTION_ID, NEXT_PAGE_ACTION_ID):
+            logger.error(f"Got an unexpected list of actions for the page buttons: {actions}")
+            return
+
+        # the button carries the cursor of the page, including its sort order
+        cursor = SchedulePageCursor.from_json(cursor_json=json.loads(actions[0]["value"]))
+        state = AppHomeState.from_view(view=body.get("view"))
+
+        self._update_app_home(
+            user_id=body["user"]["id"], state=dataclasses.replace(state, sort_order=cursor.sort_order, cursor=cursor)
+        )
+
+    def _get_app_home_page(self, user_id: str, state: AppHomeState) -> SchedulePage:
+        # one more schedule than shown tells whether there is another page
+        schedules = self.schedule_access.get_sorted_schedules_page(
+            sort_order=state.sort_order,
+            limit=SCHEDULES_PER_PAGE + 1,
+            cursor=state.cursor,
+            user_id=None if state.show_all_schedules else user_id,
+        )
+
+        return get_schedule_page(
+            schedules=schedules, page_size=SCHEDULES_PER_PAGE, sort_order=state.sort_order, cursor=state.cursor
+        )
+
+    def _update_app_home(self, user_id: str, state: AppHomeState) -> None:
+        self._app_home_states[user_id] = state
+        self._app_home_publisher.request_publish(user_id=user_id)
+
+    def _render_app_home(self, user_id: str) -> Dict[str, Any]:
+        state = self._app_home_states.get(user_id, AppHomeState())
+        page = self._get_app_home_page(user_id=user_id, state=state)
+
+        if len(page.schedules) == 0 and state.cursor is not None:
+            # all schedules of the page were deleted in the meantime
+            state = dataclasses.replace(state, cursor=None)
+            page = self._get_app_home_page(user_id=user_id, state=state)
+
+        return self._app_home_render_cache.get_app_home_view(
+            schedules=page.schedules,
+            show_all_schedules=state.show_all_schedules,
+            sort_order=state.sort_order,
+            previous_page_cursor=page.previous_page_cursor,
+            next_page_cursor=page.next_page_cursor,
+            private_metadata=state.as_private_metadata(),
+        )
+
+    def _publish_app_home(self, user_id: str, view: Dict[str, Any]) -> None:
+        self.slack_client.views_publish(user_id=user_id, view=view)
+
     def handle_clicked_create_schedule(self, ack: Ack, body: SlackBody) -> None:
         ack()
         logger.info(f"User {body['user']} clicked the create button")
@@ -154,7 +591,10 @@ class AppController:
         trigger_id = body["trigger_id"]
 
         self.slack_client.views_open(
-            trigger_id=trigger_id, view=get_edit_schedule_block(callback=ScheduleDialogCallback.CREATE_DIALOG)
+            trigger_id=trigger_id,
+            view=AppController._with_app_home_state(
+                view=get_schedule_dialog_view(callback=ScheduleDialogCallback.CREATE_DIALOG), body=body
+            ),
         )
 
     def handle_clicked_edit_schedule(self, ack: Ack, body: SlackBody) -> None:
@@ -172,23 +612,40 @@ class AppController:
 
         schedule = self.schedule_access.get_schedule(schedule_id=schedule_id)
 
-        edit_schedule_block = get_edit_schedule_block(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG)
-        self.slack_client.views_open(trigger_id=trigger_id, view=edit_schedule_block)
+        edit_schedule_block = get_schedule_dialog_view(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG)
+        self.slack_client.views_open(
+            trigger_id=trigger_id, view=AppController._with_app_home_state(view=edit_schedule_block, body=body)
+        )
+
+    @staticmethod
+    def _with_app_home_state(view: Dict[str, Any], body: SlackBody) -> Dict[str, Any]:
+        # the dialog passes the state of the app home it was opened from on to its submission
+        return {**view, "private_metadata": AppHomeState.from_view(view=body.get("view")).as_private_metadata()}
 
     def handle_submitted_edit_schedule(self, ack: Ack, body: SlackBody) -> None:
         ack()
 
         logger.info(f"Updating Schedule from {body['user']}")
 
-        schedule = Schedule.from_modal_submission(submission_body=body)
+        submitted_schedule = Schedule.from_modal_submission(submission_body=body)
 
-        self.schedule_access.update_schedule(schedule_id_to_update=schedule.id, new_schedule=schedule)
+        # the reminder is armed with the stored version, reminders of the previous version cannot overwrite the edit
+        schedule = self.schedule_access.update_schedule(
+            schedule_id_to_update=submitted_schedule.id, new_schedule=submitted_schedule
+        )
+        self._remove_reminder(schedule_id=submitted_schedule.id)
 
-        self.reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
-        self.reminder_scheduler.schedule_reminder(schedule=schedule, reminder_sender=self.reminder_sender)
+        if schedule is None:
+            logger.error(f"Error when updating schedule with id {submitted_schedule.id}, already deleted!")
+            self._rotation_calendar.remove_schedule(schedule_id=submitted_schedule.id)
+            self._update_app_home(user_id=body["user"]["id"], state=AppHomeState.from_view(view=body.get("view")))
+            return
+
+        self._schedule_reminder(schedule=schedule)
+        self._rotation_calendar.update_schedule(schedule=schedule)
 
         logger.info(f"Updated Schedule {schedule}")
-        self._update_app_home(user_id=body["user"]["id"])
+        self._update_app_home(user_id=body["user"]["id"], state=AppHomeState.from_view(view=body.get("view")))
 
     def handle_submitted_create_schedule(self, ack: Ack, body: SlackBody) -> None:
         ack()
@@ -197,11 +654,12 @@ class AppController:
 
         schedule = Schedule.from_modal_submission(submission_body=body)
 
-        self.reminder_scheduler.schedule_reminder(schedule=schedule, reminder_sender=self.reminder_sender)
+        self._schedule_reminder(schedule=schedule)
         self.schedule_access.save_schedule(schedule=schedule)
+        self._rotation_calendar.update_schedule(schedule=schedule)
 
         logger.info(f"Created Schedule {schedule}")
-        self._update_app_home(user_id=body["user"]["id"])
+        self._update_app_home(user_id=body["user"]["id"], state=AppHomeState.from_view(view=body.get("view")))
 
     def handle_clicked_confirm_skip(self, ack: Ack, body: SlackBody) -> None:
         ack()
@@ -221,12 +679,22 @@ class AppController:
             logger.error(f"Error when skipping for schedule with id {schedule_id}, already deleted!")
             return
 
-        self.reminder_sender.send_skip_message(reminder=Reminder(schedule=schedule))
+        schedule_with_skipped_index = dataclasses.replace(
+            schedule, current_index=schedule.next_index, version=schedule.version + 1
+        )
 
-        schedule_with_skipped_index = dataclasses.replace(schedule, current_index=schedule.next_index)
+        if not self.schedule_access.advance_rotation(
+            schedule_id=schedule_id,
+            next_rotation=schedule.next_rotation,
+            current_index=schedule_with_skipped_index.current_index,
+            expected_version=schedule.version,
+        ):
+            logger.error(f"Error when skipping for schedule with id {schedule_id}, changed concurrently!")
+            return
 
-        self.schedule_access.update_schedule(schedule_id_to_update=schedule_id, new_schedule=schedule_with_skipped_index)
-        self.reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule_id)
-        self.reminder_scheduler.schedule_reminder(schedule=schedule_with_skipped_index, reminder_sender=self.reminder_sender)
+        self.reminder_sender.send_skip_message(reminder=Reminder(schedule=schedule))
+        self._remove_reminder(schedule_id=schedule_id)
+        self._schedule_reminder(schedule=schedule_with_skipped_index)
+        self._rotation_calendar.update_schedule(schedule=schedule_with_skipped_index)
 
         logger.info(f"Successfully skipped current schedule user from {body['user']} for schedule {schedule_id}")
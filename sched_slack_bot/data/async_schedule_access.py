@@ -0,0 +1,53 @@
+import abc
+import datetime
+from typing import List, Optional
+
+from sched_slack_bot.model.schedule import Schedule
+
+
+# the counterpart of ScheduleAccess for code running on the event loop
+class AsyncScheduleAccess(abc.ABC):
+    @abc.abstractmethod
+    async def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def get_available_schedules(self) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # schedules with a next rotation from start (inclusive) to end (exclusive)
+    @abc.abstractmethod
+    async def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def save_schedule(self, schedule: Schedule) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    # replaces the stored schedule and bumps its version, returns it or None if it does not exist (anymore)
+    @abc.abstractmethod
+    async def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    # replaces the stored schedules which still have the version of the given ones
+    @abc.abstractmethod
+    async def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def delete_schedule(self, schedule_id: str) -> None:
+        raise NotImplementedError("Not Implemented")
@@ -0,0 +1,226 @@
+import dataclasses
+import datetime
+import logging
+import threading
+import time
+from typing import List, Optional, Iterator
+
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess, DEFAULT_SCHEDULE_BATCH_SIZE
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+
+logger = logging.getLogger(__name__)
+
+# only used when the wrapped schedule access cannot watch for changes of other processes
+DEFAULT_POLL_INTERVAL = datetime.timedelta(seconds=30)
+
+
+@dataclasses.dataclass
+class ScheduleCacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
+# keeps all schedules in memory, reads are served from the cache once it was loaded.
+# own writes update the cache directly, writes of other processes are picked up by watching or polling.
+class CachedScheduleAccess(ScheduleAccess):
+    def __init__(self, schedule_access: ScheduleAccess, poll_interval: datetime.timedelta = DEFAULT_POLL_INTERVAL) -> None:
+        self._schedule_access = schedule_access
+        self._poll_interval = poll_interval
+        # the cached schedules are kept with the sorted indexes of the in memory schedule access
+        self._cached_schedules: Optional[InMemoryScheduleAccess] = None
+        self._metrics = ScheduleCacheMetrics()
+        self._lock = threading.RLock()
+        self._poller: Optional[threading.Thread] = None
+
+    @property
+    def metrics(self) -> ScheduleCacheMetrics:
+        with self._lock:
+            return dataclasses.replace(self._metrics)
+
+    def start_watching(self) -> None:
+        if self._schedule_access.watch_changes(on_changed=self._apply_change):
+            return
+
+        logger.info(f"Polling for schedule changes every {self._poll_interval}")
+        self._poller = threading.Thread(target=self._poll_forever, name="schedule-cache-poller", daemon=True)
+        self._poller.start()
+
+    def _poll_forever(self) -> None:
+        while True:
+            time.sleep(self._poll_interval.total_seconds())
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cached_schedules = None
+            self._metrics.invalidations += 1
+
+    def _apply_change(self, schedule: Optional[Schedule]) -> None:
+        # changes without a schedule, e.g. deletions, cannot be applied one by one
+        if schedule is None:
+            self.invalidate()
+            return
+
+        with self._lock:
+            if self._cached_schedules is None:
+                return
+
+            # own writes come back as watched changes, which may arrive after newer writes were already applied
+            cached_schedule = self._cached_schedules.get_schedule(schedule_id=schedule.id)
+            if cached_schedule is None or cached_schedule.version <= schedule.version:
+                self._cached_schedules.bulk_save_schedules(schedules=[schedule])
+
+    def _refresh_schedule(self, schedule_id: str) -> None:
+        # only the outdated schedule is read again instead of all of them
+        stored_schedule = self._schedule_access.get_schedule(schedule_id=schedule_id)
+        if stored_schedule is not None:
+            self._apply_change(schedule=stored_schedule)
+            return
+
+        with self._lock:
+            if self._cached_schedules is not None:
+                self._cached_schedules.delete_schedule(schedule_id=schedule_id)
+
+    def _get_cached_schedules(self) -> InMemoryScheduleAccess:
+        with self._lock:
+            if self._cached_schedules is not None:
+                self._metrics.hits += 1
+                return self._cached_schedules
+
+            self._metrics.misses += 1
+            self._cached_schedules = InMemoryScheduleAccess()
+            self._cached_schedules.bulk_save_schedules(schedules=self._schedule_access.get_available_schedules())
+
+            return self._cached_schedules
+
+    def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_schedule(schedule_id=schedule_id)
+
+    def get_available_schedules(self) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_available_schedules()
+
+    def get_schedules_for_user(self, user_id: str) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_schedules_for_user(user_id=user_id)
+
+    def iter_schedules(self, batch_size: int = DEFAULT_SCHEDULE_BATCH_SIZE) -> Iterator[Schedule]:
+        # the cache holds all schedules in memory anyway
+        with self._lock:
+            return self._get_cached_schedules().iter_schedules(batch_size=batch_size)
+
+    def get_schedules_page(self, after_id: Optional[str], limit: int) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_schedules_page(after_id=after_id, limit=limit)
+
+    def get_sorted_schedules_page(
+        self,
+        sort_order: ScheduleSortOrder,
+        limit: int,
+        cursor: Optional[SchedulePageCursor] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_sorted_schedules_page(
+                sort_order=sort_order, limit=limit, cursor=cursor, user_id=user_id
+            )
+
+    def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_schedules_due_before(before=before)
+
+    def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        with self._lock:
+            return self._get_cached_schedules().get_schedules_due_between(start=start, end=end)
+
+    def save_schedule(self, schedule: Schedule) -> None:
+        self._schedule_access.save_schedule(schedule=schedule)
+        self._apply_change(schedule=schedule)
+
+    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        updated_schedule = self._schedule_access.update_schedule(
+            schedule_id_to_update=schedule_id_to_update, new_schedule=new_schedule
+        )
+        if updated_schedule is None:
+            # the schedule was deleted in the meantime
+            with self._lock:
+                if self._cached_schedules is not None:
+                    self._cached_schedules.delete_schedule(schedule_id=schedule_id_to_update)
+        else:
+            self._apply_change(schedule=updated_schedule)
+
+        return updated_schedule
+
+    def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        advanced = self._schedule_access.advance_rotation(
+            schedule_id=schedule_id, next_rotation=next_rotation, current_index=current_index, expected_version=expected_version
+        )
+        self.apply_advanced_rotation(
+            schedule_id=schedule_id,
+            next_rotation=next_rotation,
+            current_index=current_index,
+            expected_version=expected_version,
+            advanced=advanced,
+        )
+
+        return advanced
+
+    # applies an advance_rotation of the stored schedule made without this cache, e.g. by the async schedule access
+    def apply_advanced_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int, advanced: bool
+    ) -> None:
+        with self._lock:
+            if self._cached_schedules is None:
+                return
+
+            cached_schedule = self._cached_schedules.get_schedule(schedule_id=schedule_id)
+            # the watched change of the write may have been applied already
+            if cached_schedule is None or cached_schedule.version > expected_version:
+                return
+
+            if advanced and self._cached_schedules.advance_rotation(
+                schedule_id=schedule_id,
+                next_rotation=next_rotation,
+                current_index=current_index,
+                expected_version=expected_version,
+            ):
+                return
+
+        # the cached schedule is outdated if it could not be advanced like the stored one
+        self._refresh_schedule(schedule_id=schedule_id)
+
+    def migrate_created_by(self, user_name: str, user_id: str) -> int:
+        migrated_schedules = self._schedule_access.migrate_created_by(user_name=user_name, user_id=user_id)
+
+        with self._lock:
+            if migrated_schedules > 0 and self._cached_schedules is not None:
+                self._cached_schedules.migrate_created_by(user_name=user_name, user_id=user_id)
+
+        return migrated_schedules
+
+    def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        self._schedule_access.bulk_save_schedules(schedules=schedules)
+
+        for schedule in schedules:
+            self._apply_change(schedule=schedule)
+
+    def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        self._schedule_access.bulk_update_schedules(schedules=schedules)
+
+        # the cached schedules are updated with the same version check as the stored ones
+        with self._lock:
+            if self._cached_schedules is not None:
+                self._cached_schedules.bulk_update_schedules(schedules=schedules)
+
+    def delete_schedule(self, schedule_id: str) -> None:
+        self._schedule_access.delete_schedule(schedule_id=schedule_id)
+
+        with self._lock:
+            if self._cached_schedules is not None:
+                self._cached_schedules.delete_schedule(schedule_id=schedule_id)
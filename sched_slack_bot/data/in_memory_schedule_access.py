@@ -0,0 +1,248 @@
+import bisect
+import collections
+import dataclasses
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Dict, Iterator, Set, Tuple
+
+from sched_slack_bot.data.schedule_access import ScheduleAccess, DEFAULT_SCHEDULE_BATCH_SIZE
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import format_date, decode_schedules
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor, get_sorted_page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL = datetime.timedelta(seconds=60)
+
+
+# keeps the schedules of a single process in memory only, e.g. for load tests and benchmarks.
+# the schedules can be written to a snapshot file periodically and are loaded from it again on startup.
+class InMemoryScheduleAccess(ScheduleAccess):
+    def __init__(
+        self, snapshot_path: Optional[str] = None, snapshot_interval: datetime.timedelta = DEFAULT_SNAPSHOT_INTERVAL
+    ) -> None:
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._lock = threading.RLock()
+        self._snapshotter: Optional[threading.Thread] = None
+        # a snapshot is outdated once the schedules changed more often than when it was written
+        self._change_count = 0
+        self._snapshot_change_count = 0
+
+        self._schedules_by_id: Dict[str, Schedule] = dict()
+        # secondary indexes, ids, rotations and names are kept sorted for the range queries and pages
+        self._sorted_ids: List[str] = list()
+        self._sorted_rotations: List[Tuple[datetime.datetime, str]] = list()
+        self._sorted_display_names: List[Tuple[str, str]] = list()
+        self._ids_by_user: Dict[str, Set[str]] = collections.defaultdict(set)
+
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self._load_snapshot(snapshot_path=snapshot_path)
+
+    @staticmethod
+    def _get_users(schedule: Schedule) -> Set[str]:
+        return {schedule.created_by, *schedule.members}
+
+    def _add(self, schedule: Schedule) -> None:
+        self._remove(schedule_id=schedule.id)
+
+        self._schedules_by_id[schedule.id] = schedule
+        bisect.insort(self._sorted_ids, schedule.id)
+        bisect.insort(self._sorted_rotations, (schedule.next_rotation, schedule.id))
+        bisect.insort(self._sorted_display_names, (schedule.display_name, schedule.id))
+        for user in self._get_users(schedule=schedule):
+            self._ids_by_user[user].add(schedule.id)
+
+        self._change_count += 1
+
+    def _remove(self, schedule_id: str) -> None:
+        schedule = self._schedules_by_id.pop(schedule_id, None)
+        if schedule is None:
+            return
+
+        del self._sorted_ids[bisect.bisect_left(self._sorted_ids, schedule_id)]
+        del self._sorted_rotations[bisect.bisect_left(self._sorted_rotations, (schedule.next_rotation, schedule_id))]
+        del self._sorted_display_names[bisect.bisect_left(self._sorted_display_names, (schedule.display_name, schedule_id))]
+        for user in self._get_users(schedule=schedule):
+            self._ids_by_user[user].discard(schedule_id)
+            if len(self._ids_by_user[user]) == 0:
+                del self._ids_by_user[user]
+
+        self._change_count += 1
+
+    def _load_snapshot(self, snapshot_path: str) -> None:
+        with open(snapshot_path) as snapshot_file:
+            schedules = decode_schedules(documents=json.load(snapshot_file))
+
+        with self._lock:
+            for schedule in schedules:
+                self._add(schedule=schedule)
+            self._snapshot_change_count = self._change_count
+
+        logger.info(f"Loaded {len(schedules)} schedules from snapshot {snapshot_path}")
+
+    def snapshot(self) -> None:
+        if self._snapshot_path is None:
+            return
+
+        with self._lock:
+            if self._change_count == self._snapshot_change_count:
+                return
+
+            schedules = [
+                {**s.as_json(), "next_rotation": format_date(date=s.next_rotation)} for s in self._schedules_by_id.values()
+            ]
+            change_count = self._change_count
+
+        # the previous snapshot is only replaced by a completely written one
+        temporary_path = f"{self._snapshot_path}.tmp"
+        with open(temporary_path, "w") as snapshot_file:
+            json.dump(schedules, snapshot_file)
+        os.replace(temporary_path, self._snapshot_path)
+
+        # only a written snapshot is up to date, changes made while writing it are part of the next one
+        with self._lock:
+            self._snapshot_change_count = max(self._snapshot_change_count, change_count)
+
+        logger.info(f"Wrote {len(schedules)} schedules to snapshot {self._snapshot_path}")
+
+    def start_snapshots(self) -> None:
+        if self._snapshot_path is None or self._snapshotter is not None:
+            return
+
+        logger.info(f"Writing schedule snapshots to {self._snapshot_path} every {self._snapshot_interval}")
+        self._snapshotter = threading.Thread(target=self._snapshot_forever, name="schedule-snapshotter", daemon=True)
+        self._snapshotter.start()
+
+    def _snapshot_forever(self) -> None:
+        while True:
+            time.sleep(self._snapshot_interval.total_seconds())
+
+            try:
+                self.snapshot()
+            except OSError:
+                logger.exception(f"Failed to write schedule snapshot to {self._snapshot_path}")
+
+    def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        with self._lock:
+            return self._schedules_by_id.get(schedule_id)
+
+    def get_available_schedules(self) -> List[Schedule]:
+        with self._lock:
+            return list(self._schedules_by_id.values())
+
+    def get_schedules_for_user(self, user_id: str) -> List[Schedule]:
+        with self._lock:
+            return [self._schedules_by_id[i] for i in sorted(self._ids_by_user.get(user_id, set()))]
+
+    def iter_schedules(self, batch_size: int = DEFAULT_SCHEDULE_BATCH_SIZE) -> Iterator[Schedule]:
+        with self._lock:
+            return iter([self._schedules_by_id[i] for i in self._sorted_ids])
+
+    def get_schedules_page(self, after_id: Optional[str], limit: int) -> List[Schedule]:
+        with self._lock:
+            start = 0 if after_id is None else bisect.bisect_right(self._sorted_ids, after_id)
+
+            return [self._schedules_by_id[i] for i in self._sorted_ids[start : start + limit]]
+
+    def get_sorted_schedules_page(
+        self,
+        sort_order: ScheduleSortOrder,
+        limit: int,
+        cursor: Optional[SchedulePageCursor] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Schedule]:
+        with self._lock:
+            if sort_order == ScheduleSortOrder.NEXT_ROTATION:
+                if user_id is None:
+                    rotations = self._sorted_rotations
+                else:
+                    # users only have a few schedules, sorting them is cheaper than filtering the index
+                    rotations = sorted((self._schedules_by_id[i].next_rotation, i) for i in self._ids_by_user.get(user_id, ()))
+
+                return [self._schedules_by_id[i] for _, i in get_sorted_page(sorted_keys=rotations, limit=limit, cursor=cursor)]
+
+            if user_id is None:
+                display_names = self._sorted_display_names
+            else:
+                display_names = sorted((self._schedules_by_id[i].display_name, i) for i in self._ids_by_user.get(user_id, ()))
+
+            return [self._schedules_by_id[i] for _, i in get_sorted_page(sorted_keys=display_names, limit=limit, cursor=cursor)]
+
+    def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        with self._lock:
+            end = bisect.bisect_left(self._sorted_rotations, (before,))
+
+            return [self._schedules_by_id[i] for _, i in self._sorted_rotations[:end]]
+
+    def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        with self._lock:
+            start_index = bisect.bisect_left(self._sorted_rotations, (start,))
+            end_index = bisect.bisect_left(self._sorted_rotations, (end,))
+
+            return [self._schedules_by_id[i] for _, i in self._sorted_rotations[start_index:end_index]]
+
+    def save_schedule(self, schedule: Schedule) -> None:
+        with self._lock:
+            if schedule.id in self._schedules_by_id:
+                raise ValueError(f"Schedule with id {schedule.id} already exists")
+
+            self._add(schedule=schedule)
+
+    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        with self._lock:
+            stored_schedule = self._schedules_by_id.get(schedule_id_to_update)
+            if stored_schedule is None:
+                return None
+
+            updated_schedule = dataclasses.replace(new_schedule, version=stored_schedule.version + 1)
+            self._remove(schedule_id=schedule_id_to_update)
+            self._add(schedule=updated_schedule)
+
+        return updated_schedule
+
+    def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        with self._lock:
+            schedule = self._schedules_by_id.get(schedule_id)
+            if schedule is None or schedule.version != expected_version:
+                return False
+
+            self._add(
+                schedule=dataclasses.replace(
+                    schedule, next_rotation=next_rotation, current_index=current_index, version=expected_version + 1
+                )
+            )
+
+        return True
+
+    def migrate_created_by(self, user_name: str, user_id: str) -> int:
+        with self._lock:
+            created_schedules = [
+                s for s in (self._schedules_by_id[i] for i in self._ids_by_user.get(user_name, ())) if s.created_by == user_name
+            ]
+            for schedule in created_schedules:
+                self._add(schedule=dataclasses.replace(schedule, created_by=user_id))
+
+        return len(created_schedules)
+
+    def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        with self._lock:
+            for schedule in schedules:
+                self._add(schedule=schedule)
+
+    def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        with self._lock:
+            for schedule in schedules:
+                stored_schedule = self._schedules_by_id.get(schedule.id)
+                if stored_schedule is not None and stored_schedule.version == schedule.version:
+                    self._add(schedule=schedule)
+
+    def delete_schedule(self, schedule_id: str) -> None:
+        with self._lock:
+            self._remove(schedule_id=schedule_id)
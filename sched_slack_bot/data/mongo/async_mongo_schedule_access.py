@@ -0,0 +1,130 @@
+import datetime
+import logging
+from typing import List, Optional, Any, Sequence
+
+from pymongo import AsyncMongoClient, ReplaceOne, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+
+from sched_slack_bot.data.async_schedule_access import AsyncScheduleAccess
+from sched_slack_bot.data.mongo.mongo_schedule_access import (
+    BULK_WRITE_CHUNK_SIZE,
+    get_next_rotation_filter,
+    get_version_filter,
+)
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import decode_schedule, decode_schedules
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_POOL_SIZE = 100
+DEFAULT_TIMEOUT = datetime.timedelta(seconds=10)
+
+
+class AsyncMongoScheduleAccess(AsyncScheduleAccess):
+    def __init__(
+        self,
+        mongo_url: str,
+        port: Optional[str] = None,
+        db_name: str = "sched-slack-bot",
+        collection_name: str = "schedules",
+        max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+        min_pool_size: int = 0,
+        timeout: datetime.timedelta = DEFAULT_TIMEOUT,
+    ):
+        # the timeout applies to every single operation, including server selection and waiting for a pooled connection
+        self._client: AsyncMongoClient[dict[str, Any]] = AsyncMongoClient(
+            host=mongo_url,
+            port=int(port) if port is not None else port,
+            maxPoolSize=max_pool_size,
+            minPoolSize=min_pool_size,
+            timeoutMS=int(timeout.total_seconds() * 1000),
+        )
+        self._db_name = db_name
+        self._collection_name = collection_name
+
+    @property
+    def _collection(self) -> AsyncCollection[dict[str, Any]]:
+        return self._client.get_database(name=self._db_name).get_collection(name=self._collection_name)
+
+    async def get_available_schedules(self) -> List[Schedule]:
+        return decode_schedules(documents=[s async for s in self._collection.find({})])
+
+    async def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        return decode_schedules(documents=[s async for s in self._collection.find(get_next_rotation_filter(end=before))])
+
+    async def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        return decode_schedules(
+            documents=[s async for s in self._collection.find(get_next_rotation_filter(start=start, end=end))]
+        )
+
+    async def save_schedule(self, schedule: Schedule) -> None:
+        logger.info(f"Saving schedule with id {schedule.id}")
+        await self._collection.insert_one(schedule.as_json())
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Deleting schedule with id {schedule_id}")
+        await self._collection.delete_one({"id": schedule_id})
+
+    async def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        logger.info(f"Updating schedule with id {schedule_id_to_update}")
+
+        # the version is bumped in the same write, schedules saved before versioning start at 1
+        update = {k: v for k, v in new_schedule.as_json().items() if k != "version"}
+        updated_schedule = await self._collection.find_one_and_update(
+            filter={"id": schedule_id_to_update},
+            update={"$set": update, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if updated_schedule is None:
+            return None
+
+        return decode_schedule(document=updated_schedule)
+
+    async def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        logger.info(f"Advancing rotation of schedule with id {schedule_id} from version {expected_version}")
+
+        # schedules saved before versioning have no version field, which matches None
+        expected_versions = [expected_version, None] if expected_version == 0 else [expected_version]
+        result = await self._collection.update_one(
+            filter={"id": schedule_id, "version": {"$in": expected_versions}},
+            update={
+                "$set": {
+                    "next_rotation": next_rotation.replace(microsecond=0),
+                    "current_index": current_index,
+                    "version": expected_version + 1,
+                }
+            },
+        )
+
+        return result.modified_count == 1
+
+    async def _bulk_write(self, operations: Sequence[ReplaceOne[dict[str, Any]]]) -> None:
+        for start in range(0, len(operations), BULK_WRITE_CHUNK_SIZE):
+            await self._collection.bulk_write(operations[start : start + BULK_WRITE_CHUNK_SIZE], ordered=False)
+
+    async def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Saving {len(schedules)} schedules")
+
+        await self._bulk_write(
+            operations=[ReplaceOne(filter={"id": s.id}, replacement=s.as_json(), upsert=True) for s in schedules]
+        )
+
+    async def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Updating {len(schedules)} schedules")
+
+        await self._bulk_write(
+            operations=[ReplaceOne(filter=get_version_filter(schedule=s), replacement=s.as_json()) for s in schedules]
+        )
+
+    async def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        logger.info(f"Getting schedule with id {schedule_id}")
+
+        found_schedule = await self._collection.find_one({"id": schedule_id})
+
+        if found_schedule is None:
+            return None
+
+        return decode_schedule(document=found_schedule)
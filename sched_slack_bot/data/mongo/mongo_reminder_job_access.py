@@ -0,0 +1,117 @@
+import datetime
+import logging
+from typing import List, Optional, Any
+
+from pymongo import MongoClient, ASCENDING, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+
+from sched_slack_bot.data.reminder_job_access import ReminderJobAccess
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import decode_schedule
+
+logger = logging.getLogger(__name__)
+
+
+class MongoReminderJobAccess(ReminderJobAccess):
+    def __init__(
+        self,
+        mongo_url: str,
+        port: Optional[str] = None,
+        db_name: str = "sched-slack-bot",
+        collection_name: str = "reminder_jobs",
+    ):
+        self._client: MongoClient[dict[str, Any]] = MongoClient(host=mongo_url, port=int(port) if port is not None else port)
+        self._db_name = db_name
+        self._collection_name = collection_name
+
+    @property
+    def _collection(self) -> Collection[dict[str, Any]]:
+        return self._client.get_database(name=self._db_name).get_collection(name=self._collection_name)
+
+    @staticmethod
+    def _get_job(schedule: Schedule) -> dict[str, Any]:
+        return {"due_at": schedule.next_rotation, "schedule": schedule.as_json()}
+
+    def create_indexes(self) -> None:
+        # the unique index keeps replicas that save the same job concurrently from inserting it twice
+        self._collection.create_index("schedule_id", unique=True)
+        self._collection.create_index([("due_at", ASCENDING), ("lease_expires_at", ASCENDING)])
+
+    def save_job(self, schedule: Schedule) -> None:
+        logger.info(f"Saving reminder job for schedule with id {schedule.id}")
+
+        # a changed schedule releases the lease, so a replica still executing the old rotation cannot complete it
+        self._collection.update_one(
+            filter={"schedule_id": schedule.id},
+            update={"$set": {**self._get_job(schedule=schedule), "lease_owner": None, "lease_expires_at": None}},
+            upsert=True,
+        )
+
+    def add_missing_jobs(self, schedules: List[Schedule]) -> None:
+        if len(schedules) == 0:
+            return
+
+        now = datetime.datetime.now()
+        # every replica adds the saved schedules on startup, existing jobs may be further along already.
+        # jobs that are behind the reconciled schedule, e.g. after all replicas were down, are moved forward unless a
+        # replica is executing them, otherwise every missed rotation would be sent one after another.
+        self._collection.bulk_write(
+            [
+                operation
+                for s in schedules
+                for operation in (
+                    UpdateOne(
+                        filter={"schedule_id": s.id},
+                        update={"$setOnInsert": {**self._get_job(schedule=s), "lease_owner": None, "lease_expires_at": None}},
+                        upsert=True,
+                    ),
+                    UpdateOne(
+                        filter={
+                            "schedule_id": s.id,
+                            "due_at": {"$lt": s.next_rotation},
+                            "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": now}}],
+                        },
+                        update={"$set": {**self._get_job(schedule=s), "lease_owner": None, "lease_expires_at": None}},
+                    ),
+                )
+            ],
+            ordered=False,
+        )
+
+    def delete_job(self, schedule_id: str) -> None:
+        logger.info(f"Deleting reminder job for schedule with id {schedule_id}")
+        self._collection.delete_one({"schedule_id": schedule_id})
+
+    def has_job(self, schedule_id: str) -> bool:
+        return self._collection.count_documents({"schedule_id": schedule_id}, limit=1) > 0
+
+    def claim_due_job(self, owner: str, now: datetime.datetime, lease: datetime.timedelta) -> Optional[Schedule]:
+        # expired leases belong to replicas that crashed while executing the job
+        claimed_job = self._collection.find_one_and_update(
+            filter={"due_at": {"$lte": now}, "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": now}}]},
+            update={"$set": {"lease_owner": owner, "lease_expires_at": now + lease}},
+            sort=[("due_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if claimed_job is None:
+            return None
+
+        return decode_schedule(document=claimed_job["schedule"])
+
+    def renew_lease(self, schedule_id: str, owner: str, now: datetime.datetime, lease: datetime.timedelta) -> bool:
+        # an expired lease nobody claimed yet is still held, claiming or changing the job replaces the owner
+        result = self._collection.update_one(
+            filter={"schedule_id": schedule_id, "lease_owner": owner},
+            update={"$set": {"lease_expires_at": now + lease}},
+        )
+
+        return result.modified_count == 1
+
+    def complete_job(self, schedule_id: str, owner: str, next_schedule: Schedule) -> bool:
+        result = self._collection.update_one(
+            filter={"schedule_id": schedule_id, "lease_owner": owner},
+            update={"$set": {**self._get_job(schedule=next_schedule), "lease_owner": None, "lease_expires_at": None}},
+        )
+
+        return result.modified_count == 1
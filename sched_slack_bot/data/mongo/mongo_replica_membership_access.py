@@ -0,0 +1,33 @@
+import datetime
+import logging
+from typing import List, Optional, Any
+
+from pymongo import MongoClient
+from pymongo.collection import Collection
+
+from sched_slack_bot.data.replica_membership_access import ReplicaMembershipAccess
+
+logger = logging.getLogger(__name__)
+
+
+class MongoReplicaMembershipAccess(ReplicaMembershipAccess):
+    def __init__(
+        self, mongo_url: str, port: Optional[str] = None, db_name: str = "sched-slack-bot", collection_name: str = "replicas"
+    ):
+        self._client: MongoClient[dict[str, Any]] = MongoClient(host=mongo_url, port=int(port) if port is not None else port)
+        self._db_name = db_name
+        self._collection_name = collection_name
+
+    @property
+    def _collection(self) -> Collection[dict[str, Any]]:
+        return self._client.get_database(name=self._db_name).get_collection(name=self._collection_name)
+
+    def heartbeat(self, replica_id: str, now: datetime.datetime) -> None:
+        self._collection.update_one(filter={"replica_id": replica_id}, update={"$set": {"last_heartbeat": now}}, upsert=True)
+
+    def get_live_replicas(self, alive_after: datetime.datetime) -> List[str]:
+        return [r["replica_id"] for r in self._collection.find({"last_heartbeat": {"$gte": alive_after}})]
+
+    def remove_replica(self, replica_id: str) -> None:
+        logger.info(f"Removing replica {replica_id}")
+        self._collection.delete_one({"replica_id": replica_id})
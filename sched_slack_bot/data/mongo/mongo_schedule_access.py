@@ -1,14 +1,67 @@
+import datetime
+import itertools
 import logging
-from typing import List, Optional, Any
+import threading
+import time
+from typing import List, Optional, Any, Sequence, Callable, Mapping, Iterator, Union, Dict
 
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, UpdateOne, IndexModel, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.change_stream import ChangeStream
 from pymongo.collection import Collection
+from pymongo.errors import OperationFailure, PyMongoError
 
-from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess, DEFAULT_SCHEDULE_BATCH_SIZE
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import format_date, parse_date, decode_schedule, decode_schedules
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
 
 logger = logging.getLogger(__name__)
 
+# keeps single bulk writes well below the maximum message size of mongo
+BULK_WRITE_CHUNK_SIZE = 1000
+
+CHANGE_STREAM_RETRY_INTERVAL = datetime.timedelta(seconds=5)
+
+# the mongo internal _id is not part of a schedule
+SCHEDULE_PROJECTION = {"_id": False}
+
+# single schedules are looked up by id, the others back the due, per user, per channel and sorted page queries
+SCHEDULE_INDEXES = [
+    IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    IndexModel([("next_rotation", ASCENDING)], name="next_rotation"),
+    IndexModel([("next_rotation", ASCENDING), ("id", ASCENDING)], name="next_rotation_id"),
+    IndexModel([("display_name", ASCENDING), ("id", ASCENDING)], name="display_name_id"),
+    IndexModel([("members", ASCENDING)], name="members"),
+    IndexModel([("created_by", ASCENDING)], name="created_by"),
+    IndexModel([("channel_id_to_notify_in", ASCENDING)], name="channel_id_to_notify_in"),
+]
+
+
+def get_next_rotation_filter(
+    start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None
+) -> Dict[str, Any]:
+    date_range: Dict[str, Any] = dict()
+    if start is not None:
+        date_range["$gte"] = start
+    if end is not None:
+        date_range["$lt"] = end
+
+    # comparisons only match values of the same type, not yet migrated strings sort lexicographically in chronological order
+    string_range = {operator: format_date(date=d) for operator, d in date_range.items()}
+
+    return {"$or": [{"next_rotation": date_range}, {"next_rotation": string_range}]}
+
+
+def _is_unique(index: Mapping[str, Any]) -> bool:
+    return bool(index.get("unique", False))
+
+
+def get_version_filter(schedule: Schedule) -> Dict[str, Any]:
+    # schedules saved before versioning have no version field, which matches None
+    versions = [schedule.version, None] if schedule.version == 0 else [schedule.version]
+
+    return {"id": schedule.id, "version": {"$in": versions}}
+
 
 class MongoScheduleAccess(ScheduleAccess):
     def __init__(
@@ -22,22 +75,262 @@ class MongoScheduleAccess(ScheduleAccess):
     def _collection(self) -> Collection[dict[str, Any]]:
         return self._client.get_database(name=self._db_name).get_collection(name=self._collection_name)
 
+    def ensure_indexes(self) -> List[str]:
+        existing_indexes = {tuple(i["key"]): (name, i) for name, i in self._collection.index_information().items()}
+        missing_indexes = []
+        differing_indexes = []
+        for index in SCHEDULE_INDEXES:
+            name_and_existing_index = existing_indexes.get(tuple(index.document["key"].items()))
+            if name_and_existing_index is None:
+                missing_indexes.append(index)
+            elif _is_unique(index=name_and_existing_index[1]) != _is_unique(index=index.document):
+                differing_indexes.append((name_and_existing_index[0], index))
+
+        if len(missing_indexes) > 0:
+            missing_index_names = [i.document["name"] for i in missing_indexes]
+            logger.warning(f"Collection {self._collection_name} is missing the indexes {missing_index_names}, creating them")
+
+        for index in missing_indexes:
+            self._create_index(index=index)
+
+        # an index on the same keys has to be dropped first, e.g. an id index that does not enforce uniqueness
+        for existing_index_name, index in differing_indexes:
+            self._rebuild_index(existing_index_name=existing_index_name, index=index)
+
+        return [i.document["name"] for i in missing_indexes] + [i.document["name"] for _, i in differing_indexes]
+
+    def _rebuild_index(self, existing_index_name: str, index: IndexModel) -> None:
+        logger.warning(
+            f"Index {existing_index_name} on collection {self._collection_name} differs from {index.document}, rebuilding it"
+        )
+        self._collection.drop_index(existing_index_name)
+
+        if not self._create_index(index=index):
+            # the previous index still speeds up the lookups until the conflict is resolved
+            self._collection.create_indexes(
+                [
+                    IndexModel(
+                        list(index.document["key"].items()), name=existing_index_name, unique=not _is_unique(index.document)
+                    )
+                ]
+            )
+
+    def _create_index(self, index: IndexModel) -> bool:
+        try:
+            self._collection.create_indexes([index])
+        except OperationFailure:
+            # e.g. the unique index cannot be created while duplicate ids are stored
+            logger.exception(f"Failed to create index {index.document['name']} on collection {self._collection_name}")
+            return False
+
+        return True
+
+    def _watch(self) -> ChangeStream[dict[str, Any]]:
+        return self._collection.watch(full_document="updateLookup")
+
+    def watch_changes(self, on_changed: Callable[[Optional[Schedule]], None]) -> bool:
+        try:
+            change_stream = self._watch()
+        except OperationFailure:
+            # change streams are only available on replica sets and sharded clusters
+            logger.warning(f"Cannot watch changes of collection {self._collection_name}")
+            return False
+
+        threading.Thread(
+            target=self._forward_changes, args=(change_stream, on_changed), name="schedule-change-stream", daemon=True
+        ).start()
+
+        return True
+
+    @staticmethod
+    def _get_changed_schedule(change: Mapping[str, Any]) -> Optional[Schedule]:
+        # deletions only contain the _id of the deleted document
+        changed_document = change.get("fullDocument")
+        if change["operationType"] not in ("insert", "replace", "update") or changed_document is None:
+            return None
+
+        return decode_schedule(document=changed_document)
+
+    def _forward_changes(
+        self, change_stream: ChangeStream[dict[str, Any]], on_changed: Callable[[Optional[Schedule]], None]
+    ) -> None:
+        while True:
+            try:
+                with change_stream:
+                    for change in change_stream:
+                        on_changed(self._get_changed_schedule(change=change))
+            except PyMongoError:
+                logger.exception(f"Watching changes of collection {self._collection_name} failed, restarting")
+
+            # changes may have been missed until the change stream is watched again
+            on_changed(None)
+            time.sleep(CHANGE_STREAM_RETRY_INTERVAL.total_seconds())
+
+            try:
+                change_stream = self._watch()
+            except PyMongoError:
+                logger.exception(f"Failed to watch changes of collection {self._collection_name}")
+
     def get_available_schedules(self) -> List[Schedule]:
-        return [Schedule.from_json(json=s) for s in self._collection.find({})]
+        return decode_schedules(documents=self._collection.find({}))
+
+    def get_schedules_for_user(self, user_id: str) -> List[Schedule]:
+        # both branches are served by an index, members is a multikey index over the member ids
+        for_user = {"$or": [{"created_by": user_id}, {"members": user_id}]}
+        cursor = self._collection.find(for_user, projection=SCHEDULE_PROJECTION)
+
+        return decode_schedules(documents=cursor)
+
+    def iter_schedules(self, batch_size: int = DEFAULT_SCHEDULE_BATCH_SIZE) -> Iterator[Schedule]:
+        cursor = self._collection.find({}, projection=SCHEDULE_PROJECTION, sort=[("id", ASCENDING)], batch_size=batch_size)
+
+        for found_schedule in cursor:
+            yield decode_schedule(document=found_schedule)
+
+    def get_schedules_page(self, after_id: Optional[str], limit: int) -> List[Schedule]:
+        after = {} if after_id is None else {"id": {"$gt": after_id}}
+        cursor = self._collection.find(after, projection=SCHEDULE_PROJECTION, sort=[("id", ASCENDING)], limit=limit)
+
+        return decode_schedules(documents=cursor)
+
+    def get_sorted_schedules_page(
+        self,
+        sort_order: ScheduleSortOrder,
+        limit: int,
+        cursor: Optional[SchedulePageCursor] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Schedule]:
+        # the sort orders are named like their fields
+        field = str(sort_order)
+        conditions: List[Dict[str, Any]] = list()
+
+        if user_id is not None:
+            conditions.append({"$or": [{"created_by": user_id}, {"members": user_id}]})
+
+        backwards = cursor is not None and cursor.backwards
+        if cursor is not None:
+            # mongo sorts all strings before all dates, until migrate_string_dates is done the schedules with a not yet
+            # migrated next rotation are listed first and skipped by cursors on the next rotation
+            operator = "$lt" if backwards else "$gt"
+            conditions.append(
+                {
+                    "$or": [
+                        {field: {operator: cursor.sort_value}},
+                        {field: cursor.sort_value, "id": {operator: cursor.schedule_id}},
+                    ]
+                }
+            )
+
+        # a previous page is read in descending order from the cursor and reversed afterwards
+        direction = DESCENDING if backwards else ASCENDING
+        found_schedules = self._collection.find(
+            {"$and": conditions} if len(conditions) > 0 else {},
+            projection=SCHEDULE_PROJECTION,
+            sort=[(field, direction), ("id", direction)],
+            limit=limit,
+        )
+        schedules = decode_schedules(documents=found_schedules)
+
+        return schedules[::-1] if backwards else schedules
+
+    def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        return decode_schedules(documents=self._collection.find(get_next_rotation_filter(end=before)))
+
+    def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        return decode_schedules(documents=self._collection.find(get_next_rotation_filter(start=start, end=end)))
+
+    def migrate_string_dates(self) -> int:
+        string_dates = self._collection.find(
+            {"next_rotation": {"$type": "string"}}, projection={"next_rotation": True}, batch_size=BULK_WRITE_CHUNK_SIZE
+        )
+
+        # the previous string is part of the filter, so a schedule written in the meantime is not overwritten
+        migrations = (
+            UpdateOne(
+                filter={"_id": d["_id"], "next_rotation": d["next_rotation"]},
+                update={"$set": {"next_rotation": parse_date(value=d["next_rotation"])}},
+            )
+            for d in string_dates
+        )
+
+        migrated_schedules = 0
+        while len(migration_batch := list(itertools.islice(migrations, BULK_WRITE_CHUNK_SIZE))) > 0:
+            self._bulk_write(operations=migration_batch)
+            migrated_schedules += len(migration_batch)
+
+        logger.info(f"Migrated the next rotation of {migrated_schedules} schedules to native dates")
+
+        return migrated_schedules
 
     def save_schedule(self, schedule: Schedule) -> None:
         logger.info(f"Saving schedule with id {schedule.id}")
         self._collection.insert_one(schedule.as_json())
 
+    def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        logger.info(f"Advancing rotation of schedule with id {schedule_id} from version {expected_version}")
+
+        # schedules saved before versioning have no version field, which matches None
+        expected_versions = [expected_version, None] if expected_version == 0 else [expected_version]
+        result = self._collection.update_one(
+            filter={"id": schedule_id, "version": {"$in": expected_versions}},
+            update={
+                "$set": {
+                    "next_rotation": next_rotation.replace(microsecond=0),
+                    "current_index": current_index,
+                    "version": expected_version + 1,
+                }
+            },
+        )
+
+        return result.modified_count == 1
+
+    def _bulk_write(self, operations: Sequence[Union[ReplaceOne[dict[str, Any]], UpdateOne]]) -> None:
+        for start in range(0, len(operations), BULK_WRITE_CHUNK_SIZE):
+            # the server applies the other writes of an unordered chunk even if one of them fails, the chunks are still
+            # sent one after another and the error of a failing chunk stops the later ones
+            self._collection.bulk_write(operations[start : start + BULK_WRITE_CHUNK_SIZE], ordered=False)
+
+    def migrate_created_by(self, user_name: str, user_id: str) -> int:
+        # the version stays the same, reminders moving the rotation in the meantime must not be rejected
+        result = self._collection.update_many(filter={"created_by": user_name}, update={"$set": {"created_by": user_id}})
+        if result.modified_count > 0:
+            logger.info(f"Migrated the creator of {result.modified_count} schedules to {user_id}")
+
+        return result.modified_count
+
+    def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Saving {len(schedules)} schedules")
+
+        self._bulk_write(operations=[ReplaceOne(filter={"id": s.id}, replacement=s.as_json(), upsert=True) for s in schedules])
+
+    def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Updating {len(schedules)} schedules")
+
+        self._bulk_write(
+            operations=[ReplaceOne(filter=get_version_filter(schedule=s), replacement=s.as_json()) for s in schedules]
+        )
+
     def delete_schedule(self, schedule_id: str) -> None:
         logger.info(f"Deleting schedule with id {schedule_id}")
         self._collection.delete_one({"id": schedule_id})
 
-    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> None:
+    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
         logger.info(f"Updating schedule with id {schedule_id_to_update}")
 
-        update = new_schedule.as_json()
-        self._collection.replace_one(filter={"id": schedule_id_to_update}, replacement=update)
+        # the version is bumped in the same write, schedules saved before versioning start at 1
+        update = {k: v for k, v in new_schedule.as_json().items() if k != "version"}
+        updated_schedule = self._collection.find_one_and_update(
+            filter={"id": schedule_id_to_update},
+            update={"$set": update, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if updated_schedule is None:
+            return None
+
+        return decode_schedule(document=updated_schedule)
 
     def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
         logger.info(f"Getting schedule with id {schedule_id}")
@@ -47,4 +340,4 @@ class MongoScheduleAccess(ScheduleAccess):
         if found_schedule is None:
             return None
 
-        return Schedule.from_json(json=found_schedule)
+        return decode_schedule(document=found_schedule)
@@ -0,0 +1,37 @@
+import abc
+import datetime
+from typing import List, Optional
+
+from sched_slack_bot.model.schedule import Schedule
+
+
+# pending rotations shared by all replicas, a due job is only ever leased to a single replica at a time
+class ReminderJobAccess(abc.ABC):
+    @abc.abstractmethod
+    def save_job(self, schedule: Schedule) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def add_missing_jobs(self, schedules: List[Schedule]) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def delete_job(self, schedule_id: str) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def has_job(self, schedule_id: str) -> bool:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def claim_due_job(self, owner: str, now: datetime.datetime, lease: datetime.timedelta) -> Optional[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # extends the lease of a claimed job, fails if the job was claimed by another replica or changed in the meantime
+    @abc.abstractmethod
+    def renew_lease(self, schedule_id: str, owner: str, now: datetime.datetime, lease: datetime.timedelta) -> bool:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def complete_job(self, schedule_id: str, owner: str, next_schedule: Schedule) -> bool:
+        raise NotImplementedError("Not Implemented")
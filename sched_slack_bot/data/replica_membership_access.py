@@ -0,0 +1,18 @@
+import abc
+import datetime
+from typing import List
+
+
+# replicas announce themselves with regular heartbeats, replicas without a recent heartbeat are considered gone
+class ReplicaMembershipAccess(abc.ABC):
+    @abc.abstractmethod
+    def heartbeat(self, replica_id: str, now: datetime.datetime) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def get_live_replicas(self, alive_after: datetime.datetime) -> List[str]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def remove_replica(self, replica_id: str) -> None:
+        raise NotImplementedError("Not Implemented")
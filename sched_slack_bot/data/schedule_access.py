@@ -1,7 +1,11 @@
 import abc
-from typing import List, Optional
+import datetime
+from typing import List, Optional, Callable, Iterator
 
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+
+DEFAULT_SCHEDULE_BATCH_SIZE = 500
 
 
 class ScheduleAccess(abc.ABC):
@@ -13,14 +17,80 @@ class ScheduleAccess(abc.ABC):
     def get_available_schedules(self) -> List[Schedule]:
         raise NotImplementedError("Not Implemented")
 
+    # schedules the user created or is a member of
+    @abc.abstractmethod
+    def get_schedules_for_user(self, user_id: str) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # streams all schedules ordered by id, only batch_size schedules are read at once
+    @abc.abstractmethod
+    def iter_schedules(self, batch_size: int = DEFAULT_SCHEDULE_BATCH_SIZE) -> Iterator[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # the next limit schedules ordered by id, starting after the last id of the previous page
+    @abc.abstractmethod
+    def get_schedules_page(self, after_id: Optional[str], limit: int) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # the next limit schedules ordered by the sort order and id after the cursor, or the previous ones if it pages
+    # backwards. the page is always in ascending order and only contains the schedules of user_id if it is set
+    @abc.abstractmethod
+    def get_sorted_schedules_page(
+        self,
+        sort_order: ScheduleSortOrder,
+        limit: int,
+        cursor: Optional[SchedulePageCursor] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # schedules with a next rotation from start (inclusive) to end (exclusive)
+    @abc.abstractmethod
+    def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
     @abc.abstractmethod
     def save_schedule(self, schedule: Schedule) -> None:
         raise NotImplementedError("Not Implemented")
 
+    # replaces the stored schedule and bumps its version, so in-flight changes of the previous one are rejected.
+    # returns the stored schedule with its new version or None if it does not exist (anymore)
+    @abc.abstractmethod
+    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        raise NotImplementedError("Not Implemented")
+
+    # only moves the rotation if the stored schedule still has the expected version, returns whether it did
+    @abc.abstractmethod
+    def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        raise NotImplementedError("Not Implemented")
+
+    # schedules created before their creators were stored by id hold the user name of their creator instead.
+    # rewrites it to the id of that user, returns the number of rewritten schedules
+    @abc.abstractmethod
+    def migrate_created_by(self, user_name: str, user_id: str) -> int:
+        raise NotImplementedError("Not Implemented")
+
     @abc.abstractmethod
-    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> None:
+    def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    # replaces the stored schedules which still have the version of the given ones, like advance_rotation schedules
+    # changed in the meantime are not overwritten
+    @abc.abstractmethod
+    def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
         raise NotImplementedError("Not Implemented")
 
     @abc.abstractmethod
     def delete_schedule(self, schedule_id: str) -> None:
         raise NotImplementedError("Not Implemented")
+
+    # calls on_changed with every schedule changed by any process, or None if the changes have to be read again.
+    # returns whether changes can be watched at all
+    def watch_changes(self, on_changed: Callable[[Optional[Schedule]], None]) -> bool:
+        return False
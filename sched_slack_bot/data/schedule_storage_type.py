@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class ScheduleStorageType(StrEnum):
+    MONGO = "mongo"
+    # a single file database for deployments with a single replica, see SqliteScheduleAccess
+    SQLITE = "sqlite"
+    # kept in the memory of a single process, optionally with snapshots, see InMemoryScheduleAccess
+    MEMORY = "memory"
@@ -0,0 +1,303 @@
+import dataclasses
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+from typing import List, Optional, Iterator, Dict, Any, Sequence, Tuple
+
+from sched_slack_bot.data.schedule_access import ScheduleAccess, DEFAULT_SCHEDULE_BATCH_SIZE
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import format_date, decode_schedules
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+
+logger = logging.getLogger(__name__)
+
+# every chunk of a bulk write is written in a single transaction
+BULK_WRITE_CHUNK_SIZE = 1000
+
+SCHEDULE_COLUMNS = (
+    "id",
+    "display_name",
+    "members",
+    "next_rotation",
+    "time_between_rotations",
+    "channel_id_to_notify_in",
+    "created_by",
+    "current_index",
+    "version",
+)
+SELECT_SCHEDULES = f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM schedules"
+
+# the id is the primary key, the members of a schedule are indexed in their own table for the per user query
+CREATE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS schedules (
+        id TEXT PRIMARY KEY NOT NULL,
+        display_name TEXT NOT NULL,
+        members TEXT NOT NULL,
+        next_rotation TEXT NOT NULL,
+        time_between_rotations REAL NOT NULL,
+        channel_id_to_notify_in TEXT NOT NULL,
+        created_by TEXT NOT NULL,
+        current_index INTEGER NOT NULL,
+        version INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS schedule_members (
+        member TEXT NOT NULL,
+        schedule_id TEXT NOT NULL,
+        PRIMARY KEY (member, schedule_id)
+    ) WITHOUT ROWID
+    """,
+    # the due queries and the sorted pages, which are ordered by the sorted column and then by id
+    "CREATE INDEX IF NOT EXISTS schedules_next_rotation_id ON schedules (next_rotation, id)",
+    "CREATE INDEX IF NOT EXISTS schedules_display_name_id ON schedules (display_name, id)",
+    "CREATE INDEX IF NOT EXISTS schedules_created_by ON schedules (created_by)",
+    "CREATE INDEX IF NOT EXISTS schedule_members_schedule_id ON schedule_members (schedule_id)",
+    # superseded by schedules_next_rotation_id
+    "DROP INDEX IF EXISTS schedules_next_rotation",
+]
+
+INSERT_SCHEDULE = f"INSERT INTO schedules ({', '.join(SCHEDULE_COLUMNS)}) VALUES ({', '.join('?' * len(SCHEDULE_COLUMNS))})"
+UPSERT_SCHEDULE = (
+    INSERT_SCHEDULE + " ON CONFLICT (id) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in SCHEDULE_COLUMNS[1:])
+)
+# only replaces schedules which were not changed since they were read
+UPDATE_SCHEDULE = f"UPDATE schedules SET {', '.join(f'{c} = ?' for c in SCHEDULE_COLUMNS)} WHERE id = ? AND version = ?"
+# edits bump the stored version instead of taking the one of the edited schedule
+EDIT_SCHEDULE = (
+    f"UPDATE schedules SET {', '.join(f'{c} = ?' for c in SCHEDULE_COLUMNS if c != 'version')}, version = version + 1"
+    " WHERE id = ? RETURNING version"
+)
+# members are only indexed for schedules which exist
+INSERT_MEMBER = "INSERT OR IGNORE INTO schedule_members (member, schedule_id) SELECT ?, id FROM schedules WHERE id = ?"
+DELETE_MEMBERS = "DELETE FROM schedule_members WHERE schedule_id = ?"
+
+
+def _serialize_date(date: datetime.datetime) -> str:
+    # the fixed width format sorts lexicographically in chronological order
+    return format_date(date=date)
+
+
+def _to_row(schedule: Schedule) -> Tuple[Any, ...]:
+    return (
+        schedule.id,
+        schedule.display_name,
+        json.dumps(schedule.members),
+        _serialize_date(schedule.next_rotation),
+        schedule.time_between_rotations.total_seconds(),
+        schedule.channel_id_to_notify_in,
+        schedule.created_by,
+        schedule.current_index,
+        schedule.version,
+    )
+
+
+def _from_row(row: Sequence[Any]) -> Dict[str, Any]:
+    schedule_json: Dict[str, Any] = dict(zip(SCHEDULE_COLUMNS, row))
+    schedule_json["members"] = json.loads(schedule_json["members"])
+
+    return schedule_json
+
+
+class SqliteScheduleAccess(ScheduleAccess):
+    def __init__(self, database_path: str):
+        self._database_path = database_path
+        # writes of all threads are serialized on a single connection
+        self._connection = sqlite3.connect(database=database_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # every thread reads with its own connection, an in memory database only exists on the connection it was opened on
+        self._read_connections = threading.local()
+        self._opened_read_connections: List[sqlite3.Connection] = list()
+        self._read_connections_lock = threading.Lock()
+        self._reads_use_write_connection = database_path == ":memory:"
+
+        with self._lock:
+            # readers neither block the writer nor wait for it and commits only have to be synced at checkpoints
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                for statement in CREATE_SCHEMA:
+                    self._connection.execute(statement)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        with self._read_connections_lock:
+            for read_connection in self._opened_read_connections:
+                read_connection.close()
+
+    def _get_read_connection(self) -> sqlite3.Connection:
+        read_connection: Optional[sqlite3.Connection] = getattr(self._read_connections, "connection", None)
+        if read_connection is None:
+            # handlers run on a bounded pool of threads, so only a few connections are ever opened
+            read_connection = sqlite3.connect(database=self._database_path, check_same_thread=False)
+            self._read_connections.connection = read_connection
+            with self._read_connections_lock:
+                self._opened_read_connections.append(read_connection)
+
+        return read_connection
+
+    def _select(self, where: str = "", parameters: Sequence[Any] = ()) -> List[Schedule]:
+        # statements are compiled once per connection and reused from its statement cache
+        if self._reads_use_write_connection:
+            with self._lock:
+                rows = self._connection.execute(f"{SELECT_SCHEDULES} {where}", parameters).fetchall()
+        else:
+            # reads see the last committed write without waiting for the lock of the writer
+            rows = self._get_read_connection().execute(f"{SELECT_SCHEDULES} {where}", parameters).fetchall()
+
+        return decode_schedules(documents=(_from_row(row=row) for row in rows))
+
+    def _write_members(self, schedules: Sequence[Schedule]) -> None:
+        self._connection.executemany(DELETE_MEMBERS, [(s.id,) for s in schedules])
+        self._connection.executemany(INSERT_MEMBER, [(member, s.id) for s in schedules for member in s.members])
+
+    def get_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        logger.info(f"Getting schedule with id {schedule_id}")
+
+        found_schedules = self._select(where="WHERE id = ?", parameters=(schedule_id,))
+
+        return found_schedules[0] if len(found_schedules) > 0 else None
+
+    def get_available_schedules(self) -> List[Schedule]:
+        return self._select()
+
+    def get_schedules_for_user(self, user_id: str) -> List[Schedule]:
+        return self._select(
+            where="WHERE created_by = ? OR id IN (SELECT schedule_id FROM schedule_members WHERE member = ?) ORDER BY id",
+            parameters=(user_id, user_id),
+        )
+
+    def iter_schedules(self, batch_size: int = DEFAULT_SCHEDULE_BATCH_SIZE) -> Iterator[Schedule]:
+        # batches are read as pages, so the connection is not locked while the schedules are consumed
+        batch = self.get_schedules_page(after_id=None, limit=batch_size)
+        while len(batch) > 0:
+            yield from batch
+            batch = self.get_schedules_page(after_id=batch[-1].id, limit=batch_size)
+
+    def get_schedules_page(self, after_id: Optional[str], limit: int) -> List[Schedule]:
+        if after_id is None:
+            return self._select(where="ORDER BY id LIMIT ?", parameters=(limit,))
+
+        return self._select(where="WHERE id > ? ORDER BY id LIMIT ?", parameters=(after_id, limit))
+
+    def get_sorted_schedules_page(
+        self,
+        sort_order: ScheduleSortOrder,
+        limit: int,
+        cursor: Optional[SchedulePageCursor] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Schedule]:
+        # the sort orders are named like their columns
+        column = str(sort_order)
+        conditions: List[str] = list()
+        parameters: List[Any] = list()
+
+        if user_id is not None:
+            conditions.append("(created_by = ? OR id IN (SELECT schedule_id FROM schedule_members WHERE member = ?))")
+            parameters.extend([user_id, user_id])
+
+        backwards = cursor is not None and cursor.backwards
+        if cursor is not None:
+            sort_value = cursor.sort_value
+            conditions.append(f"({column}, id) {'<' if backwards else '>'} (?, ?)")
+            parameters.extend(
+                [_serialize_date(sort_value) if isinstance(sort_value, datetime.datetime) else sort_value, cursor.schedule_id]
+            )
+
+        # a previous page is read in descending order from the cursor and reversed afterwards
+        direction = "DESC" if backwards else "ASC"
+        where = f"WHERE {' AND '.join(conditions)}" if len(conditions) > 0 else ""
+        schedules = self._select(
+            where=f"{where} ORDER BY {column} {direction}, id {direction} LIMIT ?", parameters=(*parameters, limit)
+        )
+
+        return schedules[::-1] if backwards else schedules
+
+    def get_schedules_due_before(self, before: datetime.datetime) -> List[Schedule]:
+        return self._select(where="WHERE next_rotation < ?", parameters=(_serialize_date(before),))
+
+    def get_schedules_due_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Schedule]:
+        return self._select(
+            where="WHERE next_rotation >= ? AND next_rotation < ?",
+            parameters=(_serialize_date(start), _serialize_date(end)),
+        )
+
+    def save_schedule(self, schedule: Schedule) -> None:
+        logger.info(f"Saving schedule with id {schedule.id}")
+
+        with self._lock, self._connection:
+            self._connection.execute(INSERT_SCHEDULE, _to_row(schedule=schedule))
+            self._write_members(schedules=[schedule])
+
+    def update_schedule(self, schedule_id_to_update: str, new_schedule: Schedule) -> Optional[Schedule]:
+        logger.info(f"Updating schedule with id {schedule_id_to_update}")
+
+        row = [v for c, v in zip(SCHEDULE_COLUMNS, _to_row(schedule=new_schedule)) if c != "version"]
+        with self._lock, self._connection:
+            updated_version = self._connection.execute(EDIT_SCHEDULE, (*row, schedule_id_to_update)).fetchone()
+            if updated_version is None:
+                return None
+
+            updated_schedule = dataclasses.replace(new_schedule, version=updated_version[0])
+            self._write_members(schedules=[updated_schedule])
+
+        return updated_schedule
+
+    def advance_rotation(
+        self, schedule_id: str, next_rotation: datetime.datetime, current_index: int, expected_version: int
+    ) -> bool:
+        logger.info(f"Advancing rotation of schedule with id {schedule_id}")
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "UPDATE schedules SET next_rotation = ?, current_index = ?, version = ? WHERE id = ? AND version = ?",
+                (_serialize_date(next_rotation), current_index, expected_version + 1, schedule_id, expected_version),
+            )
+
+        return cursor.rowcount == 1
+
+    def migrate_created_by(self, user_name: str, user_id: str) -> int:
+        # the version stays the same, reminders moving the rotation in the meantime must not be rejected
+        with self._lock, self._connection:
+            cursor = self._connection.execute("UPDATE schedules SET created_by = ? WHERE created_by = ?", (user_id, user_name))
+
+        if cursor.rowcount > 0:
+            logger.info(f"Migrated the creator of {cursor.rowcount} schedules to {user_id}")
+
+        return cursor.rowcount
+
+    def bulk_save_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Saving {len(schedules)} schedules")
+
+        for start in range(0, len(schedules), BULK_WRITE_CHUNK_SIZE):
+            chunk = schedules[start : start + BULK_WRITE_CHUNK_SIZE]
+
+            with self._lock, self._connection:
+                self._connection.executemany(UPSERT_SCHEDULE, [_to_row(schedule=s) for s in chunk])
+                self._write_members(schedules=chunk)
+
+    def bulk_update_schedules(self, schedules: List[Schedule]) -> None:
+        logger.info(f"Updating {len(schedules)} schedules")
+
+        for start in range(0, len(schedules), BULK_WRITE_CHUNK_SIZE):
+            chunk = schedules[start : start + BULK_WRITE_CHUNK_SIZE]
+
+            with self._lock, self._connection:
+                # the members of schedules changed in the meantime are kept as well
+                updated_schedules = [
+                    s
+                    for s in chunk
+                    if self._connection.execute(UPDATE_SCHEDULE, (*_to_row(schedule=s), s.id, s.version)).rowcount == 1
+                ]
+                self._write_members(schedules=updated_schedules)
+
+    def delete_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Deleting schedule with id {schedule_id}")
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+            self._connection.execute(DELETE_MEMBERS, (schedule_id,))
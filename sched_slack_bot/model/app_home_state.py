@@ -0,0 +1,46 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.utils.slack_typing_stubs import SlackView
+
+
+# what a user is looking at in the app home, everybody starts at the first page of their own schedules by next rotation
+@dataclass(frozen=True)
+class AppHomeState:
+    show_all_schedules: bool = False
+    sort_order: ScheduleSortOrder = ScheduleSortOrder.NEXT_ROTATION
+    cursor: Optional[SchedulePageCursor] = None
+
+    def as_json(self) -> Dict[str, Any]:
+        return {
+            "show_all_schedules": self.show_all_schedules,
+            "sort_order": str(self.sort_order),
+            "cursor": None if self.cursor is None else self.cursor.as_json(),
+        }
+
+    @classmethod
+    def from_json(cls, state_json: Dict[str, Any]) -> "AppHomeState":
+        cursor_json = state_json["cursor"]
+
+        return cls(
+            show_all_schedules=state_json["show_all_schedules"],
+            sort_order=ScheduleSortOrder(state_json["sort_order"]),
+            cursor=None if cursor_json is None else SchedulePageCursor.from_json(cursor_json=cursor_json),
+        )
+
+    def as_private_metadata(self) -> str:
+        return json.dumps(self.as_json())
+
+    @classmethod
+    def from_view(cls, view: Optional[SlackView]) -> "AppHomeState":
+        # the state is published as private metadata of the view, slack sends it back with every action on the view
+        private_metadata = None if view is None else view.get("private_metadata")
+        if not private_metadata:
+            return cls()
+
+        try:
+            return cls.from_json(state_json=json.loads(private_metadata))
+        except (ValueError, KeyError, TypeError):
+            return cls()
@@ -4,6 +4,8 @@ from sched_slack_bot.model.schedule import Schedule
 
 
 class Reminder:
+    __slots__ = ("_schedule",)
+
     def __init__(self, schedule: Schedule):
         self._schedule = schedule
 
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import datetime
 import logging
+import sys
 import uuid
 from dataclasses import dataclass
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Sequence
 
 from sched_slack_bot.utils.find_block_value import find_block_value
 from sched_slack_bot.utils.slack_typing_stubs import SlackState, SlackBody
@@ -22,8 +23,6 @@ from sched_slack_bot.views.schedule_dialog_block_ids import (
 
 logger = logging.getLogger(__name__)
 
-SERIALIZATION_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
-
 
 def _raise_if_not_string(value: Optional[Union[str, List[str]]], name: str) -> str:
     if not isinstance(value, str):
@@ -57,18 +56,25 @@ def _get_datetime_from_modal_submission(
     return datetime.datetime(day=date.day, month=date.month, year=date.year, hour=int(hour), minute=int(minute))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Schedule:
     id: str
     display_name: str
-    members: List[str]
+    # always stored as a tuple of interned user ids, all schedules of a user share the same id string
+    members: Sequence[str]
     next_rotation: datetime.datetime
     time_between_rotations: datetime.timedelta
     channel_id_to_notify_in: str
     created_by: str
     current_index: int = 0
+    # incremented with every rotation, guards against overwriting concurrent rotations
+    version: int = 0
 
     def __post_init__(self) -> None:
+        # members of the previous schedule are already interned, so rotations keep sharing the same tuple
+        if not isinstance(self.members, tuple) or any(sys.intern(m) is not m for m in self.members):
+            object.__setattr__(self, "members", tuple(sys.intern(m) for m in self.members))
+
         if self.time_between_rotations.total_seconds() == 0:
             raise ValueError("A schedule with 0 time between rotations cannot be handled!")
 
@@ -94,6 +100,7 @@ class Schedule:
             channel_id_to_notify_in=self.channel_id_to_notify_in,
             current_index=self.next_index,
             created_by=self.created_by,
+            version=self.version + 1,
         )
 
     @property
@@ -104,27 +111,16 @@ class Schedule:
         return {
             "id": self.id,
             "display_name": self.display_name,
-            "members": self.members,
-            "next_rotation": self.next_rotation.strftime(SERIALIZATION_DATE_FORMAT),
+            "members": list(self.members),
+            # stored as a native date, with the precision of the previously stored strings
+            "next_rotation": self.next_rotation.replace(microsecond=0),
             "time_between_rotations": self.time_between_rotations.total_seconds(),
             "channel_id_to_notify_in": self.channel_id_to_notify_in,
             "created_by": self.created_by,
             "current_index": self.current_index,
+            "version": self.version,
         }
 
-    @classmethod
-    def from_json(cls, json: Dict[str, Any]) -> Schedule:
-        return Schedule(
-            id=json["id"],
-            display_name=json["display_name"],
-            members=json["members"],
-            next_rotation=datetime.datetime.strptime(json["next_rotation"], SERIALIZATION_DATE_FORMAT),
-            time_between_rotations=datetime.timedelta(seconds=json["time_between_rotations"]),
-            channel_id_to_notify_in=json["channel_id_to_notify_in"],
-            created_by=json["created_by"],
-            current_index=json["current_index"],
-        )
-
     @classmethod
     def from_modal_submission(cls, submission_body: SlackBody) -> Schedule:
         state = submission_body["view"]["state"]
@@ -166,6 +162,7 @@ class Schedule:
             next_rotation=next_rotation,
             time_between_rotations=time_between_rotations,
             channel_id_to_notify_in=channel_id_to_notify_in,
-            created_by=submission_body["user"]["name"],
+            # the id instead of the name, so the schedules of a user can be looked up
+            created_by=submission_body["user"]["id"],
             current_index=0,
         )
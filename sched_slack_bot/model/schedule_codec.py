@@ -0,0 +1,96 @@
+import datetime
+import sys
+from typing import Any, Dict, Mapping, Optional, Iterable, List
+
+from sched_slack_bot.model.schedule import Schedule
+
+# the format of dates stored as strings, e.g. by older versions and the sqlite storage
+SERIALIZATION_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+SERIALIZED_DATE_SUFFIX = ".000Z"
+SERIALIZED_DATE_LENGTH = len("2022-01-01T10:00:00.000Z")
+
+REQUIRED_STRING_FIELDS = ("id", "display_name", "channel_id_to_notify_in", "created_by")
+
+
+class ScheduleDecodeError(ValueError):
+    pass
+
+
+def format_date(date: datetime.datetime) -> str:
+    # same result as strftime with SERIALIZATION_DATE_FORMAT, isoformat is implemented in C without a format string
+    return date.isoformat(timespec="seconds")[:19] + SERIALIZED_DATE_SUFFIX
+
+
+def parse_date(value: str) -> datetime.datetime:
+    # strptime interprets the format string for every call, fromisoformat only has to parse the fixed width prefix
+    if len(value) != SERIALIZED_DATE_LENGTH or value[10] != "T" or not value.endswith(SERIALIZED_DATE_SUFFIX):
+        raise ScheduleDecodeError(f"Date {value!r} does not match the format {SERIALIZATION_DATE_FORMAT}")
+
+    try:
+        return datetime.datetime.fromisoformat(value[:19])
+    except ValueError as e:
+        raise ScheduleDecodeError(f"Date {value!r} does not match the format {SERIALIZATION_DATE_FORMAT}") from e
+
+
+# decoding a page of schedules shares this cache, most schedules rotate with one of a few intervals
+TimedeltaCache = Dict[float, datetime.timedelta]
+
+
+def decode_schedule(document: Mapping[str, Any], timedelta_cache: Optional[TimedeltaCache] = None) -> Schedule:
+    for field in REQUIRED_STRING_FIELDS:
+        if not isinstance(document.get(field), str):
+            raise ScheduleDecodeError(f"Field {field} of schedule {document.get('id')} must be a string")
+
+    members = document.get("members")
+    if not isinstance(members, (list, tuple)):
+        raise ScheduleDecodeError(f"Field members of schedule {document['id']} must be a list of strings")
+    try:
+        # interning also rejects anything but strings
+        members = tuple(map(sys.intern, members))
+    except TypeError as e:
+        raise ScheduleDecodeError(f"Field members of schedule {document['id']} must be a list of strings") from e
+
+    next_rotation = document.get("next_rotation")
+    # schedules saved before dates were stored natively
+    if isinstance(next_rotation, str):
+        next_rotation = parse_date(value=next_rotation)
+    elif not isinstance(next_rotation, datetime.datetime):
+        raise ScheduleDecodeError(f"Field next_rotation of schedule {document['id']} must be a date")
+
+    seconds = document.get("time_between_rotations")
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)):
+        raise ScheduleDecodeError(f"Field time_between_rotations of schedule {document['id']} must be a number")
+
+    time_between_rotations = None if timedelta_cache is None else timedelta_cache.get(seconds)
+    if time_between_rotations is None:
+        time_between_rotations = datetime.timedelta(seconds=seconds)
+        if timedelta_cache is not None:
+            timedelta_cache[seconds] = time_between_rotations
+
+    current_index = document.get("current_index")
+    if isinstance(current_index, bool) or not isinstance(current_index, int) or not 0 <= current_index < len(members):
+        raise ScheduleDecodeError(f"Field current_index of schedule {document['id']} must be an index of its members")
+
+    # schedules saved before versioning was introduced
+    version = document.get("version", 0)
+    if isinstance(version, bool) or not isinstance(version, int):
+        raise ScheduleDecodeError(f"Field version of schedule {document['id']} must be an integer")
+
+    return Schedule(
+        id=document["id"],
+        display_name=document["display_name"],
+        members=members,
+        next_rotation=next_rotation,
+        time_between_rotations=time_between_rotations,
+        channel_id_to_notify_in=document["channel_id_to_notify_in"],
+        created_by=document["created_by"],
+        current_index=current_index,
+        version=version,
+    )
+
+
+def decode_schedules(documents: Iterable[Mapping[str, Any]]) -> List[Schedule]:
+    # decodes a whole page of a cursor, equal intervals are only decoded once per page
+    timedelta_cache: TimedeltaCache = dict()
+
+    return [decode_schedule(document=d, timedelta_cache=timedelta_cache) for d in documents]
@@ -0,0 +1,112 @@
+import bisect
+import datetime
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Union, Tuple, Dict, Any, Optional, List, Sequence, TypeVar
+
+from sched_slack_bot.model.schedule import Schedule
+
+SortValue = Union[str, datetime.datetime]
+SortKey = TypeVar("SortKey", Tuple[str, str], Tuple[datetime.datetime, str])
+
+
+class ScheduleSortOrder(StrEnum):
+    # the values are the names of the sorted fields
+    NEXT_ROTATION = "next_rotation"
+    DISPLAY_NAME = "display_name"
+
+
+def get_sort_value(schedule: Schedule, sort_order: ScheduleSortOrder) -> SortValue:
+    return schedule.next_rotation if sort_order == ScheduleSortOrder.NEXT_ROTATION else schedule.display_name
+
+
+# keyset cursor of a page, the page starts after the schedule with the sort value and id or ends before it when
+# paging backwards. ties of the sort value are ordered by id, so every schedule has a distinct position.
+@dataclass(frozen=True)
+class SchedulePageCursor:
+    sort_order: ScheduleSortOrder
+    sort_value: SortValue
+    schedule_id: str
+    backwards: bool = False
+
+    @classmethod
+    def after(cls, schedule: Schedule, sort_order: ScheduleSortOrder) -> "SchedulePageCursor":
+        return cls(
+            sort_order=sort_order, sort_value=get_sort_value(schedule=schedule, sort_order=sort_order), schedule_id=schedule.id
+        )
+
+    @classmethod
+    def before(cls, schedule: Schedule, sort_order: ScheduleSortOrder) -> "SchedulePageCursor":
+        return cls(
+            sort_order=sort_order,
+            sort_value=get_sort_value(schedule=schedule, sort_order=sort_order),
+            schedule_id=schedule.id,
+            backwards=True,
+        )
+
+    def as_json(self) -> Dict[str, Any]:
+        return {
+            "sort_order": str(self.sort_order),
+            "sort_value": self.sort_value.isoformat() if isinstance(self.sort_value, datetime.datetime) else self.sort_value,
+            "schedule_id": self.schedule_id,
+            "backwards": self.backwards,
+        }
+
+    @classmethod
+    def from_json(cls, cursor_json: Dict[str, Any]) -> "SchedulePageCursor":
+        sort_order = ScheduleSortOrder(cursor_json["sort_order"])
+        sort_value = cursor_json["sort_value"]
+
+        return cls(
+            sort_order=sort_order,
+            sort_value=(
+                datetime.datetime.fromisoformat(sort_value) if sort_order == ScheduleSortOrder.NEXT_ROTATION else sort_value
+            ),
+            schedule_id=cursor_json["schedule_id"],
+            backwards=cursor_json["backwards"],
+        )
+
+
+def get_sorted_page(sorted_keys: Sequence[SortKey], limit: int, cursor: Optional[SchedulePageCursor]) -> Sequence[SortKey]:
+    # sorted_keys are the (sort value, id) keys of the schedules in ascending order
+    if cursor is None:
+        return sorted_keys[:limit]
+
+    cursor_key = (cursor.sort_value, cursor.schedule_id)
+    if cursor.backwards:
+        end = bisect.bisect_left(sorted_keys, cursor_key)
+        return sorted_keys[max(0, end - limit) : end]
+
+    start = bisect.bisect_right(sorted_keys, cursor_key)
+    return sorted_keys[start : start + limit]
+
+
+@dataclass(frozen=True)
+class SchedulePage:
+    schedules: List[Schedule]
+    previous_page_cursor: Optional[SchedulePageCursor] = None
+    next_page_cursor: Optional[SchedulePageCursor] = None
+
+
+def get_schedule_page(
+    schedules: List[Schedule], page_size: int, sort_order: ScheduleSortOrder, cursor: Optional[SchedulePageCursor]
+) -> SchedulePage:
+    # schedules were loaded with a limit of page_size + 1, the additional schedule shows that there is another page
+    has_more = len(schedules) > page_size
+    if cursor is not None and cursor.backwards:
+        schedules = schedules[-page_size:] if has_more else schedules
+        has_previous_page, has_next_page = has_more, True
+    else:
+        schedules = schedules[:page_size]
+        has_previous_page, has_next_page = cursor is not None, has_more
+
+    if len(schedules) == 0:
+        return SchedulePage(schedules=schedules)
+
+    return SchedulePage(
+        schedules=schedules,
+        previous_page_cursor=(
+            SchedulePageCursor.before(schedule=schedules[0], sort_order=sort_order) if has_previous_page else None
+        ),
+        next_page_cursor=SchedulePageCursor.after(schedule=schedules[-1], sort_order=sort_order) if has_next_page else None,
+    )
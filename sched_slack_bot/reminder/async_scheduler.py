@@ -0,0 +1,105 @@
+import asyncio
+import inspect
+import logging
+from typing import Dict, Set, List, Optional, Callable, Awaitable, Union, Any
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import get_seconds_until_next_rotation
+from sched_slack_bot.reminder.sender import AsyncReminderSender
+
+logger = logging.getLogger(__name__)
+
+AsyncReminderExecutedCallback = Callable[[Schedule], Union[Awaitable[None], None]]
+
+
+class AsyncReminderScheduler:
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        reminder_executed_callback: Optional[AsyncReminderExecutedCallback] = None,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        self._loop = loop
+        self._reminder_executed_callback = reminder_executed_callback
+        self._reminder_horizon = reminder_horizon
+        self._handle_by_schedule_id: Dict[str, asyncio.TimerHandle] = dict()
+        # the loop only keeps weak references to tasks, so running reminders are referenced here
+        self._running_reminders: Set[asyncio.Task[None]] = set()
+
+    @property
+    def pending_reminder_count(self) -> int:
+        return len(self._handle_by_schedule_id)
+
+    def _is_on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _run_on_loop(self, callback: Callable[..., None], *args: Any) -> None:
+        # bolt listeners run on worker threads, the timers may only be touched from the loop itself
+        if self._is_on_loop():
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: AsyncReminderSender) -> None:
+        interval = get_seconds_until_next_rotation(schedule=schedule)
+        logger.info(f"Scheduling Reminder at {interval}s from now")
+
+        self._run_on_loop(self._arm, Reminder(schedule=schedule), reminder_sender, self._loop.time() + interval)
+
+    def schedule_all_reminders(self, schedules: List[Schedule], reminder_sender: AsyncReminderSender) -> None:
+        for schedule in schedules:
+            self.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Removing scheduled reminder for schedule id {schedule_id}")
+
+        self._run_on_loop(self._disarm, schedule_id)
+
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        return schedule_id in self._handle_by_schedule_id
+
+    def _arm(self, reminder: Reminder, reminder_sender: AsyncReminderSender, when: float) -> None:
+        self._disarm(schedule_id=reminder.schedule_id)
+
+        self._handle_by_schedule_id[reminder.schedule_id] = self._loop.call_at(
+            when, self._reminder_due, reminder, reminder_sender
+        )
+
+    def _disarm(self, schedule_id: str) -> None:
+        handle = self._handle_by_schedule_id.pop(schedule_id, None)
+
+        if handle is not None:
+            handle.cancel()
+
+    def _reminder_due(self, reminder: Reminder, reminder_sender: AsyncReminderSender) -> None:
+        self._handle_by_schedule_id.pop(reminder.schedule_id, None)
+
+        task = self._loop.create_task(self.execute_reminder(reminder=reminder, reminder_sender=reminder_sender))
+        self._running_reminders.add(task)
+        task.add_done_callback(self._reminder_done)
+
+    def _reminder_done(self, task: "asyncio.Task[None]") -> None:
+        self._running_reminders.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to execute reminder", exc_info=task.exception())
+
+    async def execute_reminder(self, reminder: Reminder, reminder_sender: AsyncReminderSender) -> None:
+        logger.info(f"Executing reminder {reminder.display_name}")
+
+        await reminder_sender.send_reminder(reminder=reminder)
+
+        next_schedule = reminder.next_schedule
+        # rotations beyond the horizon are armed by one of its next refills
+        if self._reminder_horizon is None or self._reminder_horizon.contains(date=next_schedule.next_rotation):
+            self.schedule_reminder(schedule=next_schedule, reminder_sender=reminder_sender)
+
+        if self._reminder_executed_callback is not None:
+            callback_result = self._reminder_executed_callback(next_schedule)
+            if inspect.isawaitable(callback_result):
+                await callback_result
@@ -0,0 +1,127 @@
+import datetime
+import logging
+import socket
+import threading
+import uuid
+from typing import List, Optional, Callable
+
+from sched_slack_bot.data.reminder_job_access import ReminderJobAccess
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler
+from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past
+
+logger = logging.getLogger(__name__)
+
+# has to be longer than sending a single reminder takes, otherwise another replica sends it again
+DEFAULT_LEASE = datetime.timedelta(minutes=5)
+DEFAULT_POLL_INTERVAL = datetime.timedelta(seconds=5)
+
+
+def _get_default_owner() -> str:
+    return f"{socket.gethostname()}-{uuid.uuid4()}"
+
+
+# pending rotations are stored as jobs shared by all replicas instead of timers in this process.
+# every replica polls for due jobs and leases them atomically, jobs of a crashed replica are picked up once the lease expired.
+class DistributedReminderScheduler(BaseReminderScheduler):
+    def __init__(
+        self,
+        reminder_job_access: ReminderJobAccess,
+        owner: Optional[str] = None,
+        lease: datetime.timedelta = DEFAULT_LEASE,
+        poll_interval: datetime.timedelta = DEFAULT_POLL_INTERVAL,
+        reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+        reminder_executor: Optional[ReminderExecutor] = None,
+    ) -> None:
+        super().__init__(reminder_executed_callback=reminder_executed_callback, reminder_executor=reminder_executor)
+        self._reminder_job_access = reminder_job_access
+        self._owner = _get_default_owner() if owner is None else owner
+        self._lease = lease
+        self._poll_interval = poll_interval
+        self._wake_up = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+        self._poller_lock = threading.Lock()
+
+    @property
+    def owner(self) -> str:
+        return self._owner
+
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        logger.info(f"Saving reminder job for schedule {schedule.id} due at {schedule.next_rotation}")
+
+        self._reminder_job_access.save_job(schedule=schedule)
+        self._start_poller_if_necessary(reminder_sender=reminder_sender)
+        self._wake_up.set()
+
+    def schedule_all_reminders(self, schedules: List[Schedule], reminder_sender: ReminderSender) -> None:
+        self._reminder_job_access.add_missing_jobs(schedules=schedules)
+        self._start_poller_if_necessary(reminder_sender=reminder_sender)
+
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Removing reminder job for schedule id {schedule_id}")
+
+        self._reminder_job_access.delete_job(schedule_id=schedule_id)
+
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        return self._reminder_job_access.has_job(schedule_id=schedule_id)
+
+    def _start_poller_if_necessary(self, reminder_sender: ReminderSender) -> None:
+        with self._poller_lock:
+            if self._poller is not None:
+                return
+
+            self._poller = threading.Thread(
+                target=self._poll_forever, args=(reminder_sender,), name="reminder-job-poller", daemon=True
+            )
+            self._poller.start()
+
+    def _poll_forever(self, reminder_sender: ReminderSender) -> None:
+        while True:
+            try:
+                self._run_due_jobs(reminder_sender=reminder_sender)
+            except Exception:
+                logger.exception("Failed to claim due reminder jobs")
+
+            self._wake_up.wait(timeout=self._poll_interval.total_seconds())
+            self._wake_up.clear()
+
+    def _run_due_jobs(self, reminder_sender: ReminderSender) -> int:
+        run_jobs = 0
+
+        while True:
+            schedule = self._reminder_job_access.claim_due_job(
+                owner=self._owner, now=datetime.datetime.now(), lease=self._lease
+            )
+
+            if schedule is None:
+                return run_jobs
+
+            self._reminder_due(reminder=Reminder(schedule=schedule), reminder_sender=reminder_sender)
+            run_jobs += 1
+
+    def execute_reminder(self, reminder: Reminder, reminder_sender: ReminderSender) -> None:
+        logger.info(f"Executing reminder {reminder.display_name}")
+
+        # the job may have waited in the executor queue for longer than the lease, another replica claimed it then
+        if not self._reminder_job_access.renew_lease(
+            schedule_id=reminder.schedule_id, owner=self._owner, now=datetime.datetime.now(), lease=self._lease
+        ):
+            logger.warning(f"Lost the lease of the reminder job for schedule {reminder.schedule_id} before sending it")
+            return
+
+        # a failing reminder keeps its lease and is retried by any replica once the lease expired
+        reminder_sender.send_reminder(reminder=reminder)
+
+        # a job overdue by several rotations, e.g. after all replicas were down, continues from now on
+        next_schedule = fix_schedule_from_the_past(schedule=reminder.next_schedule)
+        if not self._reminder_job_access.complete_job(
+            schedule_id=reminder.schedule_id, owner=self._owner, next_schedule=next_schedule
+        ):
+            logger.warning(f"Reminder job for schedule {reminder.schedule_id} was changed or deleted while executing it")
+            return
+
+        if self._reminder_executed_callback is not None:
+            self._reminder_executed_callback(next_schedule)
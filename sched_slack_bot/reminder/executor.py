@@ -0,0 +1,75 @@
+import dataclasses
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ReminderExecutorMetrics:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    # submissions that had to wait, because all workers were busy and the queue was full
+    throttled: int = 0
+    queued: int = 0
+    running: int = 0
+    max_queued: int = 0
+
+
+# decouples a reminder becoming due from delivering it: due reminders are queued for a fixed number of workers,
+# once the queue is full submitting blocks the timer/dispatcher thread until a worker frees up.
+class ReminderExecutor:
+    def __init__(self, max_workers: int, max_queue_size: int) -> None:
+        if max_workers < 1 or max_queue_size < 0:
+            raise ValueError(f"Invalid reminder executor size {max_workers=}, {max_queue_size=}")
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reminder-worker")
+        self._capacity = threading.BoundedSemaphore(value=max_workers + max_queue_size)
+        self._metrics = ReminderExecutorMetrics()
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def metrics(self) -> ReminderExecutorMetrics:
+        with self._metrics_lock:
+            return dataclasses.replace(self._metrics)
+
+    def submit(self, function: Callable[[], None]) -> None:
+        if not self._capacity.acquire(blocking=False):
+            logger.warning("Reminder queue is full, waiting for a free worker")
+            with self._metrics_lock:
+                self._metrics.throttled += 1
+            self._capacity.acquire()
+
+        with self._metrics_lock:
+            self._metrics.submitted += 1
+            self._metrics.queued += 1
+            self._metrics.max_queued = max(self._metrics.max_queued, self._metrics.queued)
+
+        self._executor.submit(self._run, function)
+
+    def _run(self, function: Callable[[], None]) -> None:
+        with self._metrics_lock:
+            self._metrics.queued -= 1
+            self._metrics.running += 1
+
+        try:
+            function()
+            succeeded = True
+        except Exception:
+            logger.exception("Failed to execute reminder")
+            succeeded = False
+        finally:
+            self._capacity.release()
+
+        with self._metrics_lock:
+            self._metrics.running -= 1
+            if succeeded:
+                self._metrics.completed += 1
+            else:
+                self._metrics.failed += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,33 @@
+import bisect
+import hashlib
+from typing import Iterable, List, FrozenSet
+
+# more virtual nodes spread the keys more evenly between members, at the cost of a larger ring
+DEFAULT_VIRTUAL_NODES = 100
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+# every member owns the keys hashing right before its virtual nodes on the ring.
+# a joining or leaving member only moves the keys next to its own virtual nodes, about 1/n of all keys.
+class ConsistentHashRing:
+    def __init__(self, members: Iterable[str], virtual_nodes: int = DEFAULT_VIRTUAL_NODES) -> None:
+        self._members = frozenset(members)
+
+        nodes = sorted((_hash(f"{member}-{i}"), member) for member in self._members for i in range(virtual_nodes))
+        self._node_hashes: List[int] = [h for h, _ in nodes]
+        self._node_members: List[str] = [m for _, m in nodes]
+
+    @property
+    def members(self) -> FrozenSet[str]:
+        return self._members
+
+    def get_owner(self, key: str) -> str:
+        if len(self._node_hashes) == 0:
+            raise ValueError("A hash ring without members has no owner for any key")
+
+        index = bisect.bisect(self._node_hashes, _hash(key)) % len(self._node_hashes)
+
+        return self._node_members[index]
@@ -0,0 +1,145 @@
+import dataclasses
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Callable
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler, get_seconds_until_next_rotation
+from sched_slack_bot.reminder.sender import ReminderSender
+
+logger = logging.getLogger(__name__)
+
+# rebuilding the heap is O(n), so only do it once cancelled entries make up a large part of it
+MIN_CANCELLED_ENTRIES_FOR_COMPACTION = 64
+
+
+@dataclasses.dataclass(order=True)
+class _PendingReminder:
+    deadline: float
+    sequence: int
+    reminder: Reminder = dataclasses.field(compare=False)
+    reminder_sender: ReminderSender = dataclasses.field(compare=False)
+    cancelled: bool = dataclasses.field(default=False, compare=False)
+
+
+# all reminders are run from a single dispatcher thread, ordered by a min-heap of monotonic deadlines.
+# arming is O(log n), cancelling is O(1) since cancelled entries are only dropped lazily.
+class HeapReminderScheduler(BaseReminderScheduler):
+    def __init__(
+        self,
+        reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+        reminder_executor: Optional[ReminderExecutor] = None,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        super().__init__(
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+            reminder_horizon=reminder_horizon,
+        )
+        self._heap: List[_PendingReminder] = []
+        self._pending_by_schedule_id: Dict[str, _PendingReminder] = dict()
+        self._cancelled_count = 0
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    @property
+    def pending_reminder_count(self) -> int:
+        with self._condition:
+            return len(self._pending_by_schedule_id)
+
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        interval = get_seconds_until_next_rotation(schedule=schedule)
+        logger.info(f"Scheduling Reminder at {interval}s from now")
+
+        pending_reminder = _PendingReminder(
+            deadline=time.monotonic() + interval,
+            sequence=next(self._sequence),
+            reminder=Reminder(schedule=schedule),
+            reminder_sender=reminder_sender,
+        )
+
+        with self._condition:
+            # a schedule only ever has one pending reminder, re-scheduling replaces it
+            self._cancel(schedule_id=schedule.id)
+            self._pending_by_schedule_id[schedule.id] = pending_reminder
+            heapq.heappush(self._heap, pending_reminder)
+            self._start_dispatcher_if_necessary()
+
+            # the dispatcher only needs to wake up if its next deadline changed
+            if self._heap[0] is pending_reminder:
+                self._condition.notify()
+
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Removing scheduled reminder for schedule id {schedule_id}")
+
+        with self._condition:
+            if not self._cancel(schedule_id=schedule_id):
+                raise KeyError(schedule_id)
+
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        with self._condition:
+            return schedule_id in self._pending_by_schedule_id
+
+    def _cancel(self, schedule_id: str) -> bool:
+        pending_reminder = self._pending_by_schedule_id.pop(schedule_id, None)
+
+        if pending_reminder is None:
+            return False
+
+        pending_reminder.cancelled = True
+        self._cancelled_count += 1
+        self._compact_if_necessary()
+
+        return True
+
+    def _compact_if_necessary(self) -> None:
+        if self._cancelled_count < MIN_CANCELLED_ENTRIES_FOR_COMPACTION or self._cancelled_count * 2 < len(self._heap):
+            return
+
+        self._heap = [p for p in self._heap if not p.cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled_count = 0
+
+    def _start_dispatcher_if_necessary(self) -> None:
+        if self._dispatcher is not None:
+            return
+
+        self._dispatcher = threading.Thread(target=self._dispatch_forever, name="reminder-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def _wait_for_due_reminder(self) -> _PendingReminder:
+        with self._condition:
+            while True:
+                while len(self._heap) > 0 and self._heap[0].cancelled:
+                    heapq.heappop(self._heap)
+                    self._cancelled_count -= 1
+
+                if len(self._heap) == 0:
+                    self._condition.wait()
+                    continue
+
+                seconds_until_due = self._heap[0].deadline - time.monotonic()
+                if seconds_until_due > 0:
+                    self._condition.wait(timeout=seconds_until_due)
+                    continue
+
+                due_reminder = heapq.heappop(self._heap)
+                self._pending_by_schedule_id.pop(due_reminder.reminder.schedule_id)
+
+                return due_reminder
+
+    def _dispatch_forever(self) -> None:
+        while True:
+            due_reminder = self._wait_for_due_reminder()
+
+            try:
+                self._reminder_due(reminder=due_reminder.reminder, reminder_sender=due_reminder.reminder_sender)
+            except Exception:
+                logger.exception(f"Failed to execute reminder {due_reminder.reminder.display_name}")
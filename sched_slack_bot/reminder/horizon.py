@@ -0,0 +1,50 @@
+import datetime
+import logging
+import threading
+from typing import Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+# only reminders due within the horizon are armed, a background thread periodically arms the next window.
+# refilling more often than the horizon is long makes sure no reminder becomes due before it was armed.
+class ReminderHorizon:
+    def __init__(self, horizon: datetime.timedelta, refill_interval: Optional[datetime.timedelta] = None) -> None:
+        refill_interval = horizon / 2 if refill_interval is None else refill_interval
+
+        if refill_interval.total_seconds() <= 0 or refill_interval >= horizon:
+            raise ValueError(f"The refill interval {refill_interval} has to be positive and shorter than the {horizon=}")
+
+        self._horizon = horizon
+        self._refill_interval = refill_interval
+        self._stopped = threading.Event()
+        self._refill_thread: Optional[threading.Thread] = None
+
+    @property
+    def due_before(self) -> datetime.datetime:
+        return datetime.datetime.now() + self._horizon
+
+    def contains(self, date: datetime.datetime) -> bool:
+        return date < self.due_before
+
+    def start(self, refill: Callable[[datetime.datetime], None]) -> None:
+        if self._refill_thread is not None:
+            raise RuntimeError("The reminder horizon was already started")
+
+        self._refill_thread = threading.Thread(
+            target=self._refill_periodically, args=(refill,), name="reminder-horizon-refill", daemon=True
+        )
+        self._refill_thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _refill_periodically(self, refill: Callable[[datetime.datetime], None]) -> None:
+        while not self._stopped.wait(timeout=self._refill_interval.total_seconds()):
+            due_before = self.due_before
+            logger.info(f"Arming reminders due before {due_before}")
+
+            try:
+                refill(due_before)
+            except Exception:
+                logger.exception(f"Failed to arm reminders due before {due_before}")
@@ -1,21 +1,92 @@
+import abc
 import datetime
+import functools
 import logging
 import threading
 from typing import Dict, cast, List, Optional, Callable
 
 from sched_slack_bot.model.reminder import Reminder
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
 from sched_slack_bot.reminder.sender import ReminderSender
 
 logger = logging.getLogger(__name__)
 
 
-class ReminderScheduler:
-    def __init__(self, reminder_executed_callback: Optional[Callable[[Schedule], None]] = None) -> None:
+def get_seconds_until_next_rotation(schedule: Schedule) -> float:
+    now = datetime.datetime.now()
+    if schedule.next_rotation < now:
+        raise ValueError("The provided schedule was scheduled in the past!")
+
+    return (schedule.next_rotation - now).total_seconds()
+
+
+class BaseReminderScheduler(abc.ABC):
+    def __init__(
+        self,
+        reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+        reminder_executor: Optional[ReminderExecutor] = None,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        self._reminder_executed_callback: Optional[Callable[[Schedule], None]] = reminder_executed_callback
+        self._reminder_executor = reminder_executor
+        self._reminder_horizon = reminder_horizon
+
+    @abc.abstractmethod
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        raise NotImplementedError("Not Implemented")
+
+    def schedule_all_reminders(self, schedules: List[Schedule], reminder_sender: ReminderSender) -> None:
+        for schedule in schedules:
+            self.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    def _reminder_due(self, reminder: Reminder, reminder_sender: ReminderSender) -> None:
+        if self._reminder_executor is None:
+            self.execute_reminder(reminder=reminder, reminder_sender=reminder_sender)
+            return
+
+        self._reminder_executor.submit(
+            functools.partial(self.execute_reminder, reminder=reminder, reminder_sender=reminder_sender)
+        )
+
+    def execute_reminder(self, reminder: Reminder, reminder_sender: ReminderSender) -> None:
+        logger.info(f"Executing reminder {reminder.display_name}")
+
+        reminder_sender.send_reminder(reminder=reminder)
+
+        next_schedule = reminder.next_schedule
+        # rotations beyond the horizon are armed by one of its next refills
+        if self._reminder_horizon is None or self._reminder_horizon.contains(date=next_schedule.next_rotation):
+            self.schedule_reminder(schedule=next_schedule, reminder_sender=reminder_sender)
+
+        if self._reminder_executed_callback is not None:
+            self._reminder_executed_callback(next_schedule)
+
+
+class ReminderScheduler(BaseReminderScheduler):
+    def __init__(
+        self,
+        reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+        reminder_executor: Optional[ReminderExecutor] = None,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        super().__init__(
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+            reminder_horizon=reminder_horizon,
+        )
         self._scheduled_jobs: Dict[int, threading.Timer] = dict()
         self._timer_by_schedule_id: Dict[str, threading.Timer] = dict()
         self._scheduled_jobs_lock = threading.RLock()
-        self._reminder_executed_callback: Optional[Callable[[Schedule], None]] = reminder_executed_callback
 
     def _get_thread_ident_for_schedule(self, schedule_id: str) -> int:
         with self._scheduled_jobs_lock:
@@ -28,9 +99,9 @@ class ReminderScheduler:
 
         self._remove_timer(thread_ident=ident_to_remove, schedule_id=schedule_id, cancel=True)
 
-    def schedule_all_reminders(self, schedules: List[Schedule], reminder_sender: ReminderSender) -> None:
-        for schedule in schedules:
-            self.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        with self._scheduled_jobs_lock:
+            return schedule_id in self._timer_by_schedule_id
 
     def _add_timer(self, timer: threading.Timer, schedule_id: str) -> None:
         timer.start()
@@ -49,30 +120,18 @@ class ReminderScheduler:
                 self._timer_by_schedule_id.pop(schedule_id)
 
     def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
-        now = datetime.datetime.now()
-        if schedule.next_rotation < now:
-            raise ValueError("The provided schedule was scheduled in the past!")
-
-        interval = (schedule.next_rotation - now).total_seconds()
+        interval = get_seconds_until_next_rotation(schedule=schedule)
         reminder = Reminder(schedule=schedule)
         logger.info(f"Scheduling Reminder at {interval}s from now")
         timer = threading.Timer(
-            interval=interval, function=self.execute_reminder, kwargs={"reminder": reminder, "reminder_sender": reminder_sender}
+            interval=interval, function=self._timer_fired, kwargs={"reminder": reminder, "reminder_sender": reminder_sender}
         )
         timer.daemon = True
         self._add_timer(timer=timer, schedule_id=schedule.id)
 
-    def execute_reminder(self, reminder: Reminder, reminder_sender: ReminderSender) -> None:
-        logger.info(f"Executing reminder {reminder.display_name}")
-
+    def _timer_fired(self, reminder: Reminder, reminder_sender: ReminderSender) -> None:
         current_thread = threading.current_thread()
         thread_ident = cast(int, current_thread.ident)
 
-        reminder_sender.send_reminder(reminder=reminder)
         self._remove_timer(thread_ident=thread_ident, schedule_id=reminder.schedule_id)
-
-        next_schedule = reminder.next_schedule
-        self.schedule_reminder(schedule=next_schedule, reminder_sender=reminder_sender)
-
-        if self._reminder_executed_callback is not None:
-            self._reminder_executed_callback(next_schedule)
+        self._reminder_due(reminder=reminder, reminder_sender=reminder_sender)
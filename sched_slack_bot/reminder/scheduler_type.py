@@ -0,0 +1,62 @@
+from enum import StrEnum
+from typing import Optional, Callable
+
+from sched_slack_bot.data.reminder_job_access import ReminderJobAccess
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.distributed_scheduler import DistributedReminderScheduler
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.heap_scheduler import HeapReminderScheduler
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler, ReminderScheduler
+from sched_slack_bot.reminder.timing_wheel_scheduler import TimingWheelReminderScheduler
+
+
+class ReminderSchedulerType(StrEnum):
+    TIMER = "timer"
+    HEAP = "heap"
+    TIMING_WHEEL = "timing_wheel"
+    # reminder jobs are shared by all replicas, see DistributedReminderScheduler
+    DISTRIBUTED = "distributed"
+    # runs on the event loop of the web server, see AsyncReminderScheduler
+    ASYNCIO = "asyncio"
+
+
+def get_reminder_scheduler(
+    scheduler_type: ReminderSchedulerType,
+    reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+    reminder_executor: Optional[ReminderExecutor] = None,
+    reminder_job_access: Optional[ReminderJobAccess] = None,
+    reminder_horizon: Optional[ReminderHorizon] = None,
+) -> BaseReminderScheduler:
+    if scheduler_type == ReminderSchedulerType.ASYNCIO:
+        raise ValueError("The asyncio reminder scheduler has to be created on a running event loop")
+
+    if scheduler_type == ReminderSchedulerType.DISTRIBUTED:
+        if reminder_job_access is None:
+            raise ValueError("The distributed reminder scheduler requires a reminder job access")
+
+        return DistributedReminderScheduler(
+            reminder_job_access=reminder_job_access,
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+        )
+
+    if scheduler_type == ReminderSchedulerType.HEAP:
+        return HeapReminderScheduler(
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+            reminder_horizon=reminder_horizon,
+        )
+
+    if scheduler_type == ReminderSchedulerType.TIMING_WHEEL:
+        return TimingWheelReminderScheduler(
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+            reminder_horizon=reminder_horizon,
+        )
+
+    return ReminderScheduler(
+        reminder_executed_callback=reminder_executed_callback,
+        reminder_executor=reminder_executor,
+        reminder_horizon=reminder_horizon,
+    )
@@ -11,3 +11,13 @@ class ReminderSender(abc.ABC):
     @abc.abstractmethod
     def send_skip_message(self, reminder: Reminder) -> None:
         raise NotImplementedError("Not Implemented")
+
+
+class AsyncReminderSender(abc.ABC):
+    @abc.abstractmethod
+    async def send_reminder(self, reminder: Reminder) -> None:
+        raise NotImplementedError("Not Implemented")
+
+    @abc.abstractmethod
+    async def send_skip_message(self, reminder: Reminder) -> None:
+        raise NotImplementedError("Not Implemented")
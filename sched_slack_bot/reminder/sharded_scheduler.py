@@ -0,0 +1,268 @@
+import dataclasses
+import datetime
+import logging
+import socket
+import threading
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from sched_slack_bot.data.replica_membership_access import ReplicaMembershipAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.hash_ring import ConsistentHashRing
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler
+from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEARTBEAT_INTERVAL = datetime.timedelta(seconds=10)
+# a replica missing a few heartbeats in a row is considered gone and its schedules are taken over
+DEFAULT_HEARTBEAT_TIMEOUT = datetime.timedelta(seconds=35)
+
+
+def _get_default_replica_id() -> str:
+    return f"{socket.gethostname()}-{uuid.uuid4()}"
+
+
+def _get_arming(schedule: Schedule) -> Tuple[int, datetime.datetime]:
+    # edits and executed reminders always change the version
+    return schedule.version, schedule.next_rotation
+
+
+# every replica only arms reminders for the schedules it owns on a consistent hash ring of all live replicas.
+# the arming itself is done by the wrapped scheduler, this only decides which schedules are handed to it.
+# schedules created, edited or deleted on another replica are picked up from the storage with every heartbeat.
+class ShardedReminderScheduler(BaseReminderScheduler):
+    def __init__(
+        self,
+        reminder_scheduler: BaseReminderScheduler,
+        replica_membership_access: ReplicaMembershipAccess,
+        schedule_access: ScheduleAccess,
+        replica_id: Optional[str] = None,
+        heartbeat_interval: datetime.timedelta = DEFAULT_HEARTBEAT_INTERVAL,
+        heartbeat_timeout: datetime.timedelta = DEFAULT_HEARTBEAT_TIMEOUT,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        # executed reminders are reported by the wrapped scheduler
+        super().__init__(reminder_horizon=reminder_horizon)
+        self._reminder_scheduler = reminder_scheduler
+        self._replica_membership_access = replica_membership_access
+        self._schedule_access = schedule_access
+        self._replica_id = _get_default_replica_id() if replica_id is None else replica_id
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_timeout = heartbeat_timeout
+        self._ring: Optional[ConsistentHashRing] = None
+        # the schedules last handed to the wrapped scheduler, it re-arms their next rotations on its own
+        self._armed_schedules: Dict[str, Schedule] = dict()
+        # overdue reminders of replicas that left, kept until they were sent
+        self._overdue_schedule_ids: Set[str] = set()
+        self._reminder_sender: Optional[ReminderSender] = None
+        self._lock = threading.RLock()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def replica_id(self) -> str:
+        return self._replica_id
+
+    @property
+    def ring(self) -> ConsistentHashRing:
+        with self._lock:
+            if self._ring is None:
+                self._refresh_membership()
+
+            # the membership was refreshed above
+            return self._ring  # type: ignore
+
+    def owns_schedule(self, schedule_id: str) -> bool:
+        return self.ring.get_owner(key=schedule_id) == self._replica_id
+
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        with self._lock:
+            self._reminder_sender = reminder_sender
+
+            if not self.owns_schedule(schedule_id=schedule.id):
+                logger.info(f"Not scheduling reminder for schedule {schedule.id} owned by another replica")
+                return
+
+            self._reminder_scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+            self._armed_schedules[schedule.id] = schedule
+
+    def schedule_all_reminders(self, schedules: List[Schedule], reminder_sender: ReminderSender) -> None:
+        with self._lock:
+            self._reminder_sender = reminder_sender
+            # joins the ring before arming, otherwise a starting replica would consider itself the owner of everything
+            if self._ring is None:
+                self._refresh_membership()
+            super().schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+        self._start_heartbeat_if_necessary()
+
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        with self._lock:
+            if schedule_id not in self._armed_schedules:
+                return
+
+            self._remove_armed_reminder(schedule_id=schedule_id)
+
+    def _remove_armed_reminder(self, schedule_id: str) -> None:
+        # reminders executed beyond the horizon are not re-armed, the wrapped scheduler does not hold them anymore
+        if self._reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule_id):
+            self._reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule_id)
+
+        self._armed_schedules.pop(schedule_id, None)
+
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        return self._reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule_id)
+
+    def stop(self) -> None:
+        # the reminders of this replica are taken over as soon as it left, so it must not send any of them afterwards
+        with self._lock:
+            self._stopped.set()
+
+            for schedule_id in list(self._armed_schedules):
+                try:
+                    self._remove_armed_reminder(schedule_id=schedule_id)
+                except Exception:
+                    logger.exception(f"Failed to remove reminder for schedule {schedule_id}")
+
+        logger.info(f"Replica {self._replica_id} leaves the ring")
+        self._replica_membership_access.remove_replica(replica_id=self._replica_id)
+
+    def _refresh_membership(self) -> None:
+        now = datetime.datetime.now()
+        self._replica_membership_access.heartbeat(replica_id=self._replica_id, now=now)
+        # this replica is always part of the ring, even if its own heartbeat could not be read back yet
+        live_replicas = set(self._replica_membership_access.get_live_replicas(alive_after=now - self._heartbeat_timeout))
+        live_replicas.add(self._replica_id)
+
+        if self._ring is not None and self._ring.members == live_replicas:
+            return
+
+        logger.info(f"Replicas changed to {sorted(live_replicas)}")
+        self._ring = ConsistentHashRing(members=live_replicas)
+
+    def _get_stored_schedules(self) -> List[Schedule]:
+        if self._reminder_horizon is None:
+            return self._schedule_access.get_available_schedules()
+
+        return self._schedule_access.get_schedules_due_before(before=self._reminder_horizon.due_before)
+
+    def rebalance(self) -> None:
+        with self._lock:
+            if self._stopped.is_set() or self._reminder_sender is None:
+                return
+
+            previous_ring = self._ring
+            self._refresh_membership()
+            left_replicas = set() if previous_ring is None else set(previous_ring.members - self.ring.members)
+            reminder_sender = self._reminder_sender
+
+            now = datetime.datetime.now()
+            owned_schedules = {s.id: s for s in self._get_stored_schedules() if self.owns_schedule(schedule_id=s.id)}
+            self._overdue_schedule_ids &= owned_schedules.keys()
+
+            # handed over to another replica, deleted or moved beyond the horizon
+            for schedule_id in [i for i in self._armed_schedules if i not in owned_schedules]:
+                logger.info(f"Removing reminder for schedule {schedule_id} owned by {self.ring.get_owner(key=schedule_id)}")
+                try:
+                    self._remove_armed_reminder(schedule_id=schedule_id)
+                except Exception:
+                    logger.exception(f"Failed to remove reminder for schedule {schedule_id}")
+
+            overdue_schedules = []
+            for schedule in owned_schedules.values():
+                if schedule.next_rotation <= now:
+                    if self._should_take_over(
+                        schedule=schedule, now=now, previous_ring=previous_ring, left_replicas=left_replicas
+                    ):
+                        overdue_schedules.append(schedule)
+                    continue
+
+                try:
+                    self._reconcile_reminder(schedule=schedule, reminder_sender=reminder_sender)
+                except Exception:
+                    logger.exception(f"Failed to take over reminder for schedule {schedule.id}")
+
+        # overdue reminders are sent without holding the lock, slack may be slow to respond
+        for schedule in overdue_schedules:
+            self._take_over_overdue_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    def _should_take_over(
+        self,
+        schedule: Schedule,
+        now: datetime.datetime,
+        previous_ring: Optional[ConsistentHashRing],
+        left_replicas: Set[str],
+    ) -> bool:
+        # reminders armed by this replica are executing right now
+        if schedule.id in self._armed_schedules or self._reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule.id):
+            return False
+
+        if schedule.id in self._overdue_schedule_ids:
+            return True
+
+        if previous_ring is not None and previous_ring.get_owner(key=schedule.id) in left_replicas:
+            self._overdue_schedule_ids.add(schedule.id)
+            return True
+
+        # a live previous owner sends it unless it noticed the handover before, which it does within a heartbeat timeout
+        return schedule.next_rotation <= now - self._heartbeat_timeout
+
+    def _reconcile_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        armed_schedule = self._armed_schedules.get(schedule.id)
+
+        if self._reminder_scheduler.has_reminder_for_schedule(schedule_id=schedule.id):
+            # the wrapped scheduler re-arms the next rotation of an executed reminder itself
+            if armed_schedule is not None and _get_arming(schedule=schedule) in (
+                _get_arming(schedule=armed_schedule),
+                _get_arming(schedule=armed_schedule.next_schedule),
+            ):
+                self._armed_schedules[schedule.id] = schedule
+                return
+
+            # edited on another replica
+            logger.info(f"Re-arming reminder for changed schedule {schedule.id}")
+            self._reminder_scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+
+        self.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    def _take_over_overdue_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        # the previous owner left before sending this reminder, only the last missed rotation is sent
+        fixed_schedule = fix_schedule_from_the_past(schedule=schedule)
+        missed_schedule = dataclasses.replace(
+            fixed_schedule, next_rotation=fixed_schedule.next_rotation - schedule.time_between_rotations
+        )
+        logger.info(f"Taking over overdue reminder for schedule {schedule.id} due at {missed_schedule.next_rotation}")
+
+        try:
+            self._reminder_scheduler.execute_reminder(
+                reminder=Reminder(schedule=missed_schedule), reminder_sender=reminder_sender
+            )
+        except Exception:
+            logger.exception(f"Failed to take over overdue reminder for schedule {schedule.id}")
+            with self._lock:
+                self._overdue_schedule_ids.add(schedule.id)
+            return
+
+        with self._lock:
+            self._overdue_schedule_ids.discard(schedule.id)
+            self._armed_schedules[schedule.id] = missed_schedule
+
+    def _start_heartbeat_if_necessary(self) -> None:
+        with self._lock:
+            if self._heartbeat_thread is not None:
+                return
+
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_forever, name="replica-heartbeat", daemon=True)
+            self._heartbeat_thread.start()
+
+    def _heartbeat_forever(self) -> None:
+        while not self._stopped.wait(timeout=self._heartbeat_interval.total_seconds()):
+            try:
+                self.rebalance()
+            except Exception:
+                logger.exception("Failed to rebalance the reminders between replicas")
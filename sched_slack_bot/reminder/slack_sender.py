@@ -1,7 +1,8 @@
 from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 
 from sched_slack_bot.model.reminder import Reminder
-from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.reminder.sender import ReminderSender, AsyncReminderSender
 from sched_slack_bot.views.reminder_blocks import get_reminder_blocks, get_reminder_text, get_skip_text, get_skip_blocks
 
 
@@ -24,3 +25,24 @@ class SlackReminderSender(ReminderSender):
             text=get_skip_text(reminder=reminder),
             blocks=get_skip_blocks(reminder=reminder),
         )
+
+
+class AsyncSlackReminderSender(AsyncReminderSender):
+    def __init__(self, client: AsyncWebClient):
+        self._client = client
+
+    async def send_reminder(self, reminder: Reminder) -> None:
+        await self._client.chat_postMessage(
+            channel=reminder.channel_id_to_notify_in,
+            # used for screen readers, if blocks can't be rendered
+            text=get_reminder_text(reminder=reminder),
+            blocks=get_reminder_blocks(reminder=reminder),
+        )
+
+    async def send_skip_message(self, reminder: Reminder) -> None:
+        await self._client.chat_postMessage(
+            channel=reminder.channel_id_to_notify_in,
+            # used for screen readers, if blocks can't be rendered
+            text=get_skip_text(reminder=reminder),
+            blocks=get_skip_blocks(reminder=reminder),
+        )
@@ -0,0 +1,203 @@
+import dataclasses
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Callable
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler, get_seconds_until_next_rotation
+from sched_slack_bot.reminder.sender import ReminderSender
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_MINUTE = 60
+MINUTES_PER_HOUR = 60
+HOURS_PER_DAY = 24
+MINUTES_PER_DAY = MINUTES_PER_HOUR * HOURS_PER_DAY
+DAYS_IN_DAY_WHEEL = 366
+
+
+@dataclasses.dataclass
+class _WheelEntry:
+    deadline: float
+    reminder: Reminder
+    reminder_sender: ReminderSender
+    # the slot this entry currently lives in, so it can be cancelled without searching the wheels
+    slot: Dict[str, "_WheelEntry"] = dataclasses.field(repr=False)
+
+    @property
+    def minute(self) -> int:
+        return int(self.deadline // SECONDS_PER_MINUTE)
+
+
+Slot = Dict[str, _WheelEntry]
+
+
+# reminders are sorted into minute, hour and day wheels by how far away they are; slots of the coarser wheels
+# are only cascaded into the finer ones once the wheel actually reaches them. arming and cancelling are O(1).
+class TimingWheelReminderScheduler(BaseReminderScheduler):
+    def __init__(
+        self,
+        reminder_executed_callback: Optional[Callable[[Schedule], None]] = None,
+        reminder_executor: Optional[ReminderExecutor] = None,
+        reminder_horizon: Optional[ReminderHorizon] = None,
+    ) -> None:
+        super().__init__(
+            reminder_executed_callback=reminder_executed_callback,
+            reminder_executor=reminder_executor,
+            reminder_horizon=reminder_horizon,
+        )
+        self._minute_wheel: List[Slot] = [dict() for _ in range(MINUTES_PER_HOUR)]
+        self._hour_wheel: List[Slot] = [dict() for _ in range(HOURS_PER_DAY)]
+        self._day_wheel: List[Slot] = [dict() for _ in range(DAYS_IN_DAY_WHEEL)]
+        # reminders further away than the day wheel reaches, re-checked every time the day wheel wraps around
+        self._overflow: Slot = dict()
+        self._entry_by_schedule_id: Dict[str, _WheelEntry] = dict()
+        self._current_minute = int(time.monotonic() // SECONDS_PER_MINUTE)
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    @property
+    def pending_reminder_count(self) -> int:
+        with self._condition:
+            return len(self._entry_by_schedule_id)
+
+    def schedule_reminder(self, schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        interval = get_seconds_until_next_rotation(schedule=schedule)
+        logger.info(f"Scheduling Reminder at {interval}s from now")
+
+        with self._condition:
+            # a schedule only ever has one pending reminder, re-scheduling replaces it
+            self._cancel(schedule_id=schedule.id)
+
+            entry = _WheelEntry(
+                deadline=time.monotonic() + interval,
+                reminder=Reminder(schedule=schedule),
+                reminder_sender=reminder_sender,
+                slot=self._overflow,
+            )
+            self._entry_by_schedule_id[schedule.id] = entry
+            self._place(entry=entry)
+            self._start_dispatcher_if_necessary()
+
+            if entry.minute <= self._current_minute:
+                self._condition.notify()
+
+    def remove_reminder_for_schedule(self, schedule_id: str) -> None:
+        logger.info(f"Removing scheduled reminder for schedule id {schedule_id}")
+
+        with self._condition:
+            if not self._cancel(schedule_id=schedule_id):
+                raise KeyError(schedule_id)
+
+    def has_reminder_for_schedule(self, schedule_id: str) -> bool:
+        with self._condition:
+            return schedule_id in self._entry_by_schedule_id
+
+    def _cancel(self, schedule_id: str) -> bool:
+        entry = self._entry_by_schedule_id.pop(schedule_id, None)
+
+        if entry is None:
+            return False
+
+        entry.slot.pop(schedule_id, None)
+
+        return True
+
+    def _get_slot(self, minute: int) -> Slot:
+        minutes_until_due = minute - self._current_minute
+
+        if minutes_until_due < MINUTES_PER_HOUR:
+            return self._minute_wheel[minute % MINUTES_PER_HOUR]
+
+        if minutes_until_due < MINUTES_PER_DAY:
+            return self._hour_wheel[(minute // MINUTES_PER_HOUR) % HOURS_PER_DAY]
+
+        if minutes_until_due < MINUTES_PER_DAY * DAYS_IN_DAY_WHEEL:
+            return self._day_wheel[(minute // MINUTES_PER_DAY) % DAYS_IN_DAY_WHEEL]
+
+        return self._overflow
+
+    def _place(self, entry: _WheelEntry) -> None:
+        entry.slot = self._get_slot(minute=entry.minute)
+        entry.slot[entry.reminder.schedule_id] = entry
+
+    def _re_place_all(self, slot: Slot) -> None:
+        entries = list(slot.values())
+        slot.clear()
+
+        for entry in entries:
+            self._place(entry=entry)
+
+    def _cascade(self) -> None:
+        minute = self._current_minute
+
+        if minute % MINUTES_PER_DAY == 0:
+            day = minute // MINUTES_PER_DAY
+            if day % DAYS_IN_DAY_WHEEL == 0:
+                self._re_place_all(slot=self._overflow)
+            self._re_place_all(slot=self._day_wheel[day % DAYS_IN_DAY_WHEEL])
+
+        if minute % MINUTES_PER_HOUR == 0:
+            self._re_place_all(slot=self._hour_wheel[(minute // MINUTES_PER_HOUR) % HOURS_PER_DAY])
+
+    def _pop_entries(self, slot: Slot, now: float) -> List[_WheelEntry]:
+        due_entries = [e for e in slot.values() if e.deadline <= now]
+
+        for entry in due_entries:
+            slot.pop(entry.reminder.schedule_id)
+            self._entry_by_schedule_id.pop(entry.reminder.schedule_id)
+
+        return due_entries
+
+    def _advance(self, now: float) -> List[_WheelEntry]:
+        due_entries: List[_WheelEntry] = []
+        now_minute = int(now // SECONDS_PER_MINUTE)
+
+        while self._current_minute < now_minute:
+            # every reminder in the slot of a passed minute is due
+            due_entries.extend(self._pop_entries(slot=self._minute_wheel[self._current_minute % MINUTES_PER_HOUR], now=now))
+            self._current_minute += 1
+            self._cascade()
+
+        due_entries.extend(self._pop_entries(slot=self._minute_wheel[self._current_minute % MINUTES_PER_HOUR], now=now))
+
+        return sorted(due_entries, key=lambda e: e.deadline)
+
+    def _get_seconds_until_next_wakeup(self, now: float) -> float:
+        current_slot = self._minute_wheel[self._current_minute % MINUTES_PER_HOUR]
+        next_wakeup = float((self._current_minute + 1) * SECONDS_PER_MINUTE)
+
+        if len(current_slot) > 0:
+            next_wakeup = min(next_wakeup, min(e.deadline for e in current_slot.values()))
+
+        return max(next_wakeup - now, 0)
+
+    def _start_dispatcher_if_necessary(self) -> None:
+        if self._dispatcher is not None:
+            return
+
+        self._dispatcher = threading.Thread(target=self._dispatch_forever, name="reminder-timing-wheel", daemon=True)
+        self._dispatcher.start()
+
+    def _wait_for_due_reminders(self) -> List[_WheelEntry]:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                due_entries = self._advance(now=now)
+
+                if len(due_entries) > 0:
+                    return due_entries
+
+                self._condition.wait(timeout=self._get_seconds_until_next_wakeup(now=now))
+
+    def _dispatch_forever(self) -> None:
+        while True:
+            for due_entry in self._wait_for_due_reminders():
+                try:
+                    self._reminder_due(reminder=due_entry.reminder, reminder_sender=due_entry.reminder_sender)
+                except Exception:
+                    logger.exception(f"Failed to execute reminder {due_entry.reminder.display_name}")
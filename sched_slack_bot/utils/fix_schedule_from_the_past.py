@@ -1,31 +1,46 @@
+import dataclasses
 import datetime
 import logging
+from typing import List
 
 from sched_slack_bot.model.schedule import Schedule
 
 logger = logging.getLogger(__name__)
 
 
-def fix_schedule_from_the_past(schedule: Schedule) -> Schedule:
-    now = datetime.datetime.now()
-    next_rotation = schedule.next_rotation
-    logger.info(f"Starting to fix schedule with previous date {schedule.next_rotation}")
+def _get_missed_rotations(schedule: Schedule, now: datetime.datetime) -> int:
+    if now < schedule.next_rotation:
+        return 0
+
+    # timedelta floor division is exact, so this is the number of steps the rotation has to be moved past now
+    return (now - schedule.next_rotation) // schedule.time_between_rotations + 1
+
 
-    while now >= next_rotation:
-        next_rotation += schedule.time_between_rotations
+def _fix_schedule(schedule: Schedule, now: datetime.datetime, advance_index: bool) -> Schedule:
+    missed_rotations = _get_missed_rotations(schedule=schedule, now=now)
+
+    if missed_rotations == 0:
+        return schedule
+
+    next_rotation = schedule.next_rotation + missed_rotations * schedule.time_between_rotations
+    current_index = schedule.current_index
+    if advance_index:
+        current_index = (current_index + missed_rotations) % len(schedule.members)
 
     logger.info(
         f"Had to fix schedule with previous date {schedule.next_rotation}, which"
-        f" was before now {now}, fixed to {next_rotation}"
+        f" was before now {now}, fixed to {next_rotation} after {missed_rotations} missed rotations"
     )
 
-    return Schedule(
-        id=schedule.id,
-        display_name=schedule.display_name,
-        members=schedule.members,
-        next_rotation=next_rotation,
-        time_between_rotations=schedule.time_between_rotations,
-        channel_id_to_notify_in=schedule.channel_id_to_notify_in,
-        created_by=schedule.created_by,
-        current_index=schedule.current_index,
-    )
+    return dataclasses.replace(schedule, next_rotation=next_rotation, current_index=current_index)
+
+
+def fix_schedule_from_the_past(schedule: Schedule, advance_index: bool = False) -> Schedule:
+    return _fix_schedule(schedule=schedule, now=datetime.datetime.now(), advance_index=advance_index)
+
+
+def fix_schedules_from_the_past(schedules: List[Schedule], advance_index: bool = False) -> List[Schedule]:
+    # all schedules are fixed against the same point in time
+    now = datetime.datetime.now()
+
+    return [_fix_schedule(schedule=s, now=now, advance_index=advance_index) for s in schedules]
@@ -0,0 +1,131 @@
+import datetime
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sched_slack_bot.model.schedule import Schedule
+
+
+@dataclass(frozen=True, slots=True)
+class Rotation:
+    schedule_id: str
+    member: str
+    start: datetime.datetime
+    end: datetime.datetime
+
+
+def _get_rotation_number(schedule: Schedule, at: datetime.datetime) -> int:
+    # rotation 0 starts at the next rotation, earlier rotations have negative numbers
+    return (at - schedule.next_rotation) // schedule.time_between_rotations
+
+
+def _get_rotation(schedule: Schedule, rotation_number: int) -> Rotation:
+    start = schedule.next_rotation + rotation_number * schedule.time_between_rotations
+
+    return Rotation(
+        schedule_id=schedule.id,
+        member=schedule.members[(schedule.current_index + rotation_number) % len(schedule.members)],
+        start=start,
+        end=start + schedule.time_between_rotations,
+    )
+
+
+def _get_rotations_of_member(
+    schedule: Schedule, member: str, start: datetime.datetime, end: datetime.datetime
+) -> Iterator[Rotation]:
+    first_rotation_number = _get_rotation_number(schedule=schedule, at=start)
+    last_rotation_number = _get_rotation_number(schedule=schedule, at=end - datetime.timedelta(microseconds=1))
+    member_count = len(schedule.members)
+
+    # the rotations of a member are every member_count-th rotation of each of its positions, starting at the first one
+    # at or after start. A member listed more than once has interleaving rotations, merging them keeps the order.
+    rotation_numbers_per_position = [
+        range(
+            first_rotation_number + (position - schedule.current_index - first_rotation_number) % member_count,
+            last_rotation_number + 1,
+            member_count,
+        )
+        for position, m in enumerate(schedule.members)
+        if m == member
+    ]
+
+    for rotation_number in heapq.merge(*rotation_numbers_per_position):
+        yield _get_rotation(schedule=schedule, rotation_number=rotation_number)
+
+
+# answers who is on duty when without replaying rotations, the rotation k steps after the next rotation
+# always belongs to members[(current_index + k) % len(members)].
+class RotationCalendar:
+    def __init__(self, schedules: Iterable[Schedule] = ()) -> None:
+        self._lock = threading.Lock()
+        self._schedules_by_id: Dict[str, Schedule] = dict()
+        self._schedule_ids_by_member: Dict[str, Set[str]] = dict()
+        # precomputed upcoming rotations of a schedule, only valid for the schedule (and its version) they were computed for
+        self._upcoming_rotations: Dict[str, Tuple[Schedule, List[Rotation]]] = dict()
+
+        for schedule in schedules:
+            self.update_schedule(schedule=schedule)
+
+    def update_schedule(self, schedule: Schedule) -> None:
+        with self._lock:
+            self._remove_schedule(schedule_id=schedule.id)
+
+            self._schedules_by_id[schedule.id] = schedule
+            for member in schedule.members:
+                self._schedule_ids_by_member.setdefault(member, set()).add(schedule.id)
+
+    def remove_schedule(self, schedule_id: str) -> None:
+        with self._lock:
+            self._remove_schedule(schedule_id=schedule_id)
+
+    def _remove_schedule(self, schedule_id: str) -> None:
+        schedule = self._schedules_by_id.pop(schedule_id, None)
+        self._upcoming_rotations.pop(schedule_id, None)
+        if schedule is None:
+            return
+
+        for member in schedule.members:
+            schedule_ids = self._schedule_ids_by_member.get(member, set())
+            schedule_ids.discard(schedule_id)
+            if len(schedule_ids) == 0:
+                self._schedule_ids_by_member.pop(member, None)
+
+    def get_member_on_duty(self, schedule_id: str, at: datetime.datetime) -> Optional[str]:
+        with self._lock:
+            schedule = self._schedules_by_id.get(schedule_id)
+
+        if schedule is None:
+            return None
+
+        return _get_rotation(schedule=schedule, rotation_number=_get_rotation_number(schedule=schedule, at=at)).member
+
+    def get_members_on_duty(self, at: datetime.datetime) -> Dict[str, str]:
+        with self._lock:
+            schedules = list(self._schedules_by_id.values())
+
+        return {
+            s.id: _get_rotation(schedule=s, rotation_number=_get_rotation_number(schedule=s, at=at)).member for s in schedules
+        }
+
+    def get_upcoming_rotations(self, schedule_id: str, count: int) -> List[Rotation]:
+        with self._lock:
+            schedule = self._schedules_by_id.get(schedule_id)
+            if schedule is None:
+                return []
+
+            cached_schedule, rotations = self._upcoming_rotations.get(schedule_id, (None, []))
+            if cached_schedule != schedule or len(rotations) < count:
+                rotations = [_get_rotation(schedule=schedule, rotation_number=k) for k in range(count)]
+                self._upcoming_rotations[schedule_id] = (schedule, rotations)
+
+            return rotations[:count]
+
+    def get_rotations_of_member(self, member: str, start: datetime.datetime, end: datetime.datetime) -> List[Rotation]:
+        with self._lock:
+            schedules = [self._schedules_by_id[i] for i in self._schedule_ids_by_member.get(member, set())]
+
+        # every schedule yields its rotations in order, merging them keeps the overall order by start and schedule
+        rotations_per_schedule = [_get_rotations_of_member(schedule=s, member=member, start=start, end=end) for s in schedules]
+
+        return list(heapq.merge(*rotations_per_schedule, key=lambda r: (r.start, r.schedule_id)))
@@ -24,11 +24,13 @@ class SlackView(TypedDict, total=False):
     state: SlackState
     id: str
     external_id: str
+    private_metadata: str
 
 
 class SlackAction(TypedDict, total=False):
     action_id: str
     block_id: str
+    value: str
 
 
 class SlackBody(TypedDict, total=False):
@@ -40,3 +42,4 @@ class SlackBody(TypedDict, total=False):
 
 class SlackEvent(TypedDict, total=False):
     user: str
+    view: SlackView
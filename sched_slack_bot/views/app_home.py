@@ -1,7 +1,8 @@
-import datetime
-from typing import List
+import json
+from typing import List, Optional
 
 from slack_sdk.models.blocks import (
+    Block,
     SectionBlock,
     TextObject,
     DividerBlock,
@@ -14,47 +15,144 @@ from slack_sdk.models.blocks import (
 from slack_sdk.models.views import View
 
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.views.datetime_selector import get_timezone_name
 from sched_slack_bot.views.schedule_blocks import get_blocks_for_schedules
 
 NO_SCHEDULES_BLOCK = SectionBlock(
     text=TextObject(type="mrkdwn", text="No Schedules configured yet :cry:, create one below to get started!")
 )
 
+APP_HOME_CALLBACK_ID = "home_view"
+
 CREATE_BUTTON_ACTION_ID = "SCHED_SLACK_BOT_CREATE"
 CREATE_BLOCK_ID = "SCHED_SLACK_BOT_CREATE_BLOCK"
 
+SHOW_MY_SCHEDULES_ACTION_ID = "SCHED_SLACK_BOT_SHOW_MY_SCHEDULES"
+SHOW_ALL_SCHEDULES_ACTION_ID = "SCHED_SLACK_BOT_SHOW_ALL_SCHEDULES"
+SCHEDULE_FILTER_BLOCK_ID = "SCHED_SLACK_BOT_SCHEDULE_FILTER_BLOCK"
+
+SORT_BY_NEXT_ROTATION_ACTION_ID = "SCHED_SLACK_BOT_SORT_BY_NEXT_ROTATION"
+SORT_BY_DISPLAY_NAME_ACTION_ID = "SCHED_SLACK_BOT_SORT_BY_DISPLAY_NAME"
+SCHEDULE_SORT_BLOCK_ID = "SCHED_SLACK_BOT_SCHEDULE_SORT_BLOCK"
+
+PREVIOUS_PAGE_ACTION_ID = "SCHED_SLACK_BOT_PREVIOUS_PAGE"
+NEXT_PAGE_ACTION_ID = "SCHED_SLACK_BOT_NEXT_PAGE"
+SCHEDULE_PAGE_BLOCK_ID = "SCHED_SLACK_BOT_SCHEDULE_PAGE_BLOCK"
+
+# views have at most 100 blocks, every schedule takes 5 and the rest of the app home at most 11
+SCHEDULES_PER_PAGE = 15
+
+
+def get_schedule_filter_block(show_all_schedules: bool) -> ActionsBlock:
+    # the currently shown filter is highlighted
+    return ActionsBlock(
+        elements=[
+            ButtonElement(
+                text=PlainTextObject(text="My schedules"),
+                action_id=SHOW_MY_SCHEDULES_ACTION_ID,
+                style=None if show_all_schedules else "primary",
+            ),
+            ButtonElement(
+                text=PlainTextObject(text="All schedules"),
+                action_id=SHOW_ALL_SCHEDULES_ACTION_ID,
+                style="primary" if show_all_schedules else None,
+            ),
+        ],
+        block_id=SCHEDULE_FILTER_BLOCK_ID,
+    )
+
 
-def get_app_home_view(schedules: List[Schedule]) -> View:
+def get_schedule_sort_block(sort_order: ScheduleSortOrder) -> ActionsBlock:
+    return ActionsBlock(
+        elements=[
+            ButtonElement(
+                text=PlainTextObject(text="Sort by next rotation"),
+                action_id=SORT_BY_NEXT_ROTATION_ACTION_ID,
+                style="primary" if sort_order == ScheduleSortOrder.NEXT_ROTATION else None,
+            ),
+            ButtonElement(
+                text=PlainTextObject(text="Sort by name"),
+                action_id=SORT_BY_DISPLAY_NAME_ACTION_ID,
+                style="primary" if sort_order == ScheduleSortOrder.DISPLAY_NAME else None,
+            ),
+        ],
+        block_id=SCHEDULE_SORT_BLOCK_ID,
+    )
+
+
+def get_schedule_page_block(
+    previous_page_cursor: Optional[SchedulePageCursor], next_page_cursor: Optional[SchedulePageCursor]
+) -> Optional[ActionsBlock]:
+    # the buttons carry the cursor of the page they lead to
+    elements = []
+    if previous_page_cursor is not None:
+        elements.append(
+            ButtonElement(
+                text=PlainTextObject(text="Previous"),
+                action_id=PREVIOUS_PAGE_ACTION_ID,
+                value=json.dumps(previous_page_cursor.as_json()),
+            )
+        )
+    if next_page_cursor is not None:
+        elements.append(
+            ButtonElement(
+                text=PlainTextObject(text="Next"), action_id=NEXT_PAGE_ACTION_ID, value=json.dumps(next_page_cursor.as_json())
+            )
+        )
+
+    return ActionsBlock(elements=elements, block_id=SCHEDULE_PAGE_BLOCK_ID) if len(elements) > 0 else None
+
+
+def get_app_home_header_blocks(timezone_name: Optional[str]) -> List[Block]:
+    return [
+        HeaderBlock(text=PlainTextObject(text="Welcome to the SchedSlack Bot :tada:")),
+        SectionBlock(text=MarkdownTextObject(text="Your *One-Stop-Shop* for setting up rotating :calendar: schedules.")),
+        SectionBlock(text=MarkdownTextObject(text=f":warning: This bot is running in timezone *{timezone_name}* :warning:")),
+        SectionBlock(
+            text=MarkdownTextObject(
+                text="Powered by <https://github.com/Germandrummer92/SchedSlackBot"
+                "|github.com/Germandrummer92/SchedSlackBot> with :heart:"
+            )
+        ),
+        SectionBlock(text=MarkdownTextObject(text="Icon courtesy of <https://www.freepik.com/vectors/banner" "|makyz>")),
+        DividerBlock(),
+    ]
+
+
+def get_app_home_footer_blocks() -> List[Block]:
+    return [
+        SectionBlock(text=MarkdownTextObject(text="Create a new Schedule")),
+        ActionsBlock(
+            elements=[ButtonElement(text=PlainTextObject(text="Create"), action_id=CREATE_BUTTON_ACTION_ID, style="primary")],
+            block_id=CREATE_BLOCK_ID,
+        ),
+    ]
+
+
+def get_app_home_view(
+    schedules: List[Schedule],
+    show_all_schedules: bool = False,
+    sort_order: ScheduleSortOrder = ScheduleSortOrder.NEXT_ROTATION,
+    previous_page_cursor: Optional[SchedulePageCursor] = None,
+    next_page_cursor: Optional[SchedulePageCursor] = None,
+    private_metadata: Optional[str] = None,
+) -> View:
     schedules_blocks = (
         [NO_SCHEDULES_BLOCK, DividerBlock()] if len(schedules) == 0 else get_blocks_for_schedules(schedules=schedules)
     )
+    page_block = get_schedule_page_block(previous_page_cursor=previous_page_cursor, next_page_cursor=next_page_cursor)
 
     return View(
         type="home",
-        callback_id="home_view",
+        callback_id=APP_HOME_CALLBACK_ID,
         blocks=[
-            HeaderBlock(text=PlainTextObject(text="Welcome to the SchedSlack Bot :tada:")),
-            SectionBlock(text=MarkdownTextObject(text="Your *One-Stop-Shop* for setting up rotating :calendar: schedules.")),
-            SectionBlock(
-                text=MarkdownTextObject(
-                    text=f":warning: This bot is running in timezone *{datetime.datetime.now().astimezone().tzname()}* :warning:"
-                )
-            ),
-            SectionBlock(
-                text=MarkdownTextObject(
-                    text="Powered by <https://github.com/Germandrummer92/SchedSlackBot"
-                    "|github.com/Germandrummer92/SchedSlackBot> with :heart:"
-                )
-            ),
-            SectionBlock(text=MarkdownTextObject(text="Icon courtesy of <https://www.freepik.com/vectors/banner" "|makyz>")),
-            DividerBlock(),
+            *get_app_home_header_blocks(timezone_name=get_timezone_name()),
+            get_schedule_filter_block(show_all_schedules=show_all_schedules),
+            get_schedule_sort_block(sort_order=sort_order),
             *schedules_blocks,
-            SectionBlock(text=MarkdownTextObject(text="Create a new Schedule")),
-            ActionsBlock(
-                elements=[
-                    ButtonElement(text=PlainTextObject(text="Create"), action_id=CREATE_BUTTON_ACTION_ID, style="primary")
-                ],
-                block_id=CREATE_BLOCK_ID,
-            ),
+            *([] if page_block is None else [page_block]),
+            *get_app_home_footer_blocks(),
         ],
+        private_metadata=private_metadata,
     )
@@ -0,0 +1,126 @@
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBLISH_WINDOW = datetime.timedelta(milliseconds=250)
+
+SerializedView = Dict[str, Any]
+
+
+@dataclasses.dataclass
+class AppHomePublisherMetrics:
+    requested: int = 0
+    published: int = 0
+    # requests that joined a publish of the same user already pending within the window
+    coalesced: int = 0
+    # rendered views equal to the last one published to the user
+    unchanged: int = 0
+    failed: int = 0
+
+
+def _get_view_hash(view: SerializedView) -> bytes:
+    return hashlib.blake2b(json.dumps(view, sort_keys=True).encode(), digest_size=16).digest()
+
+
+# collapses the publishes of a user's app home requested within a short window into one, the view is rendered once the
+# window is over, so it shows the latest state. Views equal to the last one published to the user are not sent again.
+# With a window of 0 every request is rendered and published immediately on the calling thread.
+# Publishes of the same user never run concurrently, a publish requested while one is running is done right after it.
+# The hashes of published views are only known to this process, a view published by another replica is not seen here.
+# With several replicas skip_unchanged_views has to be off, otherwise a view equal to the last one this process
+# published would be skipped even if the user got another one from another replica since.
+class AppHomePublisher:
+    def __init__(
+        self,
+        render_view: Callable[[str], SerializedView],
+        publish_view: Callable[[str, SerializedView], None],
+        window: datetime.timedelta = DEFAULT_PUBLISH_WINDOW,
+        skip_unchanged_views: bool = True,
+    ) -> None:
+        if window < datetime.timedelta(0):
+            raise ValueError(f"Invalid app home publish window {window=}")
+
+        self._render_view = render_view
+        self._publish_view = publish_view
+        self._window = window
+        self._skip_unchanged_views = skip_unchanged_views
+        self._lock = threading.Lock()
+        self._pending_user_ids: Set[str] = set()
+        self._publishing_user_ids: Set[str] = set()
+        self._republish_user_ids: Set[str] = set()
+        self._published_view_hashes: Dict[str, bytes] = dict()
+        self._metrics = AppHomePublisherMetrics()
+
+    @property
+    def metrics(self) -> AppHomePublisherMetrics:
+        with self._lock:
+            return dataclasses.replace(self._metrics)
+
+    def request_publish(self, user_id: str) -> None:
+        with self._lock:
+            self._metrics.requested += 1
+
+            if self._window > datetime.timedelta(0):
+                if user_id in self._pending_user_ids:
+                    self._metrics.coalesced += 1
+                    return
+
+                self._pending_user_ids.add(user_id)
+                timer = threading.Timer(interval=self._window.total_seconds(), function=self._publish, args=(user_id,))
+                timer.daemon = True
+                timer.start()
+                return
+
+        self._publish(user_id=user_id)
+
+    def _publish(self, user_id: str) -> None:
+        with self._lock:
+            # requests from now on need another publish, this one might render the state before them
+            self._pending_user_ids.discard(user_id)
+
+            # the running publish of the user publishes again once it is done
+            if user_id in self._publishing_user_ids:
+                if user_id in self._republish_user_ids:
+                    self._metrics.coalesced += 1
+                self._republish_user_ids.add(user_id)
+                return
+
+            self._publishing_user_ids.add(user_id)
+
+        while True:
+            self._render_and_publish(user_id=user_id)
+
+            with self._lock:
+                if user_id not in self._republish_user_ids:
+                    self._publishing_user_ids.discard(user_id)
+                    return
+
+                self._republish_user_ids.discard(user_id)
+
+    def _render_and_publish(self, user_id: str) -> None:
+        try:
+            view = self._render_view(user_id)
+            view_hash = _get_view_hash(view=view) if self._skip_unchanged_views else None
+
+            with self._lock:
+                if view_hash is not None and self._published_view_hashes.get(user_id) == view_hash:
+                    self._metrics.unchanged += 1
+                    return
+
+            self._publish_view(user_id, view)
+        except Exception:
+            logger.exception(f"Failed to publish the app home of {user_id=}")
+            with self._lock:
+                self._metrics.failed += 1
+            return
+
+        with self._lock:
+            if view_hash is not None:
+                self._published_view_hashes[user_id] = view_hash
+            self._metrics.published += 1
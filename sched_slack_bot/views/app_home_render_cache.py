@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from slack_sdk.models.blocks import DividerBlock
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.views.app_home import (
+    APP_HOME_CALLBACK_ID,
+    NO_SCHEDULES_BLOCK,
+    get_app_home_header_blocks,
+    get_app_home_footer_blocks,
+    get_schedule_filter_block,
+    get_schedule_sort_block,
+    get_schedule_page_block,
+)
+from sched_slack_bot.views.datetime_selector import get_timezone_name
+from sched_slack_bot.views.schedule_blocks import blocks_for_schedule
+
+DEFAULT_MAX_CACHED_SCHEDULES = 10_000
+
+SerializedBlocks = List[Dict[str, Any]]
+
+
+# renders the app home from the serialized blocks of every schedule, which are only rendered again once the schedule
+# changed. The result equals get_app_home_view(...).to_dict(), the fragments are shared and must not be modified.
+class AppHomeRenderCache:
+    def __init__(self, max_cached_schedules: int = DEFAULT_MAX_CACHED_SCHEDULES) -> None:
+        self._max_cached_schedules = max_cached_schedules
+        self._lock = threading.Lock()
+        # keyed by id, a cached fragment is only used for a schedule equal to the one it was rendered for
+        self._blocks_by_schedule_id: OrderedDict[str, Tuple[Schedule, SerializedBlocks]] = OrderedDict()
+        self._header_blocks: Optional[Tuple[Optional[str], SerializedBlocks]] = None
+        self._empty_schedules_blocks: SerializedBlocks = [NO_SCHEDULES_BLOCK.to_dict(), DividerBlock().to_dict()]
+        self._footer_blocks: SerializedBlocks = [b.to_dict() for b in get_app_home_footer_blocks()]
+        self._filter_blocks = {
+            show_all_schedules: get_schedule_filter_block(show_all_schedules=show_all_schedules).to_dict()
+            for show_all_schedules in (True, False)
+        }
+        self._sort_blocks = {s: get_schedule_sort_block(sort_order=s).to_dict() for s in ScheduleSortOrder}
+
+    def get_app_home_view(
+        self,
+        schedules: List[Schedule],
+        show_all_schedules: bool = False,
+        sort_order: ScheduleSortOrder = ScheduleSortOrder.NEXT_ROTATION,
+        previous_page_cursor: Optional[SchedulePageCursor] = None,
+        next_page_cursor: Optional[SchedulePageCursor] = None,
+        private_metadata: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        blocks = list(self._get_header_blocks())
+        blocks.append(self._filter_blocks[show_all_schedules])
+        blocks.append(self._sort_blocks[sort_order])
+
+        if len(schedules) == 0:
+            blocks.extend(self._empty_schedules_blocks)
+        for schedule in schedules:
+            blocks.extend(self._get_schedule_blocks(schedule=schedule))
+
+        page_block = get_schedule_page_block(previous_page_cursor=previous_page_cursor, next_page_cursor=next_page_cursor)
+        if page_block is not None:
+            blocks.append(page_block.to_dict())
+
+        blocks.extend(self._footer_blocks)
+
+        view: Dict[str, Any] = {"type": "home", "callback_id": APP_HOME_CALLBACK_ID, "blocks": blocks}
+        if private_metadata is not None:
+            view["private_metadata"] = private_metadata
+
+        return view
+
+    def _get_header_blocks(self) -> SerializedBlocks:
+        # the header shows the current timezone, which only changes with daylight saving time
+        timezone_name = get_timezone_name()
+        timezone_name_and_blocks = self._header_blocks
+        if timezone_name_and_blocks is None or timezone_name_and_blocks[0] != timezone_name:
+            timezone_name_and_blocks = (
+                timezone_name,
+                [b.to_dict() for b in get_app_home_header_blocks(timezone_name=timezone_name)],
+            )
+            self._header_blocks = timezone_name_and_blocks
+
+        return timezone_name_and_blocks[1]
+
+    def _get_schedule_blocks(self, schedule: Schedule) -> SerializedBlocks:
+        with self._lock:
+            cached_schedule, blocks = self._blocks_by_schedule_id.get(schedule.id, (None, []))
+            if cached_schedule == schedule:
+                self._blocks_by_schedule_id.move_to_end(schedule.id)
+                return blocks
+
+        blocks = [b.to_dict() for b in blocks_for_schedule(schedule=schedule)]
+
+        with self._lock:
+            self._blocks_by_schedule_id[schedule.id] = (schedule, blocks)
+            self._blocks_by_schedule_id.move_to_end(schedule.id)
+            # deleted schedules are never requested again and are evicted first
+            while len(self._blocks_by_schedule_id) > self._max_cached_schedules:
+                self._blocks_by_schedule_id.popitem(last=False)
+
+        return blocks
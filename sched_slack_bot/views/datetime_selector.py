@@ -15,6 +15,14 @@ def _get_options_for_range(option_range: range, label: str) -> OptionGroup:
     )
 
 
+def get_timezone_name() -> Optional[str]:
+    return datetime.datetime.now().astimezone().tzname()
+
+
+def get_hour_hint(timezone_name: Optional[str]) -> str:
+    return f"The Hour of the first Rotation/Reminder (in {timezone_name})"
+
+
 def get_datetime_selector(label: str, schedule_date: Optional[datetime.datetime] = None) -> DateTimeSelectorBlocks:
     blocks = dict()
     block_ids = get_datetime_block_ids(label=label)
@@ -43,9 +51,7 @@ def get_datetime_selector(label: str, schedule_date: Optional[datetime.datetime]
 
     blocks[DatetimeSelectorType.HOUR] = InputBlockWithBlockId(
         label=block_ids[DatetimeSelectorType.HOUR],
-        hint=PlainTextObject(
-            text=f"The Hour of the first Rotation/Reminder (in {datetime.datetime.now().astimezone().tzname()})"
-        ),
+        hint=PlainTextObject(text=get_hour_hint(timezone_name=get_timezone_name())),
         element=StaticSelectElement(initial_option=initial_hour, option_groups=[option_group_hours]),
         block_id=block_ids[DatetimeSelectorType.HOUR],
     )
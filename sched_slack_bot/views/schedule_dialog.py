@@ -82,16 +82,19 @@ class ScheduleDialogCallback(StrEnum):
     EDIT_DIALOG = "SCHED_SLACK_BOT_EDIT_SCHEDULE_SUBMIT_ID"
 
 
+def get_external_id(schedule: Optional[Schedule] = None) -> str:
+    # make sure external id is unique globally: https://github.com/slackapi/node-slack-sdk/issues/1012#issuecomment-684818059
+    external_id = schedule.id if schedule is not None else CREATE_NEW_SCHEDULE_VIEW_ID_PREFIX
+    return f"{external_id}{SCHEDULE_VIEW_ID_SCHEDULE_ID_DELIMITER}{str(uuid.uuid4())}"
+
+
 def get_edit_schedule_block(
     schedule: Optional[Schedule] = None, callback: ScheduleDialogCallback = ScheduleDialogCallback.CREATE_DIALOG
 ) -> View:
     modal_type = CREATE_MODAL_TYPE if schedule is None else EDIT_MODAL_TYPE
-    # make sure external id is unique globally: https://github.com/slackapi/node-slack-sdk/issues/1012#issuecomment-684818059
-    external_id = schedule.id if schedule is not None else CREATE_NEW_SCHEDULE_VIEW_ID_PREFIX
-    external_id = f"{external_id}{SCHEDULE_VIEW_ID_SCHEDULE_ID_DELIMITER}{str(uuid.uuid4())}"
     return View(
         type="modal",
-        external_id=external_id,
+        external_id=get_external_id(schedule=schedule),
         blocks=[
             HeaderBlock(text=PlainTextObject(text=f"{modal_type} an existing :calendar: Rotating Schedule")),
             DividerBlock(),
@@ -0,0 +1,88 @@
+import datetime
+import functools
+from typing import Any, Dict, List, Optional, Tuple
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.views.datetime_selector import get_timezone_name, get_hour_hint
+from sched_slack_bot.views.schedule_dialog import ScheduleDialogCallback, get_edit_schedule_block, get_external_id
+from sched_slack_bot.views.schedule_dialog_block_ids import (
+    DISPLAY_NAME_BLOCK_ID,
+    CHANNEL_INPUT_BLOCK_ID,
+    USERS_INPUT_BLOCK_ID,
+    FIRST_ROTATION_LABEL,
+    SECOND_ROTATION_LABEL,
+    DatetimeSelectorType,
+    get_datetime_block_ids,
+)
+
+SerializedView = Dict[str, Any]
+SerializedBlock = Dict[str, Any]
+
+# every value of the template schedule is replaced when a dialog is rendered from the template
+TEMPLATE_SCHEDULE = Schedule(
+    id="template",
+    display_name="template",
+    members=["template"],
+    next_rotation=datetime.datetime(year=2000, month=1, day=1),
+    time_between_rotations=datetime.timedelta(days=1),
+    channel_id_to_notify_in="template",
+    created_by="template",
+)
+
+
+@functools.cache
+def _get_template(is_edit: bool, callback: ScheduleDialogCallback) -> Tuple[SerializedView, Dict[str, int]]:
+    template = get_edit_schedule_block(schedule=TEMPLATE_SCHEDULE if is_edit else None, callback=callback).to_dict()
+    block_indexes = {b["block_id"]: i for i, b in enumerate(template["blocks"]) if "block_id" in b}
+
+    return template, block_indexes
+
+
+def _with_element_values(block: SerializedBlock, **values: Any) -> SerializedBlock:
+    return {**block, "element": {**block["element"], **values}}
+
+
+def _with_initial_option(block: SerializedBlock, value: int) -> SerializedBlock:
+    # the options of the hour and minute selectors are the values from 0 on, so the value is the index of its option
+    option = block["element"]["option_groups"][0]["options"][value]
+
+    return _with_element_values(block=block, initial_option=option)
+
+
+# renders the create and edit dialog from templates serialized once per callback. Only the blocks with values of the
+# schedule or the current timezone are copied, everything else is shared with the template and must not be modified.
+def get_schedule_dialog_view(
+    schedule: Optional[Schedule] = None, callback: ScheduleDialogCallback = ScheduleDialogCallback.CREATE_DIALOG
+) -> SerializedView:
+    template, block_indexes = _get_template(is_edit=schedule is not None, callback=callback)
+    blocks: List[SerializedBlock] = list(template["blocks"])
+
+    hour_hint = get_hour_hint(timezone_name=get_timezone_name())
+    for label in (FIRST_ROTATION_LABEL, SECOND_ROTATION_LABEL):
+        hour_index = block_indexes[get_datetime_block_ids(label=label)[DatetimeSelectorType.HOUR]]
+        blocks[hour_index] = {**blocks[hour_index], "hint": {**blocks[hour_index]["hint"], "text": hour_hint}}
+
+    if schedule is not None:
+        display_name_index = block_indexes[DISPLAY_NAME_BLOCK_ID]
+        blocks[display_name_index] = _with_element_values(blocks[display_name_index], initial_value=schedule.display_name)
+        channel_index = block_indexes[CHANNEL_INPUT_BLOCK_ID]
+        blocks[channel_index] = _with_element_values(
+            blocks[channel_index], initial_conversation=schedule.channel_id_to_notify_in
+        )
+        users_index = block_indexes[USERS_INPUT_BLOCK_ID]
+        blocks[users_index] = _with_element_values(blocks[users_index], initial_users=list(schedule.members))
+
+        rotations = (
+            (FIRST_ROTATION_LABEL, schedule.next_rotation),
+            (SECOND_ROTATION_LABEL, schedule.next_rotation + schedule.time_between_rotations),
+        )
+        for label, rotation in rotations:
+            block_ids = get_datetime_block_ids(label=label)
+            date_index = block_indexes[block_ids[DatetimeSelectorType.DATE]]
+            blocks[date_index] = _with_element_values(blocks[date_index], initial_date=rotation.date().isoformat())
+            hour_index = block_indexes[block_ids[DatetimeSelectorType.HOUR]]
+            blocks[hour_index] = _with_initial_option(blocks[hour_index], value=rotation.hour)
+            minute_index = block_indexes[block_ids[DatetimeSelectorType.MINUTE]]
+            blocks[minute_index] = _with_initial_option(blocks[minute_index], value=rotation.minute)
+
+    return {**template, "external_id": get_external_id(schedule=schedule), "blocks": blocks}
@@ -0,0 +1,167 @@
+import asyncio
+import datetime
+import uuid
+from typing import Generator, List
+from unittest import mock
+
+import pytest
+from pymongo import ReplaceOne, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+
+from sched_slack_bot.data.mongo.async_mongo_schedule_access import AsyncMongoScheduleAccess
+from sched_slack_bot.data.mongo.mongo_schedule_access import get_next_rotation_filter
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import SERIALIZATION_DATE_FORMAT
+
+
+@pytest.fixture()
+def mocked_collection() -> mock.MagicMock:
+    return mock.MagicMock(spec=AsyncCollection)
+
+
+@pytest.fixture(autouse=True)
+def mocked_mongo_client(mocked_collection: mock.MagicMock) -> Generator[mock.MagicMock, None, None]:
+    with mock.patch("sched_slack_bot.data.mongo.async_mongo_schedule_access.AsyncMongoClient") as mocked_client:
+        mocked_client.return_value.get_database.return_value.get_collection.return_value = mocked_collection
+        yield mocked_client
+
+
+@pytest.fixture()
+def mongo_schedule_access() -> AsyncMongoScheduleAccess:
+    return AsyncMongoScheduleAccess(mongo_url="mongodb://someUrl")
+
+
+@pytest.fixture()
+def schedules() -> List[Schedule]:
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Rotation Schedule {i}",
+            members=["U1", "U2"],
+            next_rotation=datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(seconds=100 * i),
+            time_between_rotations=datetime.timedelta(hours=2),
+            channel_id_to_notify_in="C1",
+            created_by="creator",
+        )
+        for i in range(1, 3)
+    ]
+
+
+def test_pool_and_timeout_are_configured(mocked_mongo_client: mock.MagicMock) -> None:
+    AsyncMongoScheduleAccess(
+        mongo_url="mongodb://someUrl", max_pool_size=5, min_pool_size=1, timeout=datetime.timedelta(seconds=2)
+    )
+
+    mocked_mongo_client.assert_called_with(host="mongodb://someUrl", port=None, maxPoolSize=5, minPoolSize=1, timeoutMS=2000)
+
+
+def test_get_available_schedules(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find.return_value.__aiter__.return_value = [s.as_json() for s in schedules]
+
+    assert asyncio.run(mongo_schedule_access.get_available_schedules()) == schedules
+    mocked_collection.find.assert_called_once_with({})
+
+
+def test_get_schedules_due_before(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    before = datetime.datetime.now() + datetime.timedelta(hours=1)
+    mocked_collection.find.return_value.__aiter__.return_value = [s.as_json() for s in schedules]
+
+    assert asyncio.run(mongo_schedule_access.get_schedules_due_before(before=before)) == schedules
+    mocked_collection.find.assert_called_once_with(
+        {
+            "$or": [
+                {"next_rotation": {"$lt": before}},
+                {"next_rotation": {"$lt": before.strftime(SERIALIZATION_DATE_FORMAT)}},
+            ]
+        }
+    )
+
+
+def test_get_schedules_due_between(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    start = datetime.datetime.now()
+    end = start + datetime.timedelta(hours=1)
+    mocked_collection.find.return_value.__aiter__.return_value = [s.as_json() for s in schedules]
+
+    assert asyncio.run(mongo_schedule_access.get_schedules_due_between(start=start, end=end)) == schedules
+    mocked_collection.find.assert_called_once_with(get_next_rotation_filter(start=start, end=end))
+
+
+@pytest.mark.parametrize("found", [True, False])
+def test_get_schedule(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule], found: bool
+) -> None:
+    mocked_collection.find_one.return_value = schedules[0].as_json() if found else None
+
+    assert asyncio.run(mongo_schedule_access.get_schedule(schedule_id=schedules[0].id)) == (schedules[0] if found else None)
+    mocked_collection.find_one.assert_awaited_once_with({"id": schedules[0].id})
+
+
+def test_writes(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find_one_and_update.return_value = schedules[1].as_json()
+
+    async def write() -> None:
+        await mongo_schedule_access.save_schedule(schedule=schedules[0])
+        await mongo_schedule_access.update_schedule(schedule_id_to_update=schedules[1].id, new_schedule=schedules[1])
+        await mongo_schedule_access.delete_schedule(schedule_id=schedules[0].id)
+
+    asyncio.run(write())
+
+    mocked_collection.insert_one.assert_awaited_once_with(schedules[0].as_json())
+    mocked_collection.find_one_and_update.assert_awaited_once_with(
+        filter={"id": schedules[1].id},
+        update={"$set": {k: v for k, v in schedules[1].as_json().items() if k != "version"}, "$inc": {"version": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    mocked_collection.delete_one.assert_awaited_once_with({"id": schedules[0].id})
+
+
+def test_bulk_writes(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    async def write() -> None:
+        await mongo_schedule_access.bulk_save_schedules(schedules=schedules)
+        await mongo_schedule_access.bulk_update_schedules(schedules=schedules)
+
+    asyncio.run(write())
+
+    assert mocked_collection.bulk_write.await_args_list == [
+        mock.call([ReplaceOne(filter={"id": s.id}, replacement=s.as_json(), upsert=True) for s in schedules], ordered=False),
+        mock.call(
+            [ReplaceOne(filter={"id": s.id, "version": {"$in": [0, None]}}, replacement=s.as_json()) for s in schedules],
+            ordered=False,
+        ),
+    ]
+
+
+def test_advance_rotation(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: AsyncMongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.update_one.return_value.modified_count = 1
+    next_schedule = schedules[0].next_schedule
+
+    assert asyncio.run(
+        mongo_schedule_access.advance_rotation(
+            schedule_id=next_schedule.id,
+            next_rotation=next_schedule.next_rotation,
+            current_index=next_schedule.current_index,
+            expected_version=2,
+        )
+    )
+    mocked_collection.update_one.assert_awaited_once_with(
+        filter={"id": next_schedule.id, "version": {"$in": [2]}},
+        update={
+            "$set": {
+                "next_rotation": next_schedule.next_rotation.replace(microsecond=0),
+                "current_index": next_schedule.current_index,
+                "version": 3,
+            }
+        },
+    )
@@ -0,0 +1,167 @@
+import datetime
+import uuid
+from typing import Generator
+from unittest import mock
+
+import pytest
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+
+from sched_slack_bot.data.mongo.mongo_reminder_job_access import MongoReminderJobAccess
+from sched_slack_bot.model.schedule import Schedule
+
+
+@pytest.fixture()
+def mocked_collection() -> mock.MagicMock:
+    return mock.MagicMock(spec=Collection)
+
+
+@pytest.fixture(autouse=True)
+def mocked_mongo_client(mocked_collection: mock.MagicMock) -> Generator[mock.MagicMock, None, None]:
+    with mock.patch("sched_slack_bot.data.mongo.mongo_reminder_job_access.MongoClient") as mocked_client:
+        mocked_client.return_value.get_database.return_value.get_collection.return_value = mocked_collection
+        yield mocked_client
+
+
+@pytest.fixture()
+def job_access() -> MongoReminderJobAccess:
+    return MongoReminderJobAccess(mongo_url="mongodb://someUrl")
+
+
+@pytest.fixture()
+def schedule() -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(seconds=100),
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+def test_save_job_releases_lease(
+    mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess, schedule: Schedule
+) -> None:
+    job_access.save_job(schedule=schedule)
+
+    mocked_collection.update_one.assert_called_once_with(
+        filter={"schedule_id": schedule.id},
+        update={
+            "$set": {
+                "due_at": schedule.next_rotation,
+                "schedule": schedule.as_json(),
+                "lease_owner": None,
+                "lease_expires_at": None,
+            }
+        },
+        upsert=True,
+    )
+
+
+def test_add_missing_jobs_inserts_and_moves_stale_jobs_forward(
+    mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess, schedule: Schedule
+) -> None:
+    job = {"due_at": schedule.next_rotation, "schedule": schedule.as_json(), "lease_owner": None, "lease_expires_at": None}
+
+    job_access.add_missing_jobs(schedules=[schedule])
+
+    mocked_collection.bulk_write.assert_called_once_with(
+        [
+            UpdateOne(filter={"schedule_id": schedule.id}, update={"$setOnInsert": job}, upsert=True),
+            UpdateOne(
+                filter={
+                    "schedule_id": schedule.id,
+                    "due_at": {"$lt": schedule.next_rotation},
+                    "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": mock.ANY}}],
+                },
+                update={"$set": job},
+            ),
+        ],
+        ordered=False,
+    )
+
+
+def test_add_no_missing_jobs(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess) -> None:
+    job_access.add_missing_jobs(schedules=[])
+
+    mocked_collection.bulk_write.assert_not_called()
+
+
+def test_delete_job(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess) -> None:
+    job_access.delete_job(schedule_id="some_id")
+
+    mocked_collection.delete_one.assert_called_once_with({"schedule_id": "some_id"})
+
+
+@pytest.mark.parametrize("count, expected", [(0, False), (1, True)])
+def test_has_job(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess, count: int, expected: bool) -> None:
+    mocked_collection.count_documents.return_value = count
+
+    assert job_access.has_job(schedule_id="some_id") == expected
+
+
+def test_claim_due_job(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess, schedule: Schedule) -> None:
+    now = datetime.datetime.now()
+    lease = datetime.timedelta(minutes=5)
+    mocked_collection.find_one_and_update.return_value = {"schedule_id": schedule.id, "schedule": schedule.as_json()}
+
+    assert job_access.claim_due_job(owner="owner", now=now, lease=lease) == schedule
+    mocked_collection.find_one_and_update.assert_called_once_with(
+        filter={"due_at": {"$lte": now}, "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": now}}]},
+        update={"$set": {"lease_owner": "owner", "lease_expires_at": now + lease}},
+        sort=[("due_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def test_claim_without_due_job(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess) -> None:
+    mocked_collection.find_one_and_update.return_value = None
+
+    assert job_access.claim_due_job(owner="owner", now=datetime.datetime.now(), lease=datetime.timedelta(minutes=5)) is None
+
+
+@pytest.mark.parametrize("modified_count, expected", [(0, False), (1, True)])
+def test_renew_lease_requires_lease(
+    mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess, modified_count: int, expected: bool
+) -> None:
+    mocked_collection.update_one.return_value.modified_count = modified_count
+    now = datetime.datetime.now()
+    lease = datetime.timedelta(minutes=5)
+
+    assert job_access.renew_lease(schedule_id="id", owner="owner", now=now, lease=lease) == expected
+    mocked_collection.update_one.assert_called_once_with(
+        filter={"schedule_id": "id", "lease_owner": "owner"}, update={"$set": {"lease_expires_at": now + lease}}
+    )
+
+
+@pytest.mark.parametrize("modified_count, expected", [(0, False), (1, True)])
+def test_complete_job_requires_lease(
+    mocked_collection: mock.MagicMock,
+    job_access: MongoReminderJobAccess,
+    schedule: Schedule,
+    modified_count: int,
+    expected: bool,
+) -> None:
+    mocked_collection.update_one.return_value.modified_count = modified_count
+    next_schedule = schedule.next_schedule
+
+    assert job_access.complete_job(schedule_id=schedule.id, owner="owner", next_schedule=next_schedule) == expected
+    mocked_collection.update_one.assert_called_once_with(
+        filter={"schedule_id": schedule.id, "lease_owner": "owner"},
+        update={
+            "$set": {
+                "due_at": next_schedule.next_rotation,
+                "schedule": next_schedule.as_json(),
+                "lease_owner": None,
+                "lease_expires_at": None,
+            }
+        },
+    )
+
+
+def test_create_indexes(mocked_collection: mock.MagicMock, job_access: MongoReminderJobAccess) -> None:
+    job_access.create_indexes()
+
+    mocked_collection.create_index.assert_any_call("schedule_id", unique=True)
@@ -0,0 +1,49 @@
+import datetime
+from typing import Generator
+from unittest import mock
+
+import pytest
+from pymongo.collection import Collection
+
+from sched_slack_bot.data.mongo.mongo_replica_membership_access import MongoReplicaMembershipAccess
+
+
+@pytest.fixture()
+def mocked_collection() -> mock.MagicMock:
+    return mock.MagicMock(spec=Collection)
+
+
+@pytest.fixture(autouse=True)
+def mocked_mongo_client(mocked_collection: mock.MagicMock) -> Generator[mock.MagicMock, None, None]:
+    with mock.patch("sched_slack_bot.data.mongo.mongo_replica_membership_access.MongoClient") as mocked_client:
+        mocked_client.return_value.get_database.return_value.get_collection.return_value = mocked_collection
+        yield mocked_client
+
+
+@pytest.fixture()
+def membership_access() -> MongoReplicaMembershipAccess:
+    return MongoReplicaMembershipAccess(mongo_url="mongodb://someUrl")
+
+
+def test_heartbeat(mocked_collection: mock.MagicMock, membership_access: MongoReplicaMembershipAccess) -> None:
+    now = datetime.datetime.now()
+
+    membership_access.heartbeat(replica_id="replica", now=now)
+
+    mocked_collection.update_one.assert_called_once_with(
+        filter={"replica_id": "replica"}, update={"$set": {"last_heartbeat": now}}, upsert=True
+    )
+
+
+def test_get_live_replicas(mocked_collection: mock.MagicMock, membership_access: MongoReplicaMembershipAccess) -> None:
+    alive_after = datetime.datetime.now()
+    mocked_collection.find.return_value = [{"replica_id": "a", "last_heartbeat": alive_after}]
+
+    assert membership_access.get_live_replicas(alive_after=alive_after) == ["a"]
+    mocked_collection.find.assert_called_once_with({"last_heartbeat": {"$gte": alive_after}})
+
+
+def test_remove_replica(mocked_collection: mock.MagicMock, membership_access: MongoReplicaMembershipAccess) -> None:
+    membership_access.remove_replica(replica_id="replica")
+
+    mocked_collection.delete_one.assert_called_once_with({"replica_id": "replica"})
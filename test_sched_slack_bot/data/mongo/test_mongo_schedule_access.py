@@ -1,13 +1,21 @@
+import dataclasses
 import datetime
+import threading
+import time
 import uuid
-from typing import Generator, List
+from typing import Generator, List, Optional, Iterator, Dict, Any
 from unittest import mock
 
 import pytest
+from pymongo import ReplaceOne, UpdateOne, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import OperationFailure, PyMongoError
 from pymongo.collection import Collection
 
-from sched_slack_bot.data.mongo.mongo_schedule_access import MongoScheduleAccess
+from sched_slack_bot.data.mongo import mongo_schedule_access as mongo_schedule_access_module
+from sched_slack_bot.data.mongo.mongo_schedule_access import MongoScheduleAccess, SCHEDULE_INDEXES
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import SERIALIZATION_DATE_FORMAT
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
 
 
 @pytest.fixture()
@@ -58,6 +66,88 @@ def test_get_available_schedules(
     assert mongo_schedule_access.get_available_schedules() == schedules
 
 
+def test_get_schedules_for_user(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find.return_value = [s.as_json() for s in schedules[:1]]
+
+    assert mongo_schedule_access.get_schedules_for_user(user_id="U1") == schedules[:1]
+    mocked_collection.find.assert_called_once_with(
+        {"$or": [{"created_by": "U1"}, {"members": "U1"}]}, projection={"_id": False}
+    )
+
+
+def test_migrate_created_by(mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess) -> None:
+    mocked_collection.update_many.return_value.modified_count = 2
+
+    assert mongo_schedule_access.migrate_created_by(user_name="some.user", user_id="U1") == 2
+    mocked_collection.update_many.assert_called_once_with(
+        filter={"created_by": "some.user"}, update={"$set": {"created_by": "U1"}}
+    )
+
+
+def test_get_schedules_due_before(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    before = datetime.datetime.now() + datetime.timedelta(hours=1)
+    mocked_collection.find.return_value = [s.as_json() for s in schedules]
+
+    assert mongo_schedule_access.get_schedules_due_before(before=before) == schedules
+    mocked_collection.find.assert_called_once_with(
+        {
+            "$or": [
+                {"next_rotation": {"$lt": before}},
+                {"next_rotation": {"$lt": before.strftime(SERIALIZATION_DATE_FORMAT)}},
+            ]
+        }
+    )
+
+
+def test_get_schedules_due_between(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    start = datetime.datetime.now()
+    end = start + datetime.timedelta(hours=1)
+    mocked_collection.find.return_value = [s.as_json() for s in schedules]
+
+    assert mongo_schedule_access.get_schedules_due_between(start=start, end=end) == schedules
+    mocked_collection.find.assert_called_once_with(
+        {
+            "$or": [
+                {"next_rotation": {"$gte": start, "$lt": end}},
+                {
+                    "next_rotation": {
+                        "$gte": start.strftime(SERIALIZATION_DATE_FORMAT),
+                        "$lt": end.strftime(SERIALIZATION_DATE_FORMAT),
+                    }
+                },
+            ]
+        }
+    )
+
+
+def test_migrate_string_dates(mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess) -> None:
+    mocked_collection.find.return_value = [{"_id": i, "next_rotation": f"2022-01-0{i}T10:00:00.000Z"} for i in range(1, 4)]
+
+    with mock.patch.object(mongo_schedule_access_module, "BULK_WRITE_CHUNK_SIZE", 2):
+        assert mongo_schedule_access.migrate_string_dates() == 3
+
+    assert mocked_collection.find.call_args.args == ({"next_rotation": {"$type": "string"}},)
+    assert mocked_collection.bulk_write.call_count == 2
+    first_batch = mocked_collection.bulk_write.call_args_list[0].args[0]
+    assert first_batch[0] == UpdateOne(
+        filter={"_id": 1, "next_rotation": "2022-01-01T10:00:00.000Z"},
+        update={"$set": {"next_rotation": datetime.datetime(2022, 1, 1, 10)}},
+    )
+
+
+def test_migrate_without_string_dates(mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess) -> None:
+    mocked_collection.find.return_value = []
+
+    assert mongo_schedule_access.migrate_string_dates() == 0
+    mocked_collection.bulk_write.assert_not_called()
+
+
 def test_get_schedule(
     mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
 ) -> None:
@@ -75,9 +165,28 @@ def test_get_schedule_none(
 def test_update_schedule(
     mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
 ) -> None:
-    mongo_schedule_access.update_schedule(schedule_id_to_update=schedules[0].id, new_schedule=schedules[0])
+    updated_schedule = dataclasses.replace(schedules[0], version=schedules[0].version + 1)
+    mocked_collection.find_one_and_update.return_value = updated_schedule.as_json()
+
+    assert (
+        mongo_schedule_access.update_schedule(schedule_id_to_update=schedules[0].id, new_schedule=schedules[0])
+        == updated_schedule
+    )
+
+    update = {k: v for k, v in schedules[0].as_json().items() if k != "version"}
+    mocked_collection.find_one_and_update.assert_called_once_with(
+        filter={"id": schedules[0].id},
+        update={"$set": update, "$inc": {"version": 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def test_update_deleted_schedule(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find_one_and_update.return_value = None
 
-    mocked_collection.replace_one.assert_called_once_with(filter={"id": schedules[0].id}, replacement=schedules[0].as_json())
+    assert mongo_schedule_access.update_schedule(schedule_id_to_update=schedules[0].id, new_schedule=schedules[0]) is None
 
 
 def test_delete_schedule(
@@ -94,3 +203,283 @@ def test_save_schedule(
     mongo_schedule_access.save_schedule(schedule=schedules[0])
 
     mocked_collection.insert_one.assert_called_once_with(schedules[0].as_json())
+
+
+def test_bulk_save_schedules(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mongo_schedule_access.bulk_save_schedules(schedules=schedules)
+
+    mocked_collection.bulk_write.assert_called_once_with(
+        [ReplaceOne(filter={"id": s.id}, replacement=s.as_json(), upsert=True) for s in schedules], ordered=False
+    )
+
+
+def test_bulk_update_schedules(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    # the schedules are only replaced if nobody changed them since they were read
+    schedules = [schedules[0], dataclasses.replace(schedules[1], version=3)]
+
+    mongo_schedule_access.bulk_update_schedules(schedules=schedules)
+
+    mocked_collection.bulk_write.assert_called_once_with(
+        [
+            ReplaceOne(filter={"id": schedules[0].id, "version": {"$in": [0, None]}}, replacement=schedules[0].as_json()),
+            ReplaceOne(filter={"id": schedules[1].id, "version": {"$in": [3]}}, replacement=schedules[1].as_json()),
+        ],
+        ordered=False,
+    )
+
+
+def test_bulk_update_schedules_is_chunked(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    with mock.patch.object(mongo_schedule_access_module, "BULK_WRITE_CHUNK_SIZE", 1):
+        mongo_schedule_access.bulk_update_schedules(schedules=schedules)
+
+    assert mocked_collection.bulk_write.call_count == len(schedules)
+
+
+def test_bulk_update_without_schedules(mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess) -> None:
+    mongo_schedule_access.bulk_update_schedules(schedules=[])
+
+    mocked_collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "expected_version, expected_versions",
+    [
+        (0, [0, None]),
+        (3, [3]),
+    ],
+)
+@pytest.mark.parametrize("modified_count, expected", [(0, False), (1, True)])
+def test_advance_rotation(
+    mocked_collection: mock.MagicMock,
+    mongo_schedule_access: MongoScheduleAccess,
+    schedules: List[Schedule],
+    expected_version: int,
+    expected_versions: List[Optional[int]],
+    modified_count: int,
+    expected: bool,
+) -> None:
+    mocked_collection.update_one.return_value.modified_count = modified_count
+    next_schedule = schedules[0].next_schedule
+
+    assert (
+        mongo_schedule_access.advance_rotation(
+            schedule_id=next_schedule.id,
+            next_rotation=next_schedule.next_rotation,
+            current_index=next_schedule.current_index,
+            expected_version=expected_version,
+        )
+        == expected
+    )
+    mocked_collection.update_one.assert_called_once_with(
+        filter={"id": next_schedule.id, "version": {"$in": expected_versions}},
+        update={
+            "$set": {
+                "next_rotation": next_schedule.next_rotation.replace(microsecond=0),
+                "current_index": next_schedule.current_index,
+                "version": expected_version + 1,
+            }
+        },
+    )
+
+
+def test_ensure_indexes_creates_missing_indexes(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    mocked_collection.index_information.return_value = {
+        "_id_": {"key": [("_id", 1)]},
+        "next_rotation": {"key": [("next_rotation", 1)]},
+    }
+
+    missing_indexes = mongo_schedule_access.ensure_indexes()
+
+    assert missing_indexes == [
+        "id_unique",
+        "next_rotation_id",
+        "display_name_id",
+        "members",
+        "created_by",
+        "channel_id_to_notify_in",
+    ]
+    created_indexes = [c.args[0][0] for c in mocked_collection.create_indexes.call_args_list]
+    assert [i.document["name"] for i in created_indexes] == missing_indexes
+    assert created_indexes[0].document["unique"]
+
+
+def test_ensure_indexes_without_missing_indexes(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    mocked_collection.index_information.return_value = {
+        i.document["name"]: {"key": list(i.document["key"].items()), "unique": i.document.get("unique", False)}
+        for i in SCHEDULE_INDEXES
+    }
+
+    assert mongo_schedule_access.ensure_indexes() == []
+    mocked_collection.create_indexes.assert_not_called()
+    mocked_collection.drop_index.assert_not_called()
+
+
+def test_ensure_indexes_rebuilds_indexes_with_other_options(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    # e.g. an id index created by hand, which does not enforce unique ids
+    mocked_collection.index_information.return_value = {
+        i.document["name"]: {"key": list(i.document["key"].items())} for i in SCHEDULE_INDEXES[1:]
+    } | {"id_1": {"key": [("id", 1)]}}
+
+    assert mongo_schedule_access.ensure_indexes() == ["id_unique"]
+
+    mocked_collection.drop_index.assert_called_once_with("id_1")
+    mocked_collection.create_indexes.assert_called_once_with([SCHEDULE_INDEXES[0]])
+
+
+def test_ensure_indexes_restores_previous_index_if_rebuild_fails(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    mocked_collection.index_information.return_value = {
+        i.document["name"]: {"key": list(i.document["key"].items())} for i in SCHEDULE_INDEXES[1:]
+    } | {"id_1": {"key": [("id", 1)]}}
+    mocked_collection.create_indexes.side_effect = [OperationFailure("duplicate key"), None]
+
+    assert mongo_schedule_access.ensure_indexes() == ["id_unique"]
+
+    mocked_collection.drop_index.assert_called_once_with("id_1")
+    restored_index = mocked_collection.create_indexes.call_args.args[0][0]
+    assert restored_index.document["name"] == "id_1"
+    assert restored_index.document["key"] == SCHEDULE_INDEXES[0].document["key"]
+    assert not restored_index.document["unique"]
+
+
+def test_ensure_indexes_continues_after_failure(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    mocked_collection.index_information.return_value = {}
+    mocked_collection.create_indexes.side_effect = [OperationFailure("duplicate key")] + [None] * (len(SCHEDULE_INDEXES) - 1)
+
+    assert len(mongo_schedule_access.ensure_indexes()) == len(SCHEDULE_INDEXES)
+    assert mocked_collection.create_indexes.call_count == len(SCHEDULE_INDEXES)
+
+
+def test_watch_changes_on_standalone_server(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess
+) -> None:
+    mocked_collection.watch.side_effect = OperationFailure("The $changeStream stage is only supported on replica sets")
+
+    assert not mongo_schedule_access.watch_changes(on_changed=mock.MagicMock())
+
+
+def _wait_forever() -> Iterator[Dict[str, Any]]:
+    threading.Event().wait()
+    yield from []
+
+
+def test_watch_changes_forwards_changed_schedules(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    changes = [
+        {"operationType": "insert", "fullDocument": schedules[0].as_json()},
+        {"operationType": "update", "fullDocument": schedules[1].as_json()},
+        {"operationType": "delete", "documentKey": {"_id": "object_id"}},
+    ]
+    change_stream = mock.MagicMock()
+    change_stream.__enter__.return_value = change_stream
+    change_stream.__iter__.side_effect = [iter(changes), PyMongoError("connection lost"), _wait_forever()]
+    mocked_collection.watch.return_value = change_stream
+    on_changed = mock.MagicMock()
+
+    with mock.patch("sched_slack_bot.data.mongo.mongo_schedule_access.time"):
+        assert mongo_schedule_access.watch_changes(on_changed=on_changed)
+
+        while on_changed.call_count < 5:
+            # no idle waiting
+            time.sleep(0.05)
+
+    assert [c.args[0] for c in on_changed.call_args_list[:5]] == [schedules[0], schedules[1], None, None, None]
+    mocked_collection.watch.assert_called_with(full_document="updateLookup")
+
+
+def test_iter_schedules(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find.return_value = iter([s.as_json() for s in schedules])
+
+    schedule_iterator = mongo_schedule_access.iter_schedules(batch_size=10)
+
+    # nothing is read before the schedules are consumed
+    mocked_collection.find.assert_not_called()
+    assert list(schedule_iterator) == schedules
+    mocked_collection.find.assert_called_once_with({}, projection={"_id": False}, sort=[("id", ASCENDING)], batch_size=10)
+
+
+@pytest.mark.parametrize("after_id, expected_filter", [(None, {}), ("some_id", {"id": {"$gt": "some_id"}})])
+def test_get_schedules_page(
+    mocked_collection: mock.MagicMock,
+    mongo_schedule_access: MongoScheduleAccess,
+    schedules: List[Schedule],
+    after_id: Optional[str],
+    expected_filter: Dict[str, Any],
+) -> None:
+    mocked_collection.find.return_value = [s.as_json() for s in schedules]
+
+    assert mongo_schedule_access.get_schedules_page(after_id=after_id, limit=2) == schedules
+    mocked_collection.find.assert_called_once_with(
+        expected_filter, projection={"_id": False}, sort=[("id", ASCENDING)], limit=2
+    )
+
+
+def test_get_sorted_schedules_page_of_user(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    mocked_collection.find.return_value = [s.as_json() for s in schedules]
+    cursor = SchedulePageCursor(sort_order=ScheduleSortOrder.DISPLAY_NAME, sort_value="Rotation", schedule_id="some_id")
+
+    assert (
+        mongo_schedule_access.get_sorted_schedules_page(
+            sort_order=ScheduleSortOrder.DISPLAY_NAME, limit=2, cursor=cursor, user_id="U1"
+        )
+        == schedules
+    )
+    mocked_collection.find.assert_called_once_with(
+        {
+            "$and": [
+                {"$or": [{"created_by": "U1"}, {"members": "U1"}]},
+                {"$or": [{"display_name": {"$gt": "Rotation"}}, {"display_name": "Rotation", "id": {"$gt": "some_id"}}]},
+            ]
+        },
+        projection={"_id": False},
+        sort=[("display_name", ASCENDING), ("id", ASCENDING)],
+        limit=2,
+    )
+
+
+def test_get_sorted_schedules_page_backwards(
+    mocked_collection: mock.MagicMock, mongo_schedule_access: MongoScheduleAccess, schedules: List[Schedule]
+) -> None:
+    # read in descending order
+    mocked_collection.find.return_value = [s.as_json() for s in reversed(schedules)]
+    cursor = SchedulePageCursor.before(schedule=schedules[0], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+
+    assert (
+        mongo_schedule_access.get_sorted_schedules_page(sort_order=ScheduleSortOrder.NEXT_ROTATION, limit=2, cursor=cursor)
+        == schedules
+    )
+    mocked_collection.find.assert_called_once_with(
+        {
+            "$and": [
+                {
+                    "$or": [
+                        {"next_rotation": {"$lt": schedules[0].next_rotation}},
+                        {"next_rotation": schedules[0].next_rotation, "id": {"$lt": schedules[0].id}},
+                    ]
+                }
+            ]
+        },
+        projection={"_id": False},
+        sort=[("next_rotation", DESCENDING), ("id", DESCENDING)],
+        limit=2,
+    )
@@ -0,0 +1,129 @@
+import datetime
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Generator, List
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.sqlite import sqlite_schedule_access as sqlite_schedule_access_module
+from sched_slack_bot.data.sqlite.sqlite_schedule_access import SqliteScheduleAccess
+from sched_slack_bot.model.schedule import Schedule
+
+
+@pytest.fixture()
+def database_path(tmp_path: str) -> str:
+    return os.path.join(tmp_path, "schedules.sqlite3")
+
+
+@pytest.fixture()
+def sqlite_schedule_access(database_path: str) -> Generator[SqliteScheduleAccess, None, None]:
+    sqlite_schedule_access = SqliteScheduleAccess(database_path=database_path)
+    yield sqlite_schedule_access
+    sqlite_schedule_access.close()
+
+
+@pytest.fixture()
+def schedules() -> List[Schedule]:
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name="Rotation Schedule",
+            members=["U1", "U2"],
+            next_rotation=datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(minutes=i),
+            time_between_rotations=datetime.timedelta(hours=2),
+            channel_id_to_notify_in="C1",
+            created_by="creator",
+        )
+        for i in range(5)
+    ]
+
+
+def _get_query_plan(database_path: str, query: str) -> str:
+    with sqlite3.connect(database=database_path) as connection:
+        return " ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", ("value",)))
+
+
+def test_database_uses_write_ahead_log(sqlite_schedule_access: SqliteScheduleAccess, database_path: str) -> None:
+    with sqlite3.connect(database=database_path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM schedules WHERE id = ?",
+        "SELECT * FROM schedules WHERE next_rotation < ?",
+        "SELECT * FROM schedules WHERE created_by = ?",
+        "SELECT * FROM schedule_members WHERE member = ?",
+        "SELECT * FROM schedules WHERE next_rotation > ? ORDER BY next_rotation, id",
+        "SELECT * FROM schedules WHERE display_name > ? ORDER BY display_name, id",
+    ],
+)
+def test_queries_use_indexes(sqlite_schedule_access: SqliteScheduleAccess, database_path: str, query: str) -> None:
+    assert "USING" in _get_query_plan(database_path=database_path, query=query)
+
+
+def test_schema_is_only_created_once(
+    sqlite_schedule_access: SqliteScheduleAccess, database_path: str, schedules: List[Schedule]
+) -> None:
+    sqlite_schedule_access.save_schedule(schedule=schedules[0])
+
+    reopened_schedule_access = SqliteScheduleAccess(database_path=database_path)
+
+    assert reopened_schedule_access.get_available_schedules() == schedules[:1]
+    reopened_schedule_access.close()
+
+
+def test_bulk_writes_are_chunked_into_transactions(
+    sqlite_schedule_access: SqliteScheduleAccess, schedules: List[Schedule]
+) -> None:
+    with mock.patch.object(sqlite_schedule_access_module, "BULK_WRITE_CHUNK_SIZE", 2):
+        with mock.patch.object(sqlite_schedule_access, "_write_members") as mocked_write_members:
+            sqlite_schedule_access.bulk_save_schedules(schedules=schedules)
+
+    assert [c.kwargs["schedules"] for c in mocked_write_members.call_args_list] == [
+        schedules[:2],
+        schedules[2:4],
+        schedules[4:],
+    ]
+    assert sqlite_schedule_access.get_available_schedules() == schedules
+
+
+def test_failing_write_is_rolled_back(sqlite_schedule_access: SqliteScheduleAccess, schedules: List[Schedule]) -> None:
+    sqlite_schedule_access.save_schedule(schedule=schedules[0])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        sqlite_schedule_access.save_schedule(schedule=schedules[0])
+
+    assert sqlite_schedule_access.get_available_schedules() == schedules[:1]
+    assert sqlite_schedule_access.get_schedules_for_user(user_id="U1") == schedules[:1]
+
+
+def test_reads_do_not_wait_for_a_running_write(sqlite_schedule_access: SqliteScheduleAccess, schedules: List[Schedule]) -> None:
+    sqlite_schedule_access.save_schedule(schedule=schedules[0])
+    read_schedules: List[List[Schedule]] = []
+
+    # another thread is in the middle of a write transaction
+    with sqlite_schedule_access._lock, sqlite_schedule_access._connection:
+        sqlite_schedule_access._connection.execute(
+            sqlite_schedule_access_module.INSERT_SCHEDULE, sqlite_schedule_access_module._to_row(schedule=schedules[1])
+        )
+        reader = threading.Thread(target=lambda: read_schedules.append(sqlite_schedule_access.get_available_schedules()))
+        reader.start()
+        reader.join(timeout=5)
+
+        # the uncommitted write is not visible yet
+        assert read_schedules == [schedules[:1]]
+
+    assert sqlite_schedule_access.get_available_schedules() == schedules[:2]
+
+
+def test_in_memory_database_is_read_with_the_write_connection(schedules: List[Schedule]) -> None:
+    sqlite_schedule_access = SqliteScheduleAccess(database_path=":memory:")
+    sqlite_schedule_access.save_schedule(schedule=schedules[0])
+
+    assert sqlite_schedule_access.get_available_schedules() == schedules[:1]
+    sqlite_schedule_access.close()
@@ -0,0 +1,305 @@
+import dataclasses
+import datetime
+import time
+import uuid
+from typing import List, Optional, Callable
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.cached_schedule_access import CachedScheduleAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+
+
+def _create_schedule(display_name: str) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name=display_name,
+        members=["U1", "U2"],
+        next_rotation=datetime.datetime.now() + datetime.timedelta(hours=1),
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture
+def schedules() -> List[Schedule]:
+    return [_create_schedule(display_name="first"), _create_schedule(display_name="second")]
+
+
+@pytest.fixture()
+def schedule_access(schedules: List[Schedule]) -> mock.MagicMock:
+    schedule_access = mock.MagicMock(spec=ScheduleAccess)
+    schedule_access.get_available_schedules.return_value = schedules
+    schedule_access.watch_changes.return_value = True
+
+    return schedule_access
+
+
+@pytest.fixture
+def cached_schedule_access(schedule_access: mock.MagicMock) -> CachedScheduleAccess:
+    return CachedScheduleAccess(schedule_access=schedule_access)
+
+
+def test_reads_are_served_from_cache(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    assert cached_schedule_access.get_available_schedules() == schedules
+    assert cached_schedule_access.get_schedule(schedule_id=schedules[1].id) == schedules[1]
+    assert cached_schedule_access.get_schedule(schedule_id="unknown") is None
+    assert cached_schedule_access.get_schedules_due_before(before=datetime.datetime.now()) == []
+
+    schedule_access.get_available_schedules.assert_called_once()
+    schedule_access.get_schedule.assert_not_called()
+    assert cached_schedule_access.metrics.misses == 1
+    assert cached_schedule_access.metrics.hits == 3
+
+
+def test_get_schedules_due_between_is_served_from_memory(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    start = schedules[0].next_rotation
+    later_schedule = dataclasses.replace(schedules[1], next_rotation=start + datetime.timedelta(hours=1))
+    schedule_access.get_available_schedules.return_value = [schedules[0], later_schedule]
+
+    assert cached_schedule_access.get_schedules_due_between(start=start, end=later_schedule.next_rotation) == [schedules[0]]
+    assert cached_schedule_access.get_schedules_due_between(start=start, end=start) == []
+    schedule_access.get_schedules_due_between.assert_not_called()
+
+
+def test_get_schedules_for_user_is_served_from_memory(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    created_schedule = dataclasses.replace(schedules[1], members=["U3"], created_by="U1")
+    other_schedule = dataclasses.replace(schedules[1], id="other", members=["U3"])
+    schedule_access.get_available_schedules.return_value = [schedules[0], created_schedule, other_schedule]
+
+    # the schedules of a user are sorted by id
+    assert cached_schedule_access.get_schedules_for_user(user_id="U1") == sorted(
+        [schedules[0], created_schedule], key=lambda s: s.id
+    )
+    assert cached_schedule_access.get_schedules_for_user(user_id="unknown") == []
+    schedule_access.get_schedules_for_user.assert_not_called()
+
+
+def test_writes_update_cache(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    new_schedule = _create_schedule(display_name="new")
+    edited_schedule = dataclasses.replace(schedules[0], display_name="updated")
+    updated_schedule = dataclasses.replace(edited_schedule, version=edited_schedule.version + 1)
+    schedule_access.update_schedule.return_value = updated_schedule
+
+    cached_schedule_access.save_schedule(schedule=new_schedule)
+    assert (
+        cached_schedule_access.update_schedule(schedule_id_to_update=edited_schedule.id, new_schedule=edited_schedule)
+        == updated_schedule
+    )
+    cached_schedule_access.delete_schedule(schedule_id=schedules[1].id)
+
+    schedule_access.save_schedule.assert_called_once_with(schedule=new_schedule)
+    schedule_access.update_schedule.assert_called_once_with(
+        schedule_id_to_update=edited_schedule.id, new_schedule=edited_schedule
+    )
+    schedule_access.delete_schedule.assert_called_once_with(schedule_id=schedules[1].id)
+    assert sorted(cached_schedule_access.get_available_schedules(), key=lambda s: s.id) == sorted(
+        [updated_schedule, new_schedule], key=lambda s: s.id
+    )
+    schedule_access.get_available_schedules.assert_called_once()
+
+
+def test_bulk_writes_update_cache(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    new_schedule = _create_schedule(display_name="new")
+    updated_schedule = dataclasses.replace(schedules[0], display_name="updated")
+
+    cached_schedule_access.bulk_save_schedules(schedules=[new_schedule])
+    cached_schedule_access.bulk_update_schedules(schedules=[updated_schedule])
+
+    schedule_access.bulk_save_schedules.assert_called_once_with(schedules=[new_schedule])
+    schedule_access.bulk_update_schedules.assert_called_once_with(schedules=[updated_schedule])
+    assert sorted(cached_schedule_access.get_available_schedules(), key=lambda s: s.id) == sorted(
+        [updated_schedule, schedules[1], new_schedule], key=lambda s: s.id
+    )
+
+
+def test_advance_rotation_updates_cache(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    next_schedule = schedules[0].next_schedule
+    schedule_access.advance_rotation.return_value = True
+
+    assert cached_schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedules[0].version,
+    )
+
+    assert cached_schedule_access.get_schedule(schedule_id=next_schedule.id) == next_schedule
+
+
+def test_failed_advance_rotation_reads_only_the_schedule_again(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    next_schedule = schedules[0].next_schedule
+    edited_schedule = dataclasses.replace(schedules[0], display_name="edited elsewhere", version=schedules[0].version + 1)
+    schedule_access.advance_rotation.return_value = False
+    schedule_access.get_schedule.return_value = edited_schedule
+
+    assert not cached_schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedules[0].version,
+    )
+
+    assert cached_schedule_access.get_schedule(schedule_id=next_schedule.id) == edited_schedule
+    schedule_access.get_schedule.assert_called_once_with(schedule_id=next_schedule.id)
+    schedule_access.get_available_schedules.assert_called_once()
+    assert cached_schedule_access.metrics.invalidations == 0
+
+
+def test_failed_advance_rotation_of_deleted_schedule_removes_it(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    schedule_access.advance_rotation.return_value = False
+    schedule_access.get_schedule.return_value = None
+
+    assert not cached_schedule_access.advance_rotation(
+        schedule_id=schedules[0].id,
+        next_rotation=schedules[0].next_schedule.next_rotation,
+        current_index=1,
+        expected_version=schedules[0].version,
+    )
+
+    assert cached_schedule_access.get_available_schedules() == schedules[1:]
+    schedule_access.get_available_schedules.assert_called_once()
+
+
+def test_advance_rotation_after_its_watched_change(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.start_watching()
+    on_changed: Callable[[Optional[Schedule]], None] = schedule_access.watch_changes.call_args.kwargs["on_changed"]
+    cached_schedule_access.get_available_schedules()
+    next_schedule = schedules[0].next_schedule
+    schedule_access.advance_rotation.return_value = True
+
+    # the change stream delivered the own write before advance_rotation returned
+    on_changed(next_schedule)
+    assert cached_schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedules[0].version,
+    )
+
+    assert cached_schedule_access.get_schedule(schedule_id=next_schedule.id) == next_schedule
+    schedule_access.get_schedule.assert_not_called()
+    assert cached_schedule_access.metrics.invalidations == 0
+
+
+def test_watched_changes_update_cache(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.start_watching()
+    on_changed: Callable[[Optional[Schedule]], None] = schedule_access.watch_changes.call_args.kwargs["on_changed"]
+    cached_schedule_access.get_available_schedules()
+
+    changed_schedule = dataclasses.replace(schedules[0], display_name="changed elsewhere")
+    on_changed(changed_schedule)
+    assert cached_schedule_access.get_schedule(schedule_id=changed_schedule.id) == changed_schedule
+
+    on_changed(None)
+    assert cached_schedule_access.get_schedule(schedule_id=changed_schedule.id) == schedules[0]
+    assert cached_schedule_access.metrics.invalidations == 1
+
+
+def test_outdated_watched_changes_are_ignored(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.start_watching()
+    on_changed: Callable[[Optional[Schedule]], None] = schedule_access.watch_changes.call_args.kwargs["on_changed"]
+    cached_schedule_access.get_available_schedules()
+    next_schedule = schedules[0].next_schedule
+    schedule_access.advance_rotation.return_value = True
+    cached_schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedules[0].version,
+    )
+
+    # e.g. the change of an edit that was overwritten by the own advance in the meantime
+    on_changed(dataclasses.replace(schedules[0], display_name="outdated"))
+
+    assert cached_schedule_access.get_schedule(schedule_id=next_schedule.id) == next_schedule
+
+
+def test_cache_is_polled_without_watchable_changes(schedule_access: mock.MagicMock) -> None:
+    schedule_access.watch_changes.return_value = False
+    cached_schedule_access = CachedScheduleAccess(
+        schedule_access=schedule_access, poll_interval=datetime.timedelta(milliseconds=50)
+    )
+
+    cached_schedule_access.start_watching()
+    while cached_schedule_access.metrics.invalidations == 0:
+        # no idle waiting
+        time.sleep(0.05)
+
+
+def test_schedules_are_iterated_and_paged_by_id(
+    cached_schedule_access: CachedScheduleAccess, schedules: List[Schedule]
+) -> None:
+    schedules_by_id = sorted(schedules, key=lambda s: s.id)
+
+    assert list(cached_schedule_access.iter_schedules()) == schedules_by_id
+    assert cached_schedule_access.get_schedules_page(after_id=None, limit=1) == schedules_by_id[:1]
+    assert cached_schedule_access.get_schedules_page(after_id=schedules_by_id[0].id, limit=5) == schedules_by_id[1:]
+
+
+def test_sorted_schedules_pages_are_served_from_memory(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    first_page = cached_schedule_access.get_sorted_schedules_page(sort_order=ScheduleSortOrder.DISPLAY_NAME, limit=1)
+    second_page = cached_schedule_access.get_sorted_schedules_page(
+        sort_order=ScheduleSortOrder.DISPLAY_NAME,
+        limit=1,
+        cursor=SchedulePageCursor.after(schedule=first_page[0], sort_order=ScheduleSortOrder.DISPLAY_NAME),
+    )
+
+    assert first_page + second_page == schedules
+    schedule_access.get_available_schedules.assert_called_once()
+    schedule_access.get_sorted_schedules_page.assert_not_called()
+
+
+def test_advance_rotation_of_outdated_cached_schedule_reads_it_again(
+    cached_schedule_access: CachedScheduleAccess, schedule_access: mock.MagicMock, schedules: List[Schedule]
+) -> None:
+    cached_schedule_access.get_available_schedules()
+    next_schedule = schedules[0].next_schedule
+    schedule_access.advance_rotation.return_value = True
+
+    schedule_access.get_schedule.return_value = dataclasses.replace(next_schedule, version=next_schedule.version + 1)
+
+    # the stored schedule was changed by another process, the cached one has an older version
+    assert cached_schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedules[0].version + 1,
+    )
+
+    schedule_access.get_schedule.assert_called_once_with(schedule_id=next_schedule.id)
+    cached_schedule_access.get_available_schedules()
+    schedule_access.get_available_schedules.assert_called_once()
@@ -0,0 +1,120 @@
+import dataclasses
+import datetime
+import os
+import time
+import uuid
+from typing import List
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.model.schedule import Schedule
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path: str) -> str:
+    return os.path.join(tmp_path, "schedules.json")
+
+
+@pytest.fixture()
+def schedules() -> List[Schedule]:
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Rotation Schedule {i}",
+            members=["U1", f"U{i + 2}"],
+            next_rotation=datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(minutes=i),
+            time_between_rotations=datetime.timedelta(hours=2),
+            channel_id_to_notify_in="C1",
+            created_by="creator",
+        )
+        for i in range(3)
+    ]
+
+
+def test_schedules_are_restored_from_snapshot(snapshot_path: str, schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess(snapshot_path=snapshot_path)
+    in_memory_schedule_access.bulk_save_schedules(schedules=schedules)
+
+    in_memory_schedule_access.snapshot()
+    restored_schedule_access = InMemoryScheduleAccess(snapshot_path=snapshot_path)
+
+    assert restored_schedule_access.get_available_schedules() == schedules
+    assert restored_schedule_access.get_schedules_due_before(before=schedules[1].next_rotation) == schedules[:1]
+    assert restored_schedule_access.get_schedules_for_user(user_id="U3") == schedules[1:2]
+
+
+def test_unchanged_schedules_are_not_written_again(snapshot_path: str, schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess(snapshot_path=snapshot_path)
+    in_memory_schedule_access.bulk_save_schedules(schedules=schedules)
+    in_memory_schedule_access.snapshot()
+
+    with mock.patch("sched_slack_bot.data.in_memory_schedule_access.os.replace") as mocked_replace:
+        in_memory_schedule_access.snapshot()
+
+    mocked_replace.assert_not_called()
+
+
+def test_failed_snapshot_is_written_again(snapshot_path: str, schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess(snapshot_path=snapshot_path)
+    in_memory_schedule_access.bulk_save_schedules(schedules=schedules)
+
+    with (
+        mock.patch("sched_slack_bot.data.in_memory_schedule_access.os.replace", side_effect=OSError("disk full")),
+        pytest.raises(OSError),
+    ):
+        in_memory_schedule_access.snapshot()
+    in_memory_schedule_access.snapshot()
+
+    assert InMemoryScheduleAccess(snapshot_path=snapshot_path).get_available_schedules() == schedules
+
+
+def test_snapshot_without_path_does_nothing(schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess()
+    in_memory_schedule_access.bulk_save_schedules(schedules=schedules)
+
+    with mock.patch("sched_slack_bot.data.in_memory_schedule_access.os.replace") as mocked_replace:
+        in_memory_schedule_access.snapshot()
+        in_memory_schedule_access.start_snapshots()
+
+    mocked_replace.assert_not_called()
+
+
+def test_snapshots_are_written_periodically(snapshot_path: str, schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess(
+        snapshot_path=snapshot_path, snapshot_interval=datetime.timedelta(milliseconds=10)
+    )
+    in_memory_schedule_access.start_snapshots()
+    in_memory_schedule_access.save_schedule(schedule=schedules[0])
+
+    while not os.path.exists(snapshot_path):
+        # no idle waiting
+        time.sleep(0.01)
+
+    assert InMemoryScheduleAccess(snapshot_path=snapshot_path).get_available_schedules() == schedules[:1]
+
+
+def test_indexes_follow_updates(schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess()
+    in_memory_schedule_access.bulk_save_schedules(schedules=schedules)
+    edited_schedule = dataclasses.replace(
+        schedules[0], members=["U9"], next_rotation=schedules[2].next_rotation + datetime.timedelta(minutes=1)
+    )
+
+    moved_schedule = in_memory_schedule_access.update_schedule(
+        schedule_id_to_update=edited_schedule.id, new_schedule=edited_schedule
+    )
+    assert moved_schedule is not None
+
+    assert in_memory_schedule_access.get_schedules_for_user(user_id="U9") == [moved_schedule]
+    assert moved_schedule not in in_memory_schedule_access.get_schedules_for_user(user_id="U1")
+    assert in_memory_schedule_access.get_schedules_due_before(before=moved_schedule.next_rotation) == schedules[1:]
+
+
+def test_saving_an_existing_schedule_raises(schedules: List[Schedule]) -> None:
+    in_memory_schedule_access = InMemoryScheduleAccess()
+    in_memory_schedule_access.save_schedule(schedule=schedules[0])
+
+    with pytest.raises(ValueError):
+        in_memory_schedule_access.save_schedule(schedule=schedules[0])
@@ -0,0 +1,295 @@
+import dataclasses
+import datetime
+import os
+import uuid
+from typing import Generator, List
+
+import pytest
+
+from sched_slack_bot.data.cached_schedule_access import CachedScheduleAccess
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.data.mongo.mongo_schedule_access import MongoScheduleAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.data.sqlite.sqlite_schedule_access import SqliteScheduleAccess
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+
+# the contract also runs against a real mongo database if its url is set, e.g. mongodb://localhost:27017
+MONGO_TEST_URL = os.environ.get("MONGO_TEST_URL")
+
+NOW = datetime.datetime.now().replace(microsecond=0)
+
+
+def _create_schedule(schedule_id: str, members: List[str], next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=schedule_id,
+        display_name=f"Rotation Schedule {schedule_id}",
+        members=members,
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture()
+def schedules() -> List[Schedule]:
+    return [
+        _create_schedule(schedule_id="a", members=["U1", "U2"], next_rotation=NOW + datetime.timedelta(hours=1)),
+        _create_schedule(schedule_id="b", members=["U2", "U3"], next_rotation=NOW + datetime.timedelta(hours=2)),
+        _create_schedule(schedule_id="c", members=["U3"], next_rotation=NOW + datetime.timedelta(hours=3)),
+    ]
+
+
+@pytest.fixture(params=["in_memory", "sqlite", "cached_sqlite", "mongo"])
+def schedule_access(request: pytest.FixtureRequest, tmp_path: str) -> Generator[ScheduleAccess, None, None]:
+    if request.param == "mongo":
+        if MONGO_TEST_URL is None:
+            pytest.skip("MONGO_TEST_URL is not set")
+
+        mongo_schedule_access = MongoScheduleAccess(
+            mongo_url=MONGO_TEST_URL, db_name="sched-slack-bot-test", collection_name=f"schedules-{uuid.uuid4()}"
+        )
+        mongo_schedule_access.ensure_indexes()
+        yield mongo_schedule_access
+        mongo_schedule_access._collection.drop()
+        return
+
+    if request.param == "in_memory":
+        yield InMemoryScheduleAccess()
+        return
+
+    sqlite_schedule_access = SqliteScheduleAccess(database_path=os.path.join(tmp_path, "schedules.sqlite3"))
+    if request.param == "cached_sqlite":
+        yield CachedScheduleAccess(schedule_access=sqlite_schedule_access)
+    else:
+        yield sqlite_schedule_access
+    sqlite_schedule_access.close()
+
+
+@pytest.fixture()
+def saved_schedules(schedule_access: ScheduleAccess, schedules: List[Schedule]) -> List[Schedule]:
+    for schedule in schedules:
+        schedule_access.save_schedule(schedule=schedule)
+
+    return schedules
+
+
+def _by_id(schedules: List[Schedule]) -> List[Schedule]:
+    return sorted(schedules, key=lambda s: s.id)
+
+
+def test_get_schedule(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    assert schedule_access.get_schedule(schedule_id="b") == saved_schedules[1]
+    assert schedule_access.get_schedule(schedule_id="unknown") is None
+
+
+def test_get_available_schedules(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    assert _by_id(schedule_access.get_available_schedules()) == saved_schedules
+
+
+def test_get_schedules_for_user(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    created_schedule = schedule_access.update_schedule(
+        schedule_id_to_update=saved_schedules[2].id, new_schedule=dataclasses.replace(saved_schedules[2], created_by="U1")
+    )
+
+    assert _by_id(schedule_access.get_schedules_for_user(user_id="U1")) == [saved_schedules[0], created_schedule]
+    assert _by_id(schedule_access.get_schedules_for_user(user_id="U2")) == saved_schedules[:2]
+    assert schedule_access.get_schedules_for_user(user_id="unknown") == []
+
+
+def test_iter_schedules(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    assert list(schedule_access.iter_schedules(batch_size=2)) == saved_schedules
+
+
+def test_get_schedules_page(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    assert schedule_access.get_schedules_page(after_id=None, limit=2) == saved_schedules[:2]
+    assert schedule_access.get_schedules_page(after_id="b", limit=2) == saved_schedules[2:]
+    assert schedule_access.get_schedules_page(after_id="c", limit=2) == []
+
+
+@pytest.fixture()
+def sortable_schedules(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> List[Schedule]:
+    # names sort differently than rotations, some names and rotations are equal and only ordered by id
+    schedules = [
+        dataclasses.replace(saved_schedules[0], display_name="Zeta"),
+        dataclasses.replace(saved_schedules[1], display_name="Alpha"),
+        dataclasses.replace(saved_schedules[2], display_name="Alpha"),
+        _create_schedule(schedule_id="d", members=["U1"], next_rotation=saved_schedules[0].next_rotation),
+    ]
+    schedules[3] = dataclasses.replace(schedules[3], display_name="Mid")
+    schedule_access.bulk_update_schedules(schedules=schedules[:3])
+    schedule_access.save_schedule(schedule=schedules[3])
+
+    return schedules
+
+
+@pytest.mark.parametrize(
+    "sort_order, expected_ids",
+    [(ScheduleSortOrder.NEXT_ROTATION, ["a", "d", "b", "c"]), (ScheduleSortOrder.DISPLAY_NAME, ["b", "c", "d", "a"])],
+)
+def test_get_sorted_schedules_page(
+    schedule_access: ScheduleAccess, sortable_schedules: List[Schedule], sort_order: ScheduleSortOrder, expected_ids: List[str]
+) -> None:
+    schedules_by_id = {s.id: s for s in sortable_schedules}
+    expected_schedules = [schedules_by_id[i] for i in expected_ids]
+
+    first_page = schedule_access.get_sorted_schedules_page(sort_order=sort_order, limit=2)
+    assert first_page == expected_schedules[:2]
+
+    next_cursor = SchedulePageCursor.after(schedule=first_page[-1], sort_order=sort_order)
+    second_page = schedule_access.get_sorted_schedules_page(sort_order=sort_order, limit=2, cursor=next_cursor)
+    assert second_page == expected_schedules[2:]
+
+    last_cursor = SchedulePageCursor.after(schedule=second_page[-1], sort_order=sort_order)
+    assert schedule_access.get_sorted_schedules_page(sort_order=sort_order, limit=2, cursor=last_cursor) == []
+
+    # pages read backwards are in ascending order as well
+    previous_cursor = SchedulePageCursor.before(schedule=second_page[1], sort_order=sort_order)
+    assert (
+        schedule_access.get_sorted_schedules_page(sort_order=sort_order, limit=2, cursor=previous_cursor)
+        == expected_schedules[1:3]
+    )
+    first_cursor = SchedulePageCursor.before(schedule=first_page[0], sort_order=sort_order)
+    assert schedule_access.get_sorted_schedules_page(sort_order=sort_order, limit=2, cursor=first_cursor) == []
+
+
+def test_get_sorted_schedules_page_of_user(schedule_access: ScheduleAccess, sortable_schedules: List[Schedule]) -> None:
+    assert schedule_access.get_sorted_schedules_page(sort_order=ScheduleSortOrder.DISPLAY_NAME, limit=5, user_id="U1") == [
+        sortable_schedules[3],
+        sortable_schedules[0],
+    ]
+
+    cursor = SchedulePageCursor.after(schedule=sortable_schedules[1], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+    assert schedule_access.get_sorted_schedules_page(
+        sort_order=ScheduleSortOrder.NEXT_ROTATION, limit=5, cursor=cursor, user_id="U3"
+    ) == [sortable_schedules[2]]
+    assert (
+        schedule_access.get_sorted_schedules_page(sort_order=ScheduleSortOrder.NEXT_ROTATION, limit=5, user_id="unknown") == []
+    )
+
+
+def test_get_schedules_due(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    assert _by_id(schedule_access.get_schedules_due_before(before=saved_schedules[2].next_rotation)) == saved_schedules[:2]
+    assert schedule_access.get_schedules_due_between(
+        start=saved_schedules[1].next_rotation, end=saved_schedules[2].next_rotation
+    ) == [saved_schedules[1]]
+
+
+def test_update_schedule(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    edited_schedule = dataclasses.replace(saved_schedules[0], display_name="updated", members=["U4"])
+
+    updated_schedule = schedule_access.update_schedule(schedule_id_to_update=edited_schedule.id, new_schedule=edited_schedule)
+
+    assert updated_schedule == dataclasses.replace(edited_schedule, version=saved_schedules[0].version + 1)
+    assert schedule_access.get_schedule(schedule_id=edited_schedule.id) == updated_schedule
+    assert schedule_access.get_schedules_for_user(user_id="U1") == []
+
+
+def test_update_unknown_schedule(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    unknown_schedule = dataclasses.replace(saved_schedules[0], id="unknown")
+
+    assert schedule_access.update_schedule(schedule_id_to_update="unknown", new_schedule=unknown_schedule) is None
+    assert schedule_access.get_schedule(schedule_id="unknown") is None
+
+
+def test_update_schedule_rejects_stale_advance_rotation(
+    schedule_access: ScheduleAccess, saved_schedules: List[Schedule]
+) -> None:
+    next_schedule = saved_schedules[0].next_schedule
+    assert schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=saved_schedules[0].version,
+    )
+    # edits are submitted without a version, the stored one keeps counting up
+    edited_schedule = dataclasses.replace(next_schedule, display_name="edited", version=0)
+    updated_schedule = schedule_access.update_schedule(schedule_id_to_update=edited_schedule.id, new_schedule=edited_schedule)
+    assert updated_schedule is not None
+    assert updated_schedule.version == next_schedule.version + 1
+
+    # reminders and skips which read the schedule before the edit cannot overwrite it
+    for stale_version in (0, next_schedule.version):
+        assert not schedule_access.advance_rotation(
+            schedule_id=edited_schedule.id,
+            next_rotation=next_schedule.next_schedule.next_rotation,
+            current_index=next_schedule.next_schedule.current_index,
+            expected_version=stale_version,
+        )
+    assert schedule_access.get_schedule(schedule_id=edited_schedule.id) == updated_schedule
+
+
+def test_migrate_created_by(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    schedule_access.update_schedule(
+        schedule_id_to_update="c", new_schedule=dataclasses.replace(saved_schedules[2], created_by="other")
+    )
+
+    assert schedule_access.migrate_created_by(user_name="creator", user_id="U9") == 2
+    assert schedule_access.migrate_created_by(user_name="creator", user_id="U9") == 0
+
+    # the versions stay the same, so reminders executed in the meantime are not rejected
+    assert _by_id(schedule_access.get_schedules_for_user(user_id="U9")) == [
+        dataclasses.replace(s, created_by="U9") for s in saved_schedules[:2]
+    ]
+    assert schedule_access.get_schedules_for_user(user_id="creator") == []
+
+
+def test_advance_rotation(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    next_schedule = saved_schedules[0].next_schedule
+
+    assert schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=saved_schedules[0].version,
+    )
+    # the rotation was already advanced with this version
+    assert not schedule_access.advance_rotation(
+        schedule_id=next_schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=saved_schedules[0].version,
+    )
+    assert schedule_access.get_schedule(schedule_id=next_schedule.id) == next_schedule
+
+
+def test_bulk_save_schedules(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    updated_schedule = dataclasses.replace(saved_schedules[0], display_name="updated")
+    new_schedule = _create_schedule(schedule_id="d", members=["U1"], next_rotation=NOW)
+
+    schedule_access.bulk_save_schedules(schedules=[updated_schedule, new_schedule])
+
+    assert _by_id(schedule_access.get_available_schedules()) == [updated_schedule, *saved_schedules[1:], new_schedule]
+    assert _by_id(schedule_access.get_schedules_for_user(user_id="U1")) == [updated_schedule, new_schedule]
+
+
+def test_bulk_update_schedules(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    updated_schedules = [dataclasses.replace(s, next_rotation=NOW) for s in saved_schedules[:2]]
+    unknown_schedule = _create_schedule(schedule_id="unknown", members=["U1"], next_rotation=NOW)
+
+    schedule_access.bulk_update_schedules(schedules=[*updated_schedules, unknown_schedule])
+
+    assert _by_id(schedule_access.get_available_schedules()) == [*updated_schedules, saved_schedules[2]]
+
+
+def test_bulk_update_schedules_keeps_schedules_changed_in_the_meantime(
+    schedule_access: ScheduleAccess, saved_schedules: List[Schedule]
+) -> None:
+    fixed_schedules = [dataclasses.replace(s, next_rotation=NOW) for s in saved_schedules[:2]]
+    assert schedule_access.advance_rotation(
+        schedule_id="a", next_rotation=NOW + datetime.timedelta(days=1), current_index=1, expected_version=0
+    )
+    advanced_schedule = schedule_access.get_schedule(schedule_id="a")
+
+    schedule_access.bulk_update_schedules(schedules=fixed_schedules)
+
+    assert _by_id(schedule_access.get_available_schedules()) == [advanced_schedule, fixed_schedules[1], saved_schedules[2]]
+
+
+def test_delete_schedule(schedule_access: ScheduleAccess, saved_schedules: List[Schedule]) -> None:
+    schedule_access.delete_schedule(schedule_id="a")
+
+    assert schedule_access.get_schedule(schedule_id="a") is None
+    assert schedule_access.get_schedules_for_user(user_id="U1") == []
+    assert _by_id(schedule_access.get_available_schedules()) == saved_schedules[1:]
@@ -0,0 +1,33 @@
+import datetime
+
+import pytest
+
+from sched_slack_bot.model.app_home_state import AppHomeState
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.utils.slack_typing_stubs import SlackView
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        AppHomeState(),
+        AppHomeState(show_all_schedules=True, sort_order=ScheduleSortOrder.DISPLAY_NAME),
+        AppHomeState(
+            cursor=SchedulePageCursor(
+                sort_order=ScheduleSortOrder.NEXT_ROTATION,
+                sort_value=datetime.datetime(year=2022, month=1, day=1, hour=10),
+                schedule_id="id",
+                backwards=True,
+            )
+        ),
+    ],
+)
+def test_app_home_state_round_trips_through_the_view(state: AppHomeState) -> None:
+    assert AppHomeState.from_view(view=SlackView(private_metadata=state.as_private_metadata())) == state
+
+
+@pytest.mark.parametrize(
+    "view", [None, SlackView(id="modal"), SlackView(private_metadata="{"), SlackView(private_metadata="{}")]
+)
+def test_app_home_state_falls_back_to_default(view: SlackView) -> None:
+    assert AppHomeState.from_view(view=view) == AppHomeState()
@@ -44,3 +44,6 @@ class TestReminder:
 
     def test_next_user_is_correct(self, reminder: Reminder, schedule: Schedule) -> None:
         assert reminder.next_rotation_user == schedule.members[schedule.next_index]
+
+    def test_reminder_has_no_instance_dict(self, reminder: Reminder) -> None:
+        assert not hasattr(reminder, "__dict__")
@@ -6,7 +6,8 @@ from typing import Dict
 
 import pytest
 
-from sched_slack_bot.model.schedule import Schedule, SERIALIZATION_DATE_FORMAT
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import SERIALIZATION_DATE_FORMAT, decode_schedule
 from sched_slack_bot.utils.find_block_value import SlackValueContainerType
 from sched_slack_bot.utils.slack_typing_stubs import SlackState, SlackView, SlackBody, SlackBodyUser, SlackInputBlockState
 from sched_slack_bot.views.schedule_dialog_block_ids import (
@@ -100,7 +101,7 @@ def valid_slack_body(minimum_slack_body: SlackBody, schedule: Schedule) -> Slack
     valid_slack_body["view"]["state"]["values"][USERS_INPUT_BLOCK_ID] = {
         "subBlock": SlackInputBlockState(
             **{
-                SlackValueContainerType.multi_users_select.value: schedule.members,
+                SlackValueContainerType.multi_users_select.value: list(schedule.members),
                 "type": SlackValueContainerType.multi_users_select.name,
             }
         )
@@ -132,6 +133,19 @@ def valid_slack_body(minimum_slack_body: SlackBody, schedule: Schedule) -> Slack
     return valid_slack_body
 
 
+def test_schedule_stores_members_as_interned_tuple(schedule: Schedule) -> None:
+    # built at runtime, so the strings are not interned by the compiler
+    members = ["".join(["U", "1"]), "".join(["U", "2"])]
+
+    schedule_with_new_members = dataclasses.replace(schedule, members=members)
+
+    assert schedule_with_new_members.members == ("U1", "U2")
+    assert schedule_with_new_members.members[0] is schedule.members[0]
+    # rotations share the members of the previous schedule
+    assert schedule_with_new_members.next_schedule.members is schedule_with_new_members.members
+    assert not hasattr(schedule, "__dict__")
+
+
 def test_schedule_has_correct_next_next_date(schedule: Schedule) -> None:
     assert schedule.next_next_rotation_date == schedule.next_rotation + schedule.time_between_rotations
 
@@ -161,19 +175,38 @@ def test_schedule_to_json_is_correct(schedule: Schedule) -> None:
     assert schedule.as_json() == {
         "id": schedule.id,
         "display_name": schedule.display_name,
-        "members": schedule.members,
-        "next_rotation": schedule.next_rotation.strftime(SERIALIZATION_DATE_FORMAT),
+        "members": list(schedule.members),
+        "next_rotation": schedule.next_rotation.replace(microsecond=0),
         "time_between_rotations": schedule.time_between_rotations.total_seconds(),
         "channel_id_to_notify_in": schedule.channel_id_to_notify_in,
         "created_by": schedule.created_by,
         "current_index": schedule.current_index,
+        "version": schedule.version,
     }
 
 
 def test_schedule_can_be_deserialized(schedule: Schedule) -> None:
     json_schedule = schedule.as_json()
 
-    assert Schedule.from_json(json=json_schedule) == schedule
+    assert decode_schedule(document=json_schedule) == schedule
+
+
+def test_schedule_with_string_date_can_be_deserialized(schedule: Schedule) -> None:
+    json_schedule = schedule.as_json()
+    json_schedule["next_rotation"] = schedule.next_rotation.strftime(SERIALIZATION_DATE_FORMAT)
+
+    assert decode_schedule(document=json_schedule) == schedule
+
+
+def test_schedule_without_version_can_be_deserialized(schedule: Schedule) -> None:
+    json_schedule = schedule.as_json()
+    del json_schedule["version"]
+
+    assert decode_schedule(document=json_schedule) == schedule
+
+
+def test_next_schedule_increments_version(schedule: Schedule) -> None:
+    assert schedule.next_schedule.version == schedule.version + 1
 
 
 def test_schedule_without_time_between_rotations_raises() -> None:
@@ -241,6 +274,7 @@ def test_schedule_from_modal_submission_works_for_edit(schedule: Schedule, valid
     assert from_modal.channel_id_to_notify_in == schedule.channel_id_to_notify_in
     assert from_modal.next_rotation == schedule.next_rotation
     assert from_modal.current_index == schedule.current_index
+    assert from_modal.created_by == valid_slack_body["user"]["id"]
     assert from_modal.time_between_rotations == schedule.time_between_rotations
     assert from_modal.id == schedule.id
 
@@ -0,0 +1,95 @@
+import datetime
+import uuid
+from typing import Any, Dict
+
+import pytest
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_codec import (
+    SERIALIZATION_DATE_FORMAT,
+    ScheduleDecodeError,
+    format_date,
+    parse_date,
+    decode_schedule,
+    decode_schedules,
+)
+
+
+@pytest.fixture()
+def document() -> Dict[str, Any]:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=datetime.datetime(year=2022, month=3, day=4, hour=5, minute=6, second=7),
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    ).as_json()
+
+
+@pytest.mark.parametrize(
+    "date",
+    [
+        datetime.datetime(year=2022, month=3, day=4, hour=5, minute=6, second=7),
+        datetime.datetime(year=2022, month=12, day=31, hour=23, minute=59, second=59, microsecond=999999),
+        datetime.datetime(year=2022, month=1, day=1, tzinfo=datetime.timezone.utc),
+    ],
+)
+def test_dates_are_formatted_and_parsed_like_strftime_and_strptime(date: datetime.datetime) -> None:
+    formatted_date = format_date(date=date)
+
+    assert formatted_date == date.strftime(SERIALIZATION_DATE_FORMAT)
+    assert parse_date(value=formatted_date) == datetime.datetime.strptime(formatted_date, SERIALIZATION_DATE_FORMAT)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2022-03-04 05:06:07.000Z", "2022-03-04T05:06:07.123Z", "2022-03-04T05:06:07", "2022-13-04T05:06:07.000Z", ""],
+)
+def test_invalid_dates_are_rejected(value: str) -> None:
+    with pytest.raises(ScheduleDecodeError):
+        parse_date(value=value)
+
+
+def test_schedule_is_decoded(document: Dict[str, Any]) -> None:
+    assert decode_schedule(document=document).as_json() == document
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("id", None),
+        ("display_name", 1),
+        ("members", "U1"),
+        ("members", ["U1", 2]),
+        ("next_rotation", 1),
+        ("next_rotation", "yesterday"),
+        ("time_between_rotations", "2h"),
+        ("time_between_rotations", True),
+        ("current_index", 2),
+        ("current_index", "0"),
+        ("version", 1.5),
+    ],
+)
+def test_invalid_fields_are_rejected(document: Dict[str, Any], field: str, value: Any) -> None:
+    document[field] = value
+
+    with pytest.raises(ScheduleDecodeError):
+        decode_schedule(document=document)
+
+
+def test_missing_fields_are_rejected(document: Dict[str, Any]) -> None:
+    del document["created_by"]
+
+    with pytest.raises(ScheduleDecodeError):
+        decode_schedule(document=document)
+
+
+def test_documents_of_a_page_share_decoded_values(document: Dict[str, Any]) -> None:
+    other_document = {**document, "id": str(uuid.uuid4())}
+
+    schedules = decode_schedules(documents=[document, other_document])
+
+    assert [s.id for s in schedules] == [document["id"], other_document["id"]]
+    assert schedules[0].time_between_rotations is schedules[1].time_between_rotations
@@ -0,0 +1,94 @@
+import datetime
+import json
+from typing import List
+
+import pytest
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import (
+    ScheduleSortOrder,
+    SchedulePageCursor,
+    get_schedule_page,
+    get_sorted_page,
+)
+
+
+@pytest.fixture
+def schedules() -> List[Schedule]:
+    next_rotation = datetime.datetime(year=2022, month=1, day=1, hour=10, microsecond=123)
+    return [
+        Schedule(
+            id=f"id{i}",
+            display_name=f"Rotation Schedule {i}",
+            members=["U1", "U2"],
+            next_rotation=next_rotation + datetime.timedelta(hours=i),
+            time_between_rotations=datetime.timedelta(hours=2),
+            channel_id_to_notify_in="C1",
+            created_by="creator",
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize("sort_order", list(ScheduleSortOrder))
+def test_cursor_json_roundtrip(schedules: List[Schedule], sort_order: ScheduleSortOrder) -> None:
+    cursor = SchedulePageCursor.before(schedule=schedules[0], sort_order=sort_order)
+
+    assert SchedulePageCursor.from_json(cursor_json=json.loads(json.dumps(cursor.as_json()))) == cursor
+
+
+def test_get_sorted_page(schedules: List[Schedule]) -> None:
+    keys = [(s.next_rotation, s.id) for s in schedules]
+    after = SchedulePageCursor.after(schedule=schedules[1], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+    before = SchedulePageCursor.before(schedule=schedules[3], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+
+    assert get_sorted_page(sorted_keys=keys, limit=2, cursor=None) == keys[:2]
+    assert get_sorted_page(sorted_keys=keys, limit=2, cursor=after) == keys[2:4]
+    assert get_sorted_page(sorted_keys=keys, limit=2, cursor=before) == keys[1:3]
+    assert get_sorted_page(sorted_keys=keys, limit=5, cursor=before) == keys[:3]
+
+
+def test_first_page(schedules: List[Schedule]) -> None:
+    page = get_schedule_page(schedules=schedules, page_size=4, sort_order=ScheduleSortOrder.NEXT_ROTATION, cursor=None)
+
+    assert page.schedules == schedules[:4]
+    assert page.previous_page_cursor is None
+    assert page.next_page_cursor == SchedulePageCursor.after(schedule=schedules[3], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+
+
+def test_last_page(schedules: List[Schedule]) -> None:
+    cursor = SchedulePageCursor.after(schedule=schedules[0], sort_order=ScheduleSortOrder.DISPLAY_NAME)
+
+    page = get_schedule_page(schedules=schedules[1:], page_size=4, sort_order=ScheduleSortOrder.DISPLAY_NAME, cursor=cursor)
+
+    assert page.schedules == schedules[1:]
+    assert page.previous_page_cursor == SchedulePageCursor.before(
+        schedule=schedules[1], sort_order=ScheduleSortOrder.DISPLAY_NAME
+    )
+    assert page.next_page_cursor is None
+
+
+def test_page_read_backwards(schedules: List[Schedule]) -> None:
+    cursor = SchedulePageCursor.before(schedule=schedules[4], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+
+    middle_page = get_schedule_page(
+        schedules=schedules[:4], page_size=3, sort_order=ScheduleSortOrder.NEXT_ROTATION, cursor=cursor
+    )
+    assert middle_page.schedules == schedules[1:4]
+    assert middle_page.previous_page_cursor is not None
+    assert middle_page.next_page_cursor is not None
+
+    first_page = get_schedule_page(
+        schedules=schedules[:2], page_size=3, sort_order=ScheduleSortOrder.NEXT_ROTATION, cursor=cursor
+    )
+    assert first_page.schedules == schedules[:2]
+    assert first_page.previous_page_cursor is None
+    assert first_page.next_page_cursor is not None
+
+
+def test_empty_page() -> None:
+    page = get_schedule_page(schedules=[], page_size=3, sort_order=ScheduleSortOrder.NEXT_ROTATION, cursor=None)
+
+    assert page.schedules == []
+    assert page.previous_page_cursor is None
+    assert page.next_page_cursor is None
@@ -0,0 +1,145 @@
+import asyncio
+import datetime
+import threading
+import uuid
+from typing import List
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.async_scheduler import AsyncReminderScheduler
+from sched_slack_bot.reminder.sender import AsyncReminderSender
+
+
+def _create_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture
+def schedule() -> Schedule:
+    return _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(milliseconds=100))
+
+
+@pytest.fixture()
+def reminder_sender() -> mock.AsyncMock:
+    return mock.AsyncMock(spec=AsyncReminderSender)
+
+
+async def _wait_for_reminders(reminder_sender: mock.AsyncMock, count: int) -> None:
+    while reminder_sender.send_reminder.await_count < count:
+        # no idle waiting
+        await asyncio.sleep(0.05)
+
+
+def test_schedule_reminder_runs_on_loop(schedule: Schedule, reminder_sender: mock.AsyncMock) -> None:
+    callback = mock.MagicMock()
+
+    async def run() -> AsyncReminderScheduler:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop(), reminder_executed_callback=callback)
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+        await _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+
+        return scheduler
+
+    thread_count_before = threading.active_count()
+    scheduler = asyncio.run(run())
+
+    reminder_sender.send_reminder.assert_awaited_once_with(reminder=Reminder(schedule=schedule))
+    callback.assert_called_once_with(schedule.next_schedule)
+    # the next rotation got armed again
+    assert scheduler.pending_reminder_count == 1
+    assert threading.active_count() == thread_count_before
+
+
+def test_async_callback_is_awaited(schedule: Schedule, reminder_sender: mock.AsyncMock) -> None:
+    callback = mock.AsyncMock()
+
+    async def run() -> None:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop(), reminder_executed_callback=callback)
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+        await _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    callback.assert_awaited_once_with(schedule.next_schedule)
+
+
+def test_remove_reminder(schedule: Schedule, reminder_sender: mock.AsyncMock) -> None:
+    async def run() -> AsyncReminderScheduler:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop())
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+        scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+        await asyncio.sleep(0.2)
+
+        return scheduler
+
+    scheduler = asyncio.run(run())
+
+    reminder_sender.send_reminder.assert_not_awaited()
+    assert scheduler.pending_reminder_count == 0
+
+
+def test_has_reminder_for_schedule(schedule: Schedule, reminder_sender: mock.AsyncMock) -> None:
+    async def run() -> None:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop())
+        assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+        assert scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+        scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+        assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    asyncio.run(run())
+
+
+def test_remove_unknown_reminder_does_nothing() -> None:
+    async def run() -> None:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop())
+        scheduler.remove_reminder_for_schedule(schedule_id="unknown")
+
+    asyncio.run(run())
+
+
+def test_reminders_can_be_scheduled_from_other_threads(reminder_sender: mock.AsyncMock) -> None:
+    now = datetime.datetime.now()
+    schedules = [_create_schedule(next_rotation=now + datetime.timedelta(milliseconds=100)) for _ in range(3)]
+
+    async def run() -> None:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop())
+        await asyncio.to_thread(scheduler.schedule_all_reminders, schedules=schedules, reminder_sender=reminder_sender)
+        await _wait_for_reminders(reminder_sender=reminder_sender, count=3)
+
+    asyncio.run(run())
+
+    sent_reminders: List[Reminder] = [c.kwargs["reminder"] for c in reminder_sender.send_reminder.await_args_list]
+    assert sorted(r.schedule_id for r in sent_reminders) == sorted(s.id for s in schedules)
+
+
+def test_failing_reminder_is_logged(schedule: Schedule, reminder_sender: mock.AsyncMock) -> None:
+    reminder_sender.send_reminder.side_effect = RuntimeError("slack is down")
+
+    async def run() -> AsyncReminderScheduler:
+        scheduler = AsyncReminderScheduler(loop=asyncio.get_running_loop())
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+        await _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+        await asyncio.sleep(0.05)
+
+        return scheduler
+
+    with mock.patch("sched_slack_bot.reminder.async_scheduler.logger") as mocked_logger:
+        scheduler = asyncio.run(run())
+
+    mocked_logger.error.assert_called_once()
+    assert scheduler.pending_reminder_count == 0
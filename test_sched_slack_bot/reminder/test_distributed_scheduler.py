@@ -0,0 +1,206 @@
+import dataclasses
+import datetime
+import time
+import uuid
+from typing import Optional, List, Union
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.reminder_job_access import ReminderJobAccess
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.distributed_scheduler import DistributedReminderScheduler, DEFAULT_LEASE
+from sched_slack_bot.reminder.sender import ReminderSender
+
+
+@pytest.fixture
+def schedule() -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=datetime.datetime.now() + datetime.timedelta(milliseconds=100),
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture()
+def reminder_sender() -> mock.MagicMock:
+    return mock.MagicMock(spec=ReminderSender)
+
+
+@pytest.fixture()
+def job_access() -> mock.MagicMock:
+    job_access = mock.MagicMock(spec=ReminderJobAccess)
+    job_access.claim_due_job.return_value = None
+    job_access.renew_lease.return_value = True
+
+    return job_access
+
+
+@pytest.fixture()
+def callback() -> mock.MagicMock:
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def scheduler(job_access: mock.MagicMock, callback: mock.MagicMock) -> DistributedReminderScheduler:
+    return DistributedReminderScheduler(
+        reminder_job_access=job_access,
+        owner="owner",
+        poll_interval=datetime.timedelta(milliseconds=50),
+        reminder_executed_callback=callback,
+    )
+
+
+def test_schedule_reminder_saves_job(
+    scheduler: DistributedReminderScheduler, job_access: mock.MagicMock, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    job_access.save_job.assert_called_once_with(schedule=schedule)
+
+
+def test_schedule_all_reminders_only_adds_missing_jobs(
+    scheduler: DistributedReminderScheduler, job_access: mock.MagicMock, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    scheduler.schedule_all_reminders(schedules=[schedule], reminder_sender=reminder_sender)
+
+    job_access.add_missing_jobs.assert_called_once_with(schedules=[schedule])
+    job_access.save_job.assert_not_called()
+
+
+def test_remove_and_has_reminder_use_jobs(scheduler: DistributedReminderScheduler, job_access: mock.MagicMock) -> None:
+    job_access.has_job.return_value = True
+
+    assert scheduler.has_reminder_for_schedule(schedule_id="some_id")
+    scheduler.remove_reminder_for_schedule(schedule_id="some_id")
+
+    job_access.has_job.assert_called_once_with(schedule_id="some_id")
+    job_access.delete_job.assert_called_once_with(schedule_id="some_id")
+
+
+def test_claimed_jobs_are_executed_and_completed(
+    scheduler: DistributedReminderScheduler,
+    job_access: mock.MagicMock,
+    schedule: Schedule,
+    reminder_sender: mock.MagicMock,
+    callback: mock.MagicMock,
+) -> None:
+    job_access.claim_due_job.side_effect = [schedule, None]
+    job_access.complete_job.return_value = True
+
+    assert scheduler._run_due_jobs(reminder_sender=reminder_sender) == 1
+
+    assert job_access.claim_due_job.call_args.kwargs["owner"] == "owner"
+    reminder_sender.send_reminder.assert_called_once_with(reminder=Reminder(schedule=schedule))
+    job_access.complete_job.assert_called_once_with(
+        schedule_id=schedule.id, owner="owner", next_schedule=schedule.next_schedule
+    )
+    callback.assert_called_once_with(schedule.next_schedule)
+
+
+def test_job_overdue_after_restart_is_sent_once(
+    scheduler: DistributedReminderScheduler,
+    job_access: mock.MagicMock,
+    schedule: Schedule,
+    reminder_sender: mock.MagicMock,
+    callback: mock.MagicMock,
+) -> None:
+    # all replicas were down for a day, the job of a schedule rotating every minute is overdue by ~1440 rotations
+    overdue_schedule = dataclasses.replace(
+        schedule,
+        next_rotation=datetime.datetime.now() - datetime.timedelta(days=1),
+        time_between_rotations=datetime.timedelta(minutes=1),
+    )
+    job_access.claim_due_job.side_effect = [overdue_schedule, None]
+    job_access.complete_job.return_value = True
+
+    assert scheduler._run_due_jobs(reminder_sender=reminder_sender) == 1
+
+    reminder_sender.send_reminder.assert_called_once_with(reminder=Reminder(schedule=overdue_schedule))
+    next_schedule = job_access.complete_job.call_args.kwargs["next_schedule"]
+    assert next_schedule.next_rotation > datetime.datetime.now()
+    assert next_schedule.current_index == overdue_schedule.next_schedule.current_index
+    callback.assert_called_once_with(next_schedule)
+
+
+def test_lost_lease_does_not_update_schedule(
+    scheduler: DistributedReminderScheduler,
+    job_access: mock.MagicMock,
+    schedule: Schedule,
+    reminder_sender: mock.MagicMock,
+    callback: mock.MagicMock,
+) -> None:
+    job_access.complete_job.return_value = False
+
+    scheduler.execute_reminder(reminder=Reminder(schedule=schedule), reminder_sender=reminder_sender)
+
+    callback.assert_not_called()
+
+
+def test_reminder_is_not_sent_after_losing_the_lease_in_the_queue(
+    scheduler: DistributedReminderScheduler,
+    job_access: mock.MagicMock,
+    schedule: Schedule,
+    reminder_sender: mock.MagicMock,
+    callback: mock.MagicMock,
+) -> None:
+    # the lease expired while the reminder was queued and another replica claimed the job
+    job_access.renew_lease.return_value = False
+
+    scheduler.execute_reminder(reminder=Reminder(schedule=schedule), reminder_sender=reminder_sender)
+
+    job_access.renew_lease.assert_called_once_with(schedule_id=schedule.id, owner="owner", now=mock.ANY, lease=DEFAULT_LEASE)
+    reminder_sender.send_reminder.assert_not_called()
+    job_access.complete_job.assert_not_called()
+    callback.assert_not_called()
+
+
+def test_failing_reminder_is_not_completed(
+    scheduler: DistributedReminderScheduler, job_access: mock.MagicMock, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    reminder_sender.send_reminder.side_effect = RuntimeError("slack is down")
+
+    with pytest.raises(RuntimeError):
+        scheduler.execute_reminder(reminder=Reminder(schedule=schedule), reminder_sender=reminder_sender)
+
+    # the lease expires and the job is claimed again
+    job_access.complete_job.assert_not_called()
+
+
+def test_poller_claims_due_jobs(
+    scheduler: DistributedReminderScheduler, job_access: mock.MagicMock, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    due_jobs: List[Union[Exception, Schedule]] = [RuntimeError("mongo is down"), schedule]
+
+    def claim_due_job(owner: str, now: datetime.datetime, lease: datetime.timedelta) -> Optional[Schedule]:
+        if len(due_jobs) == 0:
+            return None
+
+        due_job = due_jobs.pop(0)
+        if isinstance(due_job, Exception):
+            raise due_job
+
+        return due_job
+
+    job_access.claim_due_job.side_effect = claim_due_job
+    job_access.complete_job.return_value = True
+
+    scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+
+    while reminder_sender.send_reminder.call_count == 0:
+        # no idle waiting
+        time.sleep(0.05)
+
+    reminder_sender.send_reminder.assert_called_once_with(reminder=Reminder(schedule=schedule))
+
+
+def test_default_owner_is_unique(job_access: mock.MagicMock) -> None:
+    assert (
+        DistributedReminderScheduler(reminder_job_access=job_access).owner
+        != DistributedReminderScheduler(reminder_job_access=job_access).owner
+    )
@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import List
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.reminder.executor import ReminderExecutor
+
+
+@pytest.fixture
+def executor() -> ReminderExecutor:
+    return ReminderExecutor(max_workers=2, max_queue_size=1)
+
+
+def _wait_until_finished(executor: ReminderExecutor, count: int) -> None:
+    while executor.metrics.completed + executor.metrics.failed < count:
+        # no idle waiting
+        time.sleep(0.01)
+
+
+def test_submitted_functions_are_executed(executor: ReminderExecutor) -> None:
+    function = mock.MagicMock()
+
+    executor.submit(function)
+    _wait_until_finished(executor=executor, count=1)
+
+    function.assert_called_once()
+    assert executor.metrics.submitted == 1
+    assert executor.metrics.completed == 1
+    assert executor.metrics.queued == 0
+    assert executor.metrics.running == 0
+
+
+def test_failures_are_counted(executor: ReminderExecutor) -> None:
+    executor.submit(mock.MagicMock(side_effect=RuntimeError("slack is down")))
+    _wait_until_finished(executor=executor, count=1)
+
+    assert executor.metrics.failed == 1
+    assert executor.metrics.completed == 0
+
+
+def test_concurrency_is_bounded_and_full_queue_throttles(executor: ReminderExecutor) -> None:
+    release = threading.Event()
+    running_threads: List[str] = []
+    max_concurrency = 0
+    lock = threading.Lock()
+
+    def blocking_function() -> None:
+        nonlocal max_concurrency
+        with lock:
+            running_threads.append(threading.current_thread().name)
+            max_concurrency = max(max_concurrency, len(running_threads))
+        release.wait()
+        with lock:
+            running_threads.remove(threading.current_thread().name)
+
+    # 2 workers + 1 queued fit, the 4th submission has to wait for a free slot
+    for _ in range(3):
+        executor.submit(blocking_function)
+
+    fourth_submission = threading.Thread(target=executor.submit, args=(blocking_function,))
+    fourth_submission.start()
+    time.sleep(0.1)
+
+    assert fourth_submission.is_alive()
+    assert executor.metrics.throttled == 1
+    assert executor.metrics.max_queued == 1
+
+    release.set()
+    fourth_submission.join()
+    _wait_until_finished(executor=executor, count=4)
+
+    assert max_concurrency == 2
+    assert executor.metrics.completed == 4
+
+
+@pytest.mark.parametrize("max_workers, max_queue_size", [(0, 1), (1, -1)])
+def test_invalid_sizes_raise(max_workers: int, max_queue_size: int) -> None:
+    with pytest.raises(ValueError):
+        ReminderExecutor(max_workers=max_workers, max_queue_size=max_queue_size)
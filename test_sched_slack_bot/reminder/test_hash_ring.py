@@ -0,0 +1,44 @@
+import pytest
+
+from sched_slack_bot.reminder.hash_ring import ConsistentHashRing
+
+KEYS = [f"schedule-{i}" for i in range(2000)]
+
+
+def test_owner_is_deterministic() -> None:
+    ring = ConsistentHashRing(members=["a", "b", "c"])
+    other_ring = ConsistentHashRing(members=["c", "b", "a"])
+
+    assert [ring.get_owner(key=k) for k in KEYS] == [other_ring.get_owner(key=k) for k in KEYS]
+
+
+def test_keys_are_spread_between_members() -> None:
+    ring = ConsistentHashRing(members=["a", "b", "c"])
+    owners = [ring.get_owner(key=k) for k in KEYS]
+
+    for member in ["a", "b", "c"]:
+        assert owners.count(member) > len(KEYS) / 6
+
+
+def test_joining_member_only_takes_over_keys() -> None:
+    ring = ConsistentHashRing(members=["a", "b", "c"])
+    joined_ring = ConsistentHashRing(members=["a", "b", "c", "d"])
+
+    moved_keys = [k for k in KEYS if ring.get_owner(key=k) != joined_ring.get_owner(key=k)]
+
+    assert all(joined_ring.get_owner(key=k) == "d" for k in moved_keys)
+    assert len(moved_keys) < len(KEYS) / 2
+
+
+def test_leaving_member_only_hands_over_its_keys() -> None:
+    ring = ConsistentHashRing(members=["a", "b", "c"])
+    left_ring = ConsistentHashRing(members=["a", "b"])
+
+    moved_keys = [k for k in KEYS if ring.get_owner(key=k) != left_ring.get_owner(key=k)]
+
+    assert all(ring.get_owner(key=k) == "c" for k in moved_keys)
+
+
+def test_empty_ring_raises() -> None:
+    with pytest.raises(ValueError):
+        ConsistentHashRing(members=[]).get_owner(key="key")
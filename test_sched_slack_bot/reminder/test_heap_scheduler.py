@@ -0,0 +1,185 @@
+import datetime
+import threading
+import time
+import uuid
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.heap_scheduler import HeapReminderScheduler, MIN_CANCELLED_ENTRIES_FOR_COMPACTION
+from sched_slack_bot.reminder.sender import ReminderSender
+
+
+@pytest.fixture(params=[mock.MagicMock(), None])
+def scheduler(request: Any) -> HeapReminderScheduler:
+    if isinstance(request.param, mock.MagicMock):
+        request.param.reset_mock()
+    return HeapReminderScheduler(reminder_executed_callback=request.param)
+
+
+def _create_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture
+def schedule() -> Schedule:
+    return _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(milliseconds=100))
+
+
+@pytest.fixture
+def reminder(schedule: Schedule) -> Reminder:
+    return Reminder(schedule=schedule)
+
+
+@pytest.fixture()
+def reminder_sender() -> mock.MagicMock:
+    return mock.MagicMock(spec=ReminderSender)
+
+
+def _wait_for_reminders(reminder_sender: mock.MagicMock, count: int) -> None:
+    while reminder_sender.send_reminder.call_count < count:
+        # no idle waiting
+        time.sleep(0.05)
+
+
+def test_schedule_reminder(
+    scheduler: HeapReminderScheduler, reminder: Reminder, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+
+    reminder_sender.send_reminder.assert_called_once_with(reminder=reminder)
+    # the next rotation is re-armed on the same heap
+    assert scheduler.pending_reminder_count == 1
+    if isinstance(scheduler._reminder_executed_callback, mock.MagicMock):
+        scheduler._reminder_executed_callback.assert_called_once_with(reminder.next_schedule)
+
+
+def test_reminders_are_executed_in_deadline_order(scheduler: HeapReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    now = datetime.datetime.now()
+    later_schedule = _create_schedule(next_rotation=now + datetime.timedelta(milliseconds=300))
+    earlier_schedule = _create_schedule(next_rotation=now + datetime.timedelta(milliseconds=100))
+
+    scheduler.schedule_all_reminders(schedules=[later_schedule, earlier_schedule], reminder_sender=reminder_sender)
+
+    _wait_for_reminders(reminder_sender=reminder_sender, count=2)
+
+    assert reminder_sender.send_reminder.call_args_list == [
+        mock.call(reminder=Reminder(schedule=earlier_schedule)),
+        mock.call(reminder=Reminder(schedule=later_schedule)),
+    ]
+
+
+def test_stop_reminder(scheduler: HeapReminderScheduler, schedule: Schedule, reminder_sender: mock.MagicMock) -> None:
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+
+    now = datetime.datetime.now()
+    while now < schedule.next_rotation + datetime.timedelta(milliseconds=100):
+        # no idle waiting
+        time.sleep(0.1)
+        now = datetime.datetime.now()
+
+    reminder_sender.send_reminder.assert_not_called()
+    assert scheduler.pending_reminder_count == 0
+
+
+def test_remove_unknown_reminder_raises(scheduler: HeapReminderScheduler) -> None:
+    with pytest.raises(KeyError):
+        scheduler.remove_reminder_for_schedule(schedule_id="unknown")
+
+
+def test_rescheduling_replaces_pending_reminder(
+    scheduler: HeapReminderScheduler, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    far_away_schedule = _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(days=1))
+    scheduler.schedule_reminder(schedule=far_away_schedule, reminder_sender=reminder_sender)
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+    time.sleep(0.1)
+
+    reminder_sender.send_reminder.assert_called_once()
+
+
+def test_schedule_reminder_in_the_past_raises(scheduler: HeapReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    schedule_in_the_past = _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1))
+
+    with pytest.raises(ValueError):
+        scheduler.schedule_reminder(schedule=schedule_in_the_past, reminder_sender=reminder_sender)
+
+
+def test_thread_count_does_not_grow_with_schedules(scheduler: HeapReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    thread_count_before = threading.active_count()
+    next_rotation = datetime.datetime.now() + datetime.timedelta(days=1)
+
+    scheduler.schedule_all_reminders(
+        schedules=[_create_schedule(next_rotation=next_rotation) for _ in range(1000)], reminder_sender=reminder_sender
+    )
+
+    assert scheduler.pending_reminder_count == 1000
+    assert threading.active_count() <= thread_count_before + 1
+
+
+def test_cancelled_reminders_are_compacted(scheduler: HeapReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    next_rotation = datetime.datetime.now() + datetime.timedelta(days=1)
+    schedules = [_create_schedule(next_rotation=next_rotation) for _ in range(MIN_CANCELLED_ENTRIES_FOR_COMPACTION * 2)]
+    scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+    for schedule in schedules:
+        scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+
+    assert len(scheduler._heap) < MIN_CANCELLED_ENTRIES_FOR_COMPACTION
+
+
+def test_failing_reminder_does_not_stop_dispatcher(
+    scheduler: HeapReminderScheduler, schedule: Schedule, reminder_sender: mock.MagicMock
+) -> None:
+    reminder_sender.send_reminder.side_effect = [RuntimeError("slack is down"), None]
+    other_schedule = _create_schedule(next_rotation=schedule.next_rotation + datetime.timedelta(milliseconds=100))
+
+    scheduler.schedule_all_reminders(schedules=[schedule, other_schedule], reminder_sender=reminder_sender)
+
+    _wait_for_reminders(reminder_sender=reminder_sender, count=2)
+
+    reminder_sender.send_reminder.assert_called_with(reminder=Reminder(schedule=other_schedule))
+
+
+def test_due_reminders_are_delivered_by_executor(schedule: Schedule, reminder_sender: mock.MagicMock) -> None:
+    reminder_executor = ReminderExecutor(max_workers=1, max_queue_size=1)
+    scheduler = HeapReminderScheduler(reminder_executor=reminder_executor)
+
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    _wait_for_reminders(reminder_sender=reminder_sender, count=1)
+
+    while reminder_executor.metrics.completed == 0:
+        # no idle waiting
+        time.sleep(0.05)
+
+    assert reminder_executor.metrics.submitted == 1
+    reminder_executor.shutdown()
+
+
+def test_has_reminder_for_schedule(scheduler: HeapReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(days=1))
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    assert scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
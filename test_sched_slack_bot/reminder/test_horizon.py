@@ -0,0 +1,58 @@
+import datetime
+import time
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+
+
+def test_due_before_is_now_plus_horizon() -> None:
+    horizon = ReminderHorizon(horizon=datetime.timedelta(hours=1))
+
+    before = datetime.datetime.now() + datetime.timedelta(hours=1)
+    due_before = horizon.due_before
+    after = datetime.datetime.now() + datetime.timedelta(hours=1)
+
+    assert before <= due_before <= after
+
+
+@pytest.mark.parametrize(
+    "refill_interval",
+    [datetime.timedelta(hours=1), datetime.timedelta(hours=2), datetime.timedelta(), datetime.timedelta(seconds=-1)],
+)
+def test_invalid_refill_interval_raises(refill_interval: datetime.timedelta) -> None:
+    with pytest.raises(ValueError):
+        ReminderHorizon(horizon=datetime.timedelta(hours=1), refill_interval=refill_interval)
+
+
+def test_refill_is_called_periodically() -> None:
+    horizon = ReminderHorizon(horizon=datetime.timedelta(seconds=1), refill_interval=datetime.timedelta(milliseconds=50))
+    refill = mock.MagicMock(side_effect=[RuntimeError("mongo is down"), None, None])
+
+    horizon.start(refill=refill)
+    while refill.call_count < 3:
+        # no idle waiting
+        time.sleep(0.05)
+    horizon.stop()
+
+    # failing refills do not stop the refill thread
+    assert refill.call_count >= 3
+    assert isinstance(refill.call_args.args[0], datetime.datetime)
+
+
+def test_starting_twice_raises() -> None:
+    horizon = ReminderHorizon(horizon=datetime.timedelta(hours=1))
+    horizon.start(refill=mock.MagicMock())
+
+    with pytest.raises(RuntimeError):
+        horizon.start(refill=mock.MagicMock())
+
+    horizon.stop()
+
+
+def test_contains_only_dates_before_the_horizon() -> None:
+    horizon = ReminderHorizon(horizon=datetime.timedelta(hours=1))
+
+    assert horizon.contains(date=datetime.datetime.now() + datetime.timedelta(minutes=59))
+    assert not horizon.contains(date=datetime.datetime.now() + datetime.timedelta(minutes=61))
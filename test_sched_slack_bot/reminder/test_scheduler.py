@@ -8,6 +8,8 @@ import pytest
 
 from sched_slack_bot.model.reminder import Reminder
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
 from sched_slack_bot.reminder.scheduler import ReminderScheduler
 from sched_slack_bot.reminder.sender import ReminderSender
 
@@ -56,6 +58,29 @@ def test_execute_unscheduled_reminder(
         scheduler._reminder_executed_callback.assert_called_once_with(reminder.next_schedule)
 
 
+def test_executed_reminder_beyond_the_horizon_is_not_armed(reminder: Reminder, reminder_sender: mock.MagicMock) -> None:
+    callback = mock.MagicMock()
+    # the next rotation is 2 hours later
+    scheduler = ReminderScheduler(
+        reminder_executed_callback=callback, reminder_horizon=ReminderHorizon(horizon=datetime.timedelta(hours=1))
+    )
+
+    scheduler.execute_reminder(reminder=reminder, reminder_sender=reminder_sender)
+
+    reminder_sender.send_reminder.assert_called_once_with(reminder=reminder)
+    callback.assert_called_once_with(reminder.next_schedule)
+    assert not scheduler.has_reminder_for_schedule(schedule_id=reminder.schedule_id)
+
+
+def test_executed_reminder_within_the_horizon_is_armed(reminder: Reminder, reminder_sender: mock.MagicMock) -> None:
+    scheduler = ReminderScheduler(reminder_horizon=ReminderHorizon(horizon=datetime.timedelta(hours=3)))
+
+    scheduler.execute_reminder(reminder=reminder, reminder_sender=reminder_sender)
+
+    assert scheduler.has_reminder_for_schedule(schedule_id=reminder.schedule_id)
+    scheduler.remove_reminder_for_schedule(schedule_id=reminder.schedule_id)
+
+
 def test_schedule_all_reminders(
     scheduler: ReminderScheduler, reminder: Reminder, schedule: Schedule, reminder_sender: mock.MagicMock
 ) -> None:
@@ -117,3 +142,32 @@ def test_schedule_reminder_starts_daemon_threads(
 
     # need to explicitly assert on true value, MagicMock is truthy otherwise
     assert mocked_timer.return_value.daemon is True
+
+
+def test_due_reminder_is_handed_to_executor(reminder: Reminder, schedule: Schedule, reminder_sender: mock.MagicMock) -> None:
+    reminder_executor = mock.MagicMock(spec=ReminderExecutor)
+    scheduler = ReminderScheduler(reminder_executor=reminder_executor)
+
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    while reminder_executor.submit.call_count == 0:
+        # no idle waiting
+        time.sleep(0.1)
+
+    reminder_sender.send_reminder.assert_not_called()
+    # the timer itself was already cleaned up when the reminder became due
+    assert schedule.id not in scheduler._timer_by_schedule_id
+
+    reminder_executor.submit.call_args.args[0]()
+    reminder_sender.send_reminder.assert_called_once_with(reminder=reminder)
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+
+
+def test_has_reminder_for_schedule(scheduler: ReminderScheduler, schedule: Schedule, reminder_sender: mock.MagicMock) -> None:
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    assert scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
@@ -0,0 +1,46 @@
+from typing import Type
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.reminder_job_access import ReminderJobAccess
+from sched_slack_bot.reminder.distributed_scheduler import DistributedReminderScheduler
+from sched_slack_bot.reminder.heap_scheduler import HeapReminderScheduler
+from sched_slack_bot.reminder.scheduler import ReminderScheduler, BaseReminderScheduler
+from sched_slack_bot.reminder.scheduler_type import ReminderSchedulerType, get_reminder_scheduler
+from sched_slack_bot.reminder.timing_wheel_scheduler import TimingWheelReminderScheduler
+
+
+@pytest.mark.parametrize(
+    "scheduler_type, expected_class",
+    [
+        (ReminderSchedulerType.TIMER, ReminderScheduler),
+        (ReminderSchedulerType.HEAP, HeapReminderScheduler),
+        (ReminderSchedulerType.TIMING_WHEEL, TimingWheelReminderScheduler),
+    ],
+)
+def test_get_reminder_scheduler(scheduler_type: ReminderSchedulerType, expected_class: Type[BaseReminderScheduler]) -> None:
+    assert isinstance(get_reminder_scheduler(scheduler_type=scheduler_type), expected_class)
+
+
+def test_unknown_scheduler_type_raises() -> None:
+    with pytest.raises(ValueError):
+        ReminderSchedulerType("unknown")
+
+
+def test_asyncio_scheduler_type_raises_without_loop() -> None:
+    with pytest.raises(ValueError):
+        get_reminder_scheduler(scheduler_type=ReminderSchedulerType.ASYNCIO)
+
+
+def test_get_distributed_reminder_scheduler() -> None:
+    scheduler = get_reminder_scheduler(
+        scheduler_type=ReminderSchedulerType.DISTRIBUTED, reminder_job_access=mock.MagicMock(spec=ReminderJobAccess)
+    )
+
+    assert isinstance(scheduler, DistributedReminderScheduler)
+
+
+def test_distributed_scheduler_type_raises_without_job_access() -> None:
+    with pytest.raises(ValueError):
+        get_reminder_scheduler(scheduler_type=ReminderSchedulerType.DISTRIBUTED)
@@ -0,0 +1,469 @@
+import dataclasses
+import datetime
+import threading
+import uuid
+from typing import List, Set
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.data.in_memory_schedule_access import InMemoryScheduleAccess
+from sched_slack_bot.data.replica_membership_access import ReplicaMembershipAccess
+from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.scheduler import BaseReminderScheduler
+from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.reminder.sharded_scheduler import ShardedReminderScheduler, DEFAULT_HEARTBEAT_TIMEOUT
+
+
+def _create_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture
+def schedules() -> List[Schedule]:
+    return [_create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(hours=1)) for _ in range(50)]
+
+
+@pytest.fixture()
+def reminder_sender() -> mock.MagicMock:
+    return mock.MagicMock(spec=ReminderSender)
+
+
+def _create_inner_scheduler() -> mock.MagicMock:
+    # holds the armed reminders like the wrapped schedulers, removing unknown reminders raises like theirs
+    inner_scheduler = mock.MagicMock(spec=BaseReminderScheduler)
+    held_schedule_ids: Set[str] = set()
+    inner_scheduler.schedule_reminder.side_effect = lambda schedule, reminder_sender: held_schedule_ids.add(schedule.id)
+    inner_scheduler.remove_reminder_for_schedule.side_effect = lambda schedule_id: held_schedule_ids.remove(schedule_id)
+    inner_scheduler.has_reminder_for_schedule.side_effect = lambda schedule_id: schedule_id in held_schedule_ids
+
+    return inner_scheduler
+
+
+@pytest.fixture()
+def inner_scheduler() -> mock.MagicMock:
+    return _create_inner_scheduler()
+
+
+@pytest.fixture()
+def membership_access() -> mock.MagicMock:
+    membership_access = mock.MagicMock(spec=ReplicaMembershipAccess)
+    membership_access.get_live_replicas.return_value = ["a", "b"]
+
+    return membership_access
+
+
+@pytest.fixture()
+def schedule_access() -> mock.MagicMock:
+    return mock.MagicMock(spec=ScheduleAccess)
+
+
+@pytest.fixture
+def scheduler(
+    inner_scheduler: mock.MagicMock, membership_access: mock.MagicMock, schedule_access: mock.MagicMock
+) -> ShardedReminderScheduler:
+    return ShardedReminderScheduler(
+        reminder_scheduler=inner_scheduler,
+        replica_membership_access=membership_access,
+        schedule_access=schedule_access,
+        replica_id="a",
+    )
+
+
+def _get_armed_schedule_ids(inner_scheduler: mock.MagicMock) -> List[str]:
+    return [c.kwargs["schedule"].id for c in inner_scheduler.schedule_reminder.call_args_list]
+
+
+def test_only_owned_schedules_are_armed(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+    membership_access.heartbeat.assert_called_once()
+    armed_schedule_ids = _get_armed_schedule_ids(inner_scheduler=inner_scheduler)
+    assert 0 < len(armed_schedule_ids) < len(schedules)
+    assert armed_schedule_ids == [s.id for s in schedules if scheduler.ring.get_owner(key=s.id) == "a"]
+
+
+def test_remove_only_removes_armed_reminders(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    owned_schedule = next(s for s in schedules if scheduler.owns_schedule(schedule_id=s.id))
+    scheduler.schedule_reminder(schedule=owned_schedule, reminder_sender=reminder_sender)
+
+    scheduler.remove_reminder_for_schedule(schedule_id="unknown")
+    scheduler.remove_reminder_for_schedule(schedule_id=owned_schedule.id)
+
+    inner_scheduler.remove_reminder_for_schedule.assert_called_once_with(schedule_id=owned_schedule.id)
+
+
+def test_rebalance_without_changes_keeps_reminders(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    owned_schedules = [s for s in schedules if scheduler.owns_schedule(schedule_id=s.id)]
+    scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+    schedule_access.get_available_schedules.return_value = schedules
+    inner_scheduler.reset_mock()
+
+    scheduler.rebalance()
+
+    inner_scheduler.schedule_reminder.assert_not_called()
+    inner_scheduler.remove_reminder_for_schedule.assert_not_called()
+    assert all(scheduler.has_reminder_for_schedule(schedule_id=s.id) for s in owned_schedules)
+
+
+def test_rebalance_only_arms_schedules_within_the_horizon(
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    reminder_horizon = mock.MagicMock(spec=ReminderHorizon)
+    scheduler = ShardedReminderScheduler(
+        reminder_scheduler=inner_scheduler,
+        replica_membership_access=membership_access,
+        schedule_access=schedule_access,
+        replica_id="a",
+        reminder_horizon=reminder_horizon,
+    )
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+    schedule_access.get_schedules_due_before.return_value = schedules
+
+    scheduler.rebalance()
+
+    schedule_access.get_available_schedules.assert_not_called()
+    schedule_access.get_schedules_due_before.assert_called_once_with(before=reminder_horizon.due_before)
+    assert _get_armed_schedule_ids(inner_scheduler=inner_scheduler) == [
+        s.id for s in schedules if scheduler.owns_schedule(schedule_id=s.id)
+    ]
+
+
+def test_rebalance_hands_over_and_takes_over_schedules(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    membership_access.get_live_replicas.return_value = ["a", "b", "c"]
+    for schedule in schedules:
+        scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    previously_armed_schedule_ids = set(_get_armed_schedule_ids(inner_scheduler=inner_scheduler))
+    inner_scheduler.reset_mock()
+
+    # replica c left
+    membership_access.get_live_replicas.return_value = ["a", "b"]
+    schedule_access.get_available_schedules.return_value = schedules
+    scheduler.rebalance()
+
+    taken_over_schedule_ids = set(_get_armed_schedule_ids(inner_scheduler=inner_scheduler))
+    inner_scheduler.remove_reminder_for_schedule.assert_not_called()
+    assert len(taken_over_schedule_ids) > 0
+    assert taken_over_schedule_ids.isdisjoint(previously_armed_schedule_ids)
+    assert all(scheduler.owns_schedule(schedule_id=s) for s in taken_over_schedule_ids)
+
+    # replica c joined again
+    membership_access.get_live_replicas.return_value = ["a", "b", "c"]
+    scheduler.rebalance()
+
+    removed_schedule_ids = {c.kwargs["schedule_id"] for c in inner_scheduler.remove_reminder_for_schedule.call_args_list}
+    assert removed_schedule_ids == taken_over_schedule_ids
+
+
+def test_rebalance_executes_overdue_schedules_of_left_replica(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    reminder_sender: mock.MagicMock,
+) -> None:
+    membership_access.get_live_replicas.return_value = ["a", "b"]
+    overdue_schedules = [
+        _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1)) for _ in range(20)
+    ]
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+
+    membership_access.get_live_replicas.return_value = ["a"]
+    schedule_access.get_available_schedules.return_value = overdue_schedules
+    scheduler.rebalance()
+
+    executed_reminders = [c.kwargs["reminder"] for c in inner_scheduler.execute_reminder.call_args_list]
+    assert executed_reminders == [Reminder(schedule=s) for s in overdue_schedules]
+    inner_scheduler.schedule_reminder.assert_not_called()
+
+
+def test_rebalance_sends_only_last_missed_rotation_of_overdue_schedules(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    reminder_sender: mock.MagicMock,
+) -> None:
+    # the previous owner left almost a day ago
+    overdue_schedule = _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(hours=23))
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+
+    membership_access.get_live_replicas.return_value = ["a"]
+    schedule_access.get_available_schedules.return_value = [overdue_schedule]
+    scheduler.rebalance()
+
+    executed_reminder = inner_scheduler.execute_reminder.call_args.kwargs["reminder"]
+    inner_scheduler.execute_reminder.assert_called_once()
+    assert executed_reminder == Reminder(
+        schedule=dataclasses.replace(
+            overdue_schedule, next_rotation=overdue_schedule.next_rotation + 11 * datetime.timedelta(hours=2)
+        )
+    )
+    assert executed_reminder.next_schedule.next_rotation > datetime.datetime.now()
+
+
+def test_rebalance_retries_failed_takeovers(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    overdue_schedule = _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1))
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+
+    membership_access.get_live_replicas.return_value = ["a"]
+    schedule_access.get_available_schedules.return_value = [*schedules, overdue_schedule]
+    arm_reminder = inner_scheduler.schedule_reminder.side_effect
+    failing_schedule_ids = {schedules[0].id}
+
+    def arm_reminder_failing_once(schedule: Schedule, reminder_sender: ReminderSender) -> None:
+        if schedule.id in failing_schedule_ids:
+            failing_schedule_ids.remove(schedule.id)
+            raise ValueError("in the past")
+
+        arm_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    inner_scheduler.schedule_reminder.side_effect = arm_reminder_failing_once
+    inner_scheduler.execute_reminder.side_effect = [RuntimeError("slack is down"), None]
+    scheduler.rebalance()
+
+    # every other schedule was still taken over
+    assert _get_armed_schedule_ids(inner_scheduler=inner_scheduler) == [s.id for s in schedules]
+    inner_scheduler.reset_mock()
+
+    scheduler.rebalance()
+
+    assert _get_armed_schedule_ids(inner_scheduler=inner_scheduler) == [schedules[0].id]
+    inner_scheduler.execute_reminder.assert_called_once_with(
+        reminder=Reminder(schedule=overdue_schedule), reminder_sender=reminder_sender
+    )
+    inner_scheduler.reset_mock()
+
+    # all takeovers are complete, the previous owner left before the overdue schedule was written back
+    scheduler.rebalance()
+
+    inner_scheduler.schedule_reminder.assert_not_called()
+    inner_scheduler.execute_reminder.assert_not_called()
+
+
+def test_rebalance_sends_overdue_reminders_without_holding_the_lock(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    reminder_sender: mock.MagicMock,
+) -> None:
+    lock_available: List[bool] = []
+
+    def acquire_lock() -> None:
+        acquired = scheduler._lock.acquire(timeout=1)
+        lock_available.append(acquired)
+        if acquired:
+            scheduler._lock.release()
+
+    def execute_reminder(reminder: Reminder, reminder_sender: ReminderSender) -> None:
+        acquiring_thread = threading.Thread(target=acquire_lock)
+        acquiring_thread.start()
+        acquiring_thread.join()
+
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+    membership_access.get_live_replicas.return_value = ["a"]
+    schedule_access.get_available_schedules.return_value = [
+        _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1))
+    ]
+    inner_scheduler.execute_reminder.side_effect = execute_reminder
+
+    scheduler.rebalance()
+
+    assert lock_available == [True]
+
+
+def test_rebalance_hands_over_reminders_no_longer_held_by_the_wrapped_scheduler(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    membership_access.get_live_replicas.return_value = []
+    scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+    # the reminder was executed and its next rotation is beyond the horizon
+    inner_scheduler.remove_reminder_for_schedule(schedule_id=schedules[0].id)
+    inner_scheduler.reset_mock()
+
+    membership_access.get_live_replicas.return_value = ["b"]
+    schedule_access.get_available_schedules.return_value = schedules
+    scheduler.rebalance()
+
+    handed_over_schedule_ids = {s.id for s in schedules if not scheduler.owns_schedule(schedule_id=s.id)} - {schedules[0].id}
+    removed_schedule_ids = {c.kwargs["schedule_id"] for c in inner_scheduler.remove_reminder_for_schedule.call_args_list}
+    assert removed_schedule_ids == handed_over_schedule_ids
+    assert scheduler._armed_schedules.keys() == {s.id for s in schedules if scheduler.owns_schedule(schedule_id=s.id)}
+
+
+def test_rebalance_does_not_take_over_overdue_reminders_of_live_replicas(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    reminder_sender: mock.MagicMock,
+) -> None:
+    membership_access.get_live_replicas.return_value = ["b"]
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+    overdue_schedules = [
+        _create_schedule(next_rotation=datetime.datetime.now() - datetime.timedelta(seconds=1)) for _ in range(20)
+    ]
+
+    # replica c joined, the previous owners are still alive and send their due reminders
+    membership_access.get_live_replicas.return_value = ["b", "c"]
+    schedule_access.get_available_schedules.return_value = overdue_schedules
+    scheduler.rebalance()
+
+    inner_scheduler.execute_reminder.assert_not_called()
+
+    # nobody sent them within a heartbeat timeout, the previous owners handed them over before
+    long_overdue_schedules = [
+        dataclasses.replace(s, next_rotation=s.next_rotation - DEFAULT_HEARTBEAT_TIMEOUT) for s in overdue_schedules
+    ]
+    schedule_access.get_available_schedules.return_value = long_overdue_schedules
+    scheduler.rebalance()
+
+    executed_schedule_ids = [c.kwargs["reminder"].schedule_id for c in inner_scheduler.execute_reminder.call_args_list]
+    assert executed_schedule_ids == [s.id for s in long_overdue_schedules if scheduler.owns_schedule(schedule_id=s.id)]
+
+
+def test_rebalance_re_arms_schedules_changed_by_other_replicas(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    owned_schedule = next(s for s in schedules if scheduler.owns_schedule(schedule_id=s.id))
+    scheduler.schedule_reminder(schedule=owned_schedule, reminder_sender=reminder_sender)
+    edited_schedule = dataclasses.replace(
+        owned_schedule, next_rotation=owned_schedule.next_rotation + datetime.timedelta(hours=1), version=1
+    )
+    schedule_access.get_available_schedules.return_value = [edited_schedule]
+    inner_scheduler.reset_mock()
+
+    scheduler.rebalance()
+
+    inner_scheduler.remove_reminder_for_schedule.assert_called_once_with(schedule_id=owned_schedule.id)
+    inner_scheduler.schedule_reminder.assert_called_once_with(schedule=edited_schedule, reminder_sender=reminder_sender)
+    inner_scheduler.reset_mock()
+
+    # the next rotation the wrapped scheduler armed itself after executing the reminder is not armed again
+    schedule_access.get_available_schedules.return_value = [edited_schedule.next_schedule]
+    scheduler.rebalance()
+
+    inner_scheduler.remove_reminder_for_schedule.assert_not_called()
+    inner_scheduler.schedule_reminder.assert_not_called()
+
+
+def test_schedules_changed_on_another_replica_are_armed_by_their_owner(
+    membership_access: mock.MagicMock, schedules: List[Schedule], reminder_sender: mock.MagicMock
+) -> None:
+    schedule_access = InMemoryScheduleAccess()
+    inner_schedulers = {"a": _create_inner_scheduler(), "b": _create_inner_scheduler()}
+    replicas = {
+        replica_id: ShardedReminderScheduler(
+            reminder_scheduler=inner_schedulers[replica_id],
+            replica_membership_access=membership_access,
+            schedule_access=schedule_access,
+            replica_id=replica_id,
+        )
+        for replica_id in ("a", "b")
+    }
+    for replica in replicas.values():
+        with mock.patch.object(replica, "_start_heartbeat_if_necessary"):
+            replica.schedule_all_reminders(schedules=[], reminder_sender=reminder_sender)
+    schedule = schedules[0]
+    owner = replicas["a"].ring.get_owner(key=schedule.id)
+    non_owner = "b" if owner == "a" else "a"
+
+    # created on the replica not owning it
+    schedule_access.save_schedule(schedule=schedule)
+    replicas[non_owner].schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    for replica in replicas.values():
+        replica.rebalance()
+
+    assert inner_schedulers[owner].has_reminder_for_schedule(schedule_id=schedule.id)
+    assert not inner_schedulers[non_owner].has_reminder_for_schedule(schedule_id=schedule.id)
+
+    # deleted on the replica not owning it
+    replicas[non_owner].remove_reminder_for_schedule(schedule_id=schedule.id)
+    schedule_access.delete_schedule(schedule_id=schedule.id)
+    for replica in replicas.values():
+        replica.rebalance()
+
+    assert not inner_schedulers[owner].has_reminder_for_schedule(schedule_id=schedule.id)
+    inner_schedulers[non_owner].schedule_reminder.assert_not_called()
+
+
+def test_stop_removes_reminders_and_leaves_the_ring(
+    scheduler: ShardedReminderScheduler,
+    inner_scheduler: mock.MagicMock,
+    membership_access: mock.MagicMock,
+    schedule_access: mock.MagicMock,
+    schedules: List[Schedule],
+    reminder_sender: mock.MagicMock,
+) -> None:
+    with mock.patch.object(scheduler, "_start_heartbeat_if_necessary"):
+        scheduler.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+    scheduler.stop()
+    scheduler.rebalance()
+
+    membership_access.remove_replica.assert_called_once_with(replica_id="a")
+    assert not any(scheduler.has_reminder_for_schedule(schedule_id=s.id) for s in schedules)
+    schedule_access.get_available_schedules.assert_not_called()
@@ -1,13 +1,15 @@
+import asyncio
 import datetime
 import uuid
 from unittest import mock
 
 import pytest
 from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 
 from sched_slack_bot.model.reminder import Reminder
 from sched_slack_bot.model.schedule import Schedule
-from sched_slack_bot.reminder.slack_sender import SlackReminderSender
+from sched_slack_bot.reminder.slack_sender import SlackReminderSender, AsyncSlackReminderSender
 from sched_slack_bot.views.reminder_blocks import get_reminder_text, get_reminder_blocks, get_skip_text, get_skip_blocks
 
 
@@ -59,3 +61,39 @@ def test_skip_reminder(slack_sender: SlackReminderSender, client: mock.MagicMock
         text=get_skip_text(reminder=reminder),
         blocks=get_skip_blocks(reminder=reminder),
     )
+
+
+@pytest.fixture()
+def async_client() -> mock.AsyncMock:
+    return mock.AsyncMock(spec=AsyncWebClient)
+
+
+@pytest.fixture
+def async_slack_sender(async_client: mock.AsyncMock) -> AsyncSlackReminderSender:
+    return AsyncSlackReminderSender(client=async_client)
+
+
+def test_async_send_reminder(
+    async_slack_sender: AsyncSlackReminderSender, async_client: mock.AsyncMock, reminder: Reminder
+) -> None:
+    asyncio.run(async_slack_sender.send_reminder(reminder=reminder))
+
+    async_client.chat_postMessage.assert_awaited_once_with(
+        channel=reminder.channel_id_to_notify_in,
+        # used for screen readers, if blocks can't be rendered
+        text=get_reminder_text(reminder=reminder),
+        blocks=get_reminder_blocks(reminder=reminder),
+    )
+
+
+def test_async_skip_reminder(
+    async_slack_sender: AsyncSlackReminderSender, async_client: mock.AsyncMock, reminder: Reminder
+) -> None:
+    asyncio.run(async_slack_sender.send_skip_message(reminder=reminder))
+
+    async_client.chat_postMessage.assert_awaited_once_with(
+        channel=reminder.channel_id_to_notify_in,
+        # used for screen readers, if blocks can't be rendered
+        text=get_skip_text(reminder=reminder),
+        blocks=get_skip_blocks(reminder=reminder),
+    )
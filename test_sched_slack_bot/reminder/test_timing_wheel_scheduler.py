@@ -0,0 +1,158 @@
+import datetime
+import time
+import uuid
+from typing import Generator
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.model.reminder import Reminder
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.reminder.timing_wheel_scheduler import (
+    TimingWheelReminderScheduler,
+    SECONDS_PER_MINUTE,
+    MINUTES_PER_DAY,
+    DAYS_IN_DAY_WHEEL,
+)
+
+# start of a day wheel turn, so all wheels start at their first slot
+START_OF_WHEEL = float(DAYS_IN_DAY_WHEEL * MINUTES_PER_DAY * SECONDS_PER_MINUTE * 10)
+
+
+def _create_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.fixture()
+def reminder_sender() -> mock.MagicMock:
+    return mock.MagicMock(spec=ReminderSender)
+
+
+@pytest.fixture
+def scheduler() -> TimingWheelReminderScheduler:
+    return TimingWheelReminderScheduler()
+
+
+@pytest.fixture
+def mocked_monotonic() -> Generator[mock.MagicMock, None, None]:
+    with mock.patch("sched_slack_bot.reminder.timing_wheel_scheduler.time") as mocked_time:
+        mocked_time.monotonic.return_value = START_OF_WHEEL
+        yield mocked_time.monotonic
+
+
+@pytest.fixture
+def scheduler_without_dispatcher(mocked_monotonic: mock.MagicMock) -> Generator[TimingWheelReminderScheduler, None, None]:
+    # the wheel is advanced by hand in these tests
+    with mock.patch.object(TimingWheelReminderScheduler, "_start_dispatcher_if_necessary"):
+        yield TimingWheelReminderScheduler()
+
+
+def test_schedule_reminder(scheduler: TimingWheelReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(milliseconds=100))
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    while reminder_sender.send_reminder.call_count == 0:
+        # no idle waiting
+        time.sleep(0.05)
+
+    reminder_sender.send_reminder.assert_called_once_with(reminder=Reminder(schedule=schedule))
+    # the next rotation got armed again
+    assert scheduler.pending_reminder_count == 1
+
+
+def test_stop_reminder(scheduler: TimingWheelReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(milliseconds=100))
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+
+    time.sleep(0.3)
+
+    reminder_sender.send_reminder.assert_not_called()
+    assert scheduler.pending_reminder_count == 0
+
+
+def test_remove_unknown_reminder_raises(scheduler: TimingWheelReminderScheduler) -> None:
+    with pytest.raises(KeyError):
+        scheduler.remove_reminder_for_schedule(schedule_id="unknown")
+
+
+@pytest.mark.parametrize(
+    "time_until_due, wheel_name",
+    [
+        (datetime.timedelta(minutes=5), "_minute_wheel"),
+        (datetime.timedelta(hours=5), "_hour_wheel"),
+        (datetime.timedelta(days=5), "_day_wheel"),
+        (datetime.timedelta(days=DAYS_IN_DAY_WHEEL + 5), "_overflow"),
+    ],
+)
+def test_reminders_are_placed_in_matching_wheel(
+    scheduler_without_dispatcher: TimingWheelReminderScheduler,
+    reminder_sender: mock.MagicMock,
+    time_until_due: datetime.timedelta,
+    wheel_name: str,
+) -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime.now() + time_until_due)
+    scheduler_without_dispatcher.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+
+    wheel = getattr(scheduler_without_dispatcher, wheel_name)
+    slots = [wheel] if isinstance(wheel, dict) else wheel
+    assert sum(len(slot) for slot in slots) == 1
+
+    scheduler_without_dispatcher.remove_reminder_for_schedule(schedule_id=schedule.id)
+    assert sum(len(slot) for slot in slots) == 0
+
+
+def test_reminders_are_cascaded_and_due_in_order(
+    scheduler_without_dispatcher: TimingWheelReminderScheduler, reminder_sender: mock.MagicMock
+) -> None:
+    now = datetime.datetime.now()
+    times_until_due = [
+        datetime.timedelta(days=DAYS_IN_DAY_WHEEL + 3, minutes=1),
+        datetime.timedelta(days=3, hours=2, minutes=7),
+        datetime.timedelta(hours=7, minutes=59),
+        datetime.timedelta(minutes=2),
+    ]
+    schedules = [_create_schedule(next_rotation=now + t) for t in times_until_due]
+    scheduler_without_dispatcher.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+    for schedule, time_until_due in reversed(list(zip(schedules, times_until_due))):
+        seconds_until_due = (schedule.next_rotation - now).total_seconds()
+
+        assert scheduler_without_dispatcher._advance(now=START_OF_WHEEL + seconds_until_due - 1) == []
+
+        due_entries = scheduler_without_dispatcher._advance(now=START_OF_WHEEL + seconds_until_due + 1)
+        assert [e.reminder for e in due_entries] == [Reminder(schedule=schedule)]
+
+    assert scheduler_without_dispatcher.pending_reminder_count == 0
+
+
+def test_overdue_reminders_are_all_returned(
+    scheduler_without_dispatcher: TimingWheelReminderScheduler, reminder_sender: mock.MagicMock
+) -> None:
+    now = datetime.datetime.now()
+    schedules = [_create_schedule(next_rotation=now + datetime.timedelta(minutes=m)) for m in [90, 3, 30]]
+    scheduler_without_dispatcher.schedule_all_reminders(schedules=schedules, reminder_sender=reminder_sender)
+
+    due_entries = scheduler_without_dispatcher._advance(now=START_OF_WHEEL + 2 * 60 * 60)
+
+    assert [e.reminder.schedule_id for e in due_entries] == [schedules[1].id, schedules[2].id, schedules[0].id]
+
+
+def test_has_reminder_for_schedule(scheduler: TimingWheelReminderScheduler, reminder_sender: mock.MagicMock) -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime.now() + datetime.timedelta(days=1))
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.schedule_reminder(schedule=schedule, reminder_sender=reminder_sender)
+    assert scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
+
+    scheduler.remove_reminder_for_schedule(schedule_id=schedule.id)
+    assert not scheduler.has_reminder_for_schedule(schedule_id=schedule.id)
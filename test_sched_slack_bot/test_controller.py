@@ -1,8 +1,11 @@
+import asyncio
 import dataclasses
 import datetime
+import json
 import os
+import threading
 import uuid
-from typing import List
+from typing import List, Optional
 from unittest import mock
 
 import pytest
@@ -10,13 +13,27 @@ from slack_bolt import App
 from slack_sdk import WebClient
 
 from sched_slack_bot.controller import AppController, UnstartedControllerException
+from sched_slack_bot.data.async_schedule_access import AsyncScheduleAccess
+from sched_slack_bot.data.cached_schedule_access import CachedScheduleAccess
 from sched_slack_bot.data.schedule_access import ScheduleAccess
+from sched_slack_bot.model.app_home_state import AppHomeState
 from sched_slack_bot.model.reminder import Reminder
 from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.reminder.async_scheduler import AsyncReminderScheduler
+from sched_slack_bot.reminder.executor import ReminderExecutor
+from sched_slack_bot.reminder.horizon import ReminderHorizon
+from sched_slack_bot.reminder.sharded_scheduler import ShardedReminderScheduler
 from sched_slack_bot.reminder.scheduler import ReminderScheduler
-from sched_slack_bot.reminder.sender import ReminderSender
+from sched_slack_bot.reminder.sender import ReminderSender, AsyncReminderSender
+from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past
 from sched_slack_bot.utils.slack_typing_stubs import SlackEvent, SlackBody, SlackBodyUser, SlackView, SlackState, SlackAction
-from sched_slack_bot.views.app_home import get_app_home_view
+from sched_slack_bot.views.app_home import (
+    get_app_home_view,
+    SCHEDULES_PER_PAGE,
+    SCHEDULE_PAGE_BLOCK_ID,
+    NEXT_PAGE_ACTION_ID,
+)
 from sched_slack_bot.views.schedule_blocks import DELETE_SCHEDULE_ACTION_ID, EDIT_SCHEDULE_ACTION_ID
 from sched_slack_bot.views.schedule_dialog import get_edit_schedule_block, ScheduleDialogCallback
 
@@ -109,19 +126,322 @@ def test_controller_fails_without_required_environment_variables(
 def test_start_all_saved_schedules_saves_fixed_schedules(
     controller_with_mocks: AppController, schedule: Schedule, mocked_schedule_access: mock.MagicMock
 ) -> None:
-    mocked_schedule_access.get_available_schedules.return_value = [schedule]
+    schedule_in_the_past = dataclasses.replace(
+        schedule, id="past", next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1)
+    )
+    mocked_schedule_access.iter_schedules.return_value = iter([schedule, schedule_in_the_past])
 
     controller_with_mocks._start_all_saved_schedules()
 
-    mocked_schedule_access.update_schedule.assert_called_once_with(schedule_id_to_update=schedule.id, new_schedule=schedule)
+    mocked_schedule_access.bulk_update_schedules.assert_called_once_with(
+        schedules=[fix_schedule_from_the_past(schedule=schedule_in_the_past)]
+    )
+    mocked_schedule_access.update_schedule.assert_not_called()
+
+
+def test_start_all_saved_schedules_starts_schedules_in_batches(
+    controller_with_mocks: AppController,
+    schedule: Schedule,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_reminder_scheduler: mock.MagicMock,
+) -> None:
+    schedules = [dataclasses.replace(schedule, id=str(i)) for i in range(5)]
+    mocked_schedule_access.iter_schedules.return_value = iter(schedules)
+
+    with mock.patch("sched_slack_bot.controller.SAVED_SCHEDULES_BATCH_SIZE", 2):
+        controller_with_mocks._start_all_saved_schedules()
+
+    started_batches = [c.kwargs["schedules"] for c in mocked_reminder_scheduler.schedule_all_reminders.call_args_list]
+    assert started_batches == [schedules[0:2], schedules[2:4], schedules[4:]]
+
+
+def test_start_all_saved_schedules_writes_nothing_without_fixed_schedules(
+    controller_with_mocks: AppController, schedule: Schedule, mocked_schedule_access: mock.MagicMock
+) -> None:
+    mocked_schedule_access.iter_schedules.return_value = iter([schedule])
+
+    controller_with_mocks._start_all_saved_schedules()
+
+    mocked_schedule_access.bulk_update_schedules.assert_not_called()
+
+
+def test_start_all_saved_schedules_only_loads_schedules_within_horizon(
+    controller_with_mocks: AppController,
+    schedule: Schedule,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_reminder_scheduler: mock.MagicMock,
+    mocked_reminder_sender: mock.MagicMock,
+) -> None:
+    reminder_horizon = mock.MagicMock(spec=ReminderHorizon)
+    controller_with_mocks._reminder_horizon = reminder_horizon
+    mocked_schedule_access.get_schedules_due_before.return_value = [schedule]
+
+    controller_with_mocks._start_all_saved_schedules()
+
+    mocked_schedule_access.iter_schedules.assert_not_called()
+    mocked_schedule_access.get_schedules_due_before.assert_called_once_with(before=reminder_horizon.due_before)
+    mocked_reminder_scheduler.schedule_all_reminders.assert_called_once_with(
+        schedules=[schedule], reminder_sender=mocked_reminder_sender
+    )
+    reminder_horizon.start.assert_called_once_with(refill=controller_with_mocks._start_reminders_due_before)
+
+
+def test_stop_leaves_the_replica_ring_and_stops_the_reminder_horizon(controller_with_mocks: AppController) -> None:
+    sharded_reminder_scheduler = mock.MagicMock(spec=ShardedReminderScheduler)
+    reminder_horizon = mock.MagicMock(spec=ReminderHorizon)
+    controller_with_mocks._reminder_scheduler = sharded_reminder_scheduler
+    controller_with_mocks._reminder_horizon = reminder_horizon
+
+    controller_with_mocks.stop()
+
+    sharded_reminder_scheduler.stop.assert_called_once()
+    reminder_horizon.stop.assert_called_once()
+
+
+def test_start_reminders_due_before_skips_armed_and_due_schedules(
+    controller_with_mocks: AppController,
+    schedule: Schedule,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_reminder_scheduler: mock.MagicMock,
+    mocked_reminder_sender: mock.MagicMock,
+) -> None:
+    armed_schedule = dataclasses.replace(schedule, id="armed")
+    mocked_schedule_access.get_schedules_due_between.return_value = [schedule, armed_schedule]
+    mocked_reminder_scheduler.has_reminder_for_schedule.side_effect = lambda schedule_id: schedule_id == "armed"
+    before = datetime.datetime.now() + datetime.timedelta(hours=1)
+
+    earliest_start = datetime.datetime.now()
+
+    controller_with_mocks._start_reminders_due_before(before=before)
+
+    # already due schedules are not loaded at all
+    mocked_schedule_access.get_schedules_due_between.assert_called_once_with(start=mock.ANY, end=before)
+    assert earliest_start <= mocked_schedule_access.get_schedules_due_between.call_args.kwargs["start"] < before
+    mocked_reminder_scheduler.schedule_all_reminders.assert_called_once_with(
+        schedules=[schedule], reminder_sender=mocked_reminder_sender
+    )
+
+
+def test_start_reminders_due_before_loads_schedules_with_async_access_on_the_loop(
+    controller_with_mocks: AppController, schedule: Schedule, mocked_schedule_access: mock.MagicMock
+) -> None:
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    async_reminder_sender = mock.AsyncMock(spec=AsyncReminderSender)
+    async_schedule_access = mock.AsyncMock(spec=AsyncScheduleAccess)
+    async_schedule_access.get_schedules_due_between.return_value = [schedule]
+    async_reminder_scheduler = mock.MagicMock(spec=AsyncReminderScheduler)
+    async_reminder_scheduler.has_reminder_for_schedule.return_value = False
+    controller_with_mocks._async_reminder_sender = async_reminder_sender
+    controller_with_mocks._async_schedule_access = async_schedule_access
+    controller_with_mocks._async_reminder_scheduler = async_reminder_scheduler
+    controller_with_mocks._event_loop = loop
+    before = datetime.datetime.now() + datetime.timedelta(hours=1)
+
+    try:
+        controller_with_mocks._start_reminders_due_before(before=before)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        loop.close()
+
+    async_schedule_access.get_schedules_due_between.assert_awaited_once_with(start=mock.ANY, end=before)
+    async_reminder_scheduler.schedule_all_reminders.assert_called_once_with(
+        schedules=[schedule], reminder_sender=async_reminder_sender
+    )
+    mocked_schedule_access.get_schedules_due_between.assert_not_called()
+
+
+def test_start_async_reminder_scheduler_does_nothing_without_async_mode(
+    controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock
+) -> None:
+    asyncio.run(controller_with_mocks.start_async_reminder_scheduler())
+
+    mocked_schedule_access.iter_schedules.assert_not_called()
+
+
+def test_start_async_reminder_scheduler_schedules_saved_schedules_on_loop(
+    controller_with_mocks: AppController,
+    schedule: Schedule,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_reminder_scheduler: mock.MagicMock,
+) -> None:
+    async_reminder_sender = mock.AsyncMock(spec=AsyncReminderSender)
+    controller_with_mocks._async_reminder_sender = async_reminder_sender
+    mocked_schedule_access.iter_schedules.return_value = iter([schedule])
+
+    with mock.patch("sched_slack_bot.controller.AsyncReminderScheduler") as mocked_async_scheduler:
+        asyncio.run(controller_with_mocks.start_async_reminder_scheduler())
+
+    mocked_async_scheduler.return_value.schedule_all_reminders.assert_called_once_with(
+        schedules=[schedule], reminder_sender=async_reminder_sender
+    )
+    mocked_reminder_scheduler.schedule_all_reminders.assert_not_called()
+
+
+def test_start_async_reminder_scheduler_loads_schedules_with_async_access(
+    controller_with_mocks: AppController,
+    schedule: Schedule,
+    mocked_schedule_access: mock.MagicMock,
+) -> None:
+    async_reminder_sender = mock.AsyncMock(spec=AsyncReminderSender)
+    async_schedule_access = mock.AsyncMock(spec=AsyncScheduleAccess)
+    controller_with_mocks._async_reminder_sender = async_reminder_sender
+    controller_with_mocks._async_schedule_access = async_schedule_access
+    schedule_in_the_past = dataclasses.replace(
+        schedule, id="past", next_rotation=datetime.datetime.now() - datetime.timedelta(minutes=1)
+    )
+    async_schedule_access.get_available_schedules.return_value = [schedule, schedule_in_the_past]
+
+    with mock.patch("sched_slack_bot.controller.AsyncReminderScheduler") as mocked_async_scheduler:
+        asyncio.run(controller_with_mocks.start_async_reminder_scheduler())
+
+    fixed_schedule = fix_schedule_from_the_past(schedule=schedule_in_the_past)
+    async_schedule_access.bulk_update_schedules.assert_awaited_once_with(schedules=[fixed_schedule])
+    mocked_async_scheduler.assert_called_once_with(
+        loop=mock.ANY,
+        reminder_executed_callback=controller_with_mocks.handle_reminder_executed_async,
+        reminder_horizon=None,
+    )
+    mocked_async_scheduler.return_value.schedule_all_reminders.assert_called_once_with(
+        schedules=[schedule, fixed_schedule], reminder_sender=async_reminder_sender
+    )
+    mocked_schedule_access.get_available_schedules.assert_not_called()
+
+
+@pytest.mark.parametrize("advanced", [True, False])
+def test_handle_reminder_executed_async_advances_rotation(
+    controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock, schedule: Schedule, advanced: bool
+) -> None:
+    async_schedule_access = mock.AsyncMock(spec=AsyncScheduleAccess)
+    async_schedule_access.advance_rotation.return_value = advanced
+    controller_with_mocks._async_schedule_access = async_schedule_access
+    next_schedule = schedule.next_schedule
+
+    asyncio.run(controller_with_mocks.handle_reminder_executed_async(next_schedule=next_schedule))
+
+    async_schedule_access.advance_rotation.assert_awaited_once_with(
+        schedule_id=schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedule.version,
+    )
+    mocked_schedule_access.advance_rotation.assert_not_called()
+
+
+@pytest.mark.parametrize("advanced", [True, False])
+def test_handle_reminder_executed_async_updates_schedule_cache(
+    controller_with_mocks: AppController, schedule: Schedule, advanced: bool
+) -> None:
+    async_schedule_access = mock.AsyncMock(spec=AsyncScheduleAccess)
+    async_schedule_access.advance_rotation.return_value = advanced
+    schedule_cache = mock.MagicMock(spec=CachedScheduleAccess)
+    controller_with_mocks._async_schedule_access = async_schedule_access
+    controller_with_mocks._schedule_cache = schedule_cache
+    next_schedule = schedule.next_schedule
+
+    asyncio.run(controller_with_mocks.handle_reminder_executed_async(next_schedule=next_schedule))
+
+    schedule_cache.apply_advanced_rotation.assert_called_once_with(
+        schedule_id=schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedule.version,
+        advanced=advanced,
+    )
+
+
+def test_handle_reminder_executed_async_raises_without_async_access(
+    controller_with_mocks: AppController, schedule: Schedule
+) -> None:
+    with pytest.raises(UnstartedControllerException):
+        asyncio.run(controller_with_mocks.handle_reminder_executed_async(next_schedule=schedule))
+
+
+def test_get_metrics_without_reminder_executor(controller_with_mocks: AppController) -> None:
+    assert controller_with_mocks.get_metrics() == {
+        "app_home_publisher": {"requested": 0, "published": 0, "coalesced": 0, "unchanged": 0, "failed": 0}
+    }
+
+
+def test_get_metrics_contains_reminder_executor_metrics(controller_with_mocks: AppController) -> None:
+    controller_with_mocks._reminder_executor = ReminderExecutor(max_workers=1, max_queue_size=1)
+
+    assert controller_with_mocks.get_metrics()["reminder_executor"]["submitted"] == 0
+
+
+def test_get_metrics_contains_schedule_cache_metrics(
+    controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock
+) -> None:
+    controller_with_mocks._schedule_cache = CachedScheduleAccess(schedule_access=mocked_schedule_access)
+
+    assert controller_with_mocks.get_metrics()["schedule_cache"] == {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def test_get_members_on_duty_loads_the_stored_schedules_once_per_reload_interval(
+    controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock, schedule: Schedule
+) -> None:
+    mocked_schedule_access.iter_schedules.return_value = iter([schedule])
+
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {schedule.id: "U1"}
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation + schedule.time_between_rotations) == {
+        schedule.id: "U2"
+    }
+    mocked_schedule_access.iter_schedules.assert_called_once()
+
+    # changes of other replicas are picked up with the next reload
+    mocked_schedule_access.iter_schedules.return_value = iter([])
+    controller_with_mocks._rotation_calendar_loaded_at = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(
+        minutes=1
+    )
+
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {}
+    assert mocked_schedule_access.iter_schedules.call_count == 2
+
+
+def test_get_members_on_duty_contains_the_changes_of_this_process(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.iter_schedules.return_value = iter([])
+    mocked_schedule_access.get_sorted_schedules_page.return_value = []
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {}
+
+    with mock.patch("sched_slack_bot.controller.Schedule.from_modal_submission") as mocked_from_model_submission:
+        mocked_from_model_submission.return_value = schedule
+        controller_with_mocks.handle_submitted_create_schedule(ack=mock.MagicMock(), body=slack_body)
+
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {schedule.id: "U1"}
+
+    mocked_schedule_access.advance_rotation.return_value = True
+    controller_with_mocks.handle_reminder_executed(next_schedule=dataclasses.replace(schedule, current_index=1))
+
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {schedule.id: "U2"}
+
+    slack_body["actions"] = [SlackAction(action_id=DELETE_SCHEDULE_ACTION_ID, block_id=f"{schedule.id}_delete", value="")]
+    controller_with_mocks.handle_clicked_delete_button(ack=mock.MagicMock(), body=slack_body)
+
+    assert controller_with_mocks.get_members_on_duty(at=schedule.next_rotation) == {}
+    mocked_schedule_access.iter_schedules.assert_called_once()
 
 
 def test_handle_reminder_executed_saves_updated_schedule(
     controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock, schedule: Schedule
 ) -> None:
-    controller_with_mocks.handle_reminder_executed(next_schedule=schedule)
+    next_schedule = schedule.next_schedule
 
-    mocked_schedule_access.update_schedule.assert_called_once_with(schedule_id_to_update=schedule.id, new_schedule=schedule)
+    controller_with_mocks.handle_reminder_executed(next_schedule=next_schedule)
+
+    mocked_schedule_access.advance_rotation.assert_called_once_with(
+        schedule_id=schedule.id,
+        next_rotation=next_schedule.next_rotation,
+        current_index=next_schedule.current_index,
+        expected_version=schedule.version,
+    )
+    mocked_schedule_access.update_schedule.assert_not_called()
 
 
 def test_app_home_opened_opens_app_home(
@@ -130,7 +450,7 @@ def test_app_home_opened_opens_app_home(
     mocked_slack_client: mock.MagicMock,
     schedule: Schedule,
 ) -> None:
-    mocked_schedule_access.get_available_schedules.return_value = [schedule]
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
     user = "someUser"
     event = SlackEvent(user=user)
 
@@ -139,8 +459,321 @@ def test_app_home_opened_opens_app_home(
     assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user)
 
 
-def assert_published_home_view(mocked_slack_client: mock.MagicMock, schedules: List[Schedule], user: str) -> None:
-    mocked_slack_client.views_publish.assert_called_once_with(user_id=user, view=get_app_home_view(schedules=schedules))
+def test_app_home_opened_again_publishes_only_changed_views(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    user = "someUser"
+
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user))
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user))
+
+    assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user)
+
+    mocked_slack_client.reset_mock()
+    renamed_schedule = dataclasses.replace(schedule, display_name="Renamed Schedule")
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [renamed_schedule]
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user))
+
+    assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[renamed_schedule], user=user)
+    assert controller_with_mocks.get_metrics()["app_home_publisher"] == {
+        "requested": 3,
+        "published": 2,
+        "coalesced": 0,
+        "unchanged": 1,
+        "failed": 0,
+    }
+
+
+def test_app_home_opened_migrates_schedules_created_by_user_name_once(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    mocked_slack_client.users_info.return_value = {"user": {"id": "U1", "name": "some.user"}}
+
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user="U1"))
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user="U1"))
+
+    mocked_slack_client.users_info.assert_called_once_with(user="U1")
+    mocked_schedule_access.migrate_created_by.assert_called_once_with(user_name="some.user", user_id="U1")
+
+
+def test_app_home_opened_without_user_name_still_publishes(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    mocked_slack_client.users_info.side_effect = RuntimeError("missing_scope")
+
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user="U1"))
+
+    mocked_schedule_access.migrate_created_by.assert_not_called()
+    assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user="U1")
+
+
+def assert_published_home_view(
+    mocked_slack_client: mock.MagicMock,
+    schedules: List[Schedule],
+    user: str,
+    show_all_schedules: bool = False,
+    sort_order: ScheduleSortOrder = ScheduleSortOrder.NEXT_ROTATION,
+    previous_page_cursor: Optional[SchedulePageCursor] = None,
+    next_page_cursor: Optional[SchedulePageCursor] = None,
+    cursor: Optional[SchedulePageCursor] = None,
+) -> None:
+    state = AppHomeState(show_all_schedules=show_all_schedules, sort_order=sort_order, cursor=cursor)
+    mocked_slack_client.views_publish.assert_called_once_with(
+        user_id=user,
+        view=get_app_home_view(
+            schedules=schedules,
+            show_all_schedules=show_all_schedules,
+            sort_order=sort_order,
+            previous_page_cursor=previous_page_cursor,
+            next_page_cursor=next_page_cursor,
+            private_metadata=state.as_private_metadata(),
+        ).to_dict(),
+    )
+
+
+def get_published_view(mocked_slack_client: mock.MagicMock) -> SlackView:
+    # slack sends the published view back with every action on the app home
+    view = mocked_slack_client.views_publish.call_args.kwargs["view"]
+
+    return SlackView(id="home", private_metadata=view["private_metadata"])
+
+
+def test_app_home_shows_schedules_of_user(
+    controller_with_mocks: AppController, mocked_schedule_access: mock.MagicMock, schedule: Schedule
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user="someUser"))
+
+    mocked_schedule_access.get_sorted_schedules_page.assert_called_once_with(
+        sort_order=ScheduleSortOrder.NEXT_ROTATION, limit=SCHEDULES_PER_PAGE + 1, cursor=None, user_id="someUser"
+    )
+
+
+def test_app_home_can_be_switched_between_all_and_own_schedules(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    other_schedule = dataclasses.replace(schedule, id="other", members=["U9"], created_by="U9")
+    mocked_schedule_access.get_sorted_schedules_page.side_effect = lambda sort_order, limit, cursor, user_id: (
+        [schedule, other_schedule] if user_id is None else [schedule]
+    )
+    user = slack_body["user"]["id"]
+    ack = mock.MagicMock()
+
+    controller_with_mocks.handle_clicked_show_all_schedules(ack=ack, body=slack_body)
+
+    ack.assert_called_once()
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client, schedules=[schedule, other_schedule], user=user, show_all_schedules=True
+    )
+
+    # the choice is kept for later updates of the app home, so the view is unchanged and not published again
+    view = get_published_view(mocked_slack_client=mocked_slack_client)
+    mocked_slack_client.reset_mock()
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user, view=view))
+    mocked_slack_client.views_publish.assert_not_called()
+
+    mocked_slack_client.reset_mock()
+    controller_with_mocks.handle_clicked_show_my_schedules(ack=ack, body=slack_body)
+    assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user)
+
+
+def test_app_home_can_be_sorted_by_name(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    user = slack_body["user"]["id"]
+    ack = mock.MagicMock()
+
+    controller_with_mocks.handle_clicked_sort_by_display_name(ack=ack, body=slack_body)
+
+    ack.assert_called_once()
+    mocked_schedule_access.get_sorted_schedules_page.assert_called_once_with(
+        sort_order=ScheduleSortOrder.DISPLAY_NAME, limit=SCHEDULES_PER_PAGE + 1, cursor=None, user_id=user
+    )
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user, sort_order=ScheduleSortOrder.DISPLAY_NAME
+    )
+
+    mocked_slack_client.reset_mock()
+    controller_with_mocks.handle_clicked_sort_by_next_rotation(ack=ack, body=slack_body)
+    assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user)
+
+
+def test_app_home_continues_from_the_state_of_the_clicked_view(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    # the state was published by another replica, this one has never seen the user
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    user = slack_body["user"]["id"]
+    state = AppHomeState(show_all_schedules=True, sort_order=ScheduleSortOrder.DISPLAY_NAME)
+    slack_body["view"] = SlackView(id="home", private_metadata=state.as_private_metadata())
+
+    controller_with_mocks.handle_clicked_show_my_schedules(ack=mock.MagicMock(), body=slack_body)
+
+    mocked_schedule_access.get_sorted_schedules_page.assert_called_once_with(
+        sort_order=ScheduleSortOrder.DISPLAY_NAME, limit=SCHEDULES_PER_PAGE + 1, cursor=None, user_id=user
+    )
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client, schedules=[schedule], user=user, sort_order=ScheduleSortOrder.DISPLAY_NAME
+    )
+
+
+def test_schedule_dialog_passes_the_app_home_state_on_to_its_submission(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    state = AppHomeState(show_all_schedules=True)
+    slack_body["view"] = SlackView(id="home", private_metadata=state.as_private_metadata())
+
+    controller_with_mocks.handle_clicked_create_schedule(ack=mock.MagicMock(), body=slack_body)
+
+    dialog = mocked_slack_client.views_open.call_args.kwargs["view"]
+    assert AppHomeState.from_view(view=SlackView(private_metadata=dialog["private_metadata"])) == state
+
+
+def _create_page_schedules(schedule: Schedule, count: int) -> List[Schedule]:
+    return [
+        dataclasses.replace(schedule, id=f"{i:03d}", next_rotation=schedule.next_rotation + datetime.timedelta(hours=i))
+        for i in range(count)
+    ]
+
+
+def _get_page_button_value(mocked_slack_client: mock.MagicMock, action_id: str) -> str:
+    blocks = mocked_slack_client.views_publish.call_args.kwargs["view"]["blocks"]
+    buttons = [e for b in blocks if b.get("block_id") == SCHEDULE_PAGE_BLOCK_ID for e in b["elements"]]
+
+    value: str = next(b["value"] for b in buttons if b["action_id"] == action_id)
+
+    return value
+
+
+def test_app_home_is_paged(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    schedules = _create_page_schedules(schedule=schedule, count=SCHEDULES_PER_PAGE + 1)
+    mocked_schedule_access.get_sorted_schedules_page.return_value = schedules
+    user = slack_body["user"]["id"]
+
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user))
+
+    # the additional schedule is only loaded to know that there is a next page
+    next_page_cursor = SchedulePageCursor.after(schedule=schedules[-2], sort_order=ScheduleSortOrder.NEXT_ROTATION)
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client,
+        schedules=schedules[:-1],
+        user=user,
+        next_page_cursor=next_page_cursor,
+    )
+
+    mocked_schedule_access.get_sorted_schedules_page.reset_mock()
+    mocked_schedule_access.get_sorted_schedules_page.return_value = schedules[-1:]
+    value = _get_page_button_value(mocked_slack_client=mocked_slack_client, action_id=NEXT_PAGE_ACTION_ID)
+    view = get_published_view(mocked_slack_client=mocked_slack_client)
+    mocked_slack_client.reset_mock()
+    ack = mock.MagicMock()
+
+    controller_with_mocks.handle_clicked_change_page(
+        ack=ack,
+        body=SlackBody(
+            user=slack_body["user"],
+            view=view,
+            actions=[SlackAction(action_id=NEXT_PAGE_ACTION_ID, value=value)],
+        ),
+    )
+
+    ack.assert_called_once()
+    mocked_schedule_access.get_sorted_schedules_page.assert_called_once_with(
+        sort_order=ScheduleSortOrder.NEXT_ROTATION, limit=SCHEDULES_PER_PAGE + 1, cursor=next_page_cursor, user_id=user
+    )
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client,
+        schedules=schedules[-1:],
+        user=user,
+        previous_page_cursor=SchedulePageCursor.before(schedule=schedules[-1], sort_order=ScheduleSortOrder.NEXT_ROTATION),
+        cursor=next_page_cursor,
+    )
+
+    # later updates keep showing the page, also on replicas which did not handle the click
+    view = get_published_view(mocked_slack_client=mocked_slack_client)
+    mocked_schedule_access.get_sorted_schedules_page.reset_mock()
+    controller_with_mocks._app_home_states.clear()
+    controller_with_mocks.handle_app_home_opened(event=SlackEvent(user=user, view=view))
+    assert mocked_schedule_access.get_sorted_schedules_page.call_args.kwargs["cursor"] == next_page_cursor
+
+
+def test_app_home_shows_first_page_if_page_is_empty(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_sorted_schedules_page.side_effect = lambda sort_order, limit, cursor, user_id: (
+        [] if cursor is not None else [schedule]
+    )
+    cursor = SchedulePageCursor.after(schedule=schedule, sort_order=ScheduleSortOrder.DISPLAY_NAME)
+
+    controller_with_mocks.handle_clicked_change_page(
+        ack=mock.MagicMock(),
+        body=SlackBody(
+            user=slack_body["user"],
+            actions=[SlackAction(action_id=NEXT_PAGE_ACTION_ID, value=json.dumps(cursor.as_json()))],
+        ),
+    )
+
+    assert_published_home_view(
+        mocked_slack_client=mocked_slack_client,
+        schedules=[schedule],
+        user=slack_body["user"]["id"],
+        sort_order=ScheduleSortOrder.DISPLAY_NAME,
+    )
+
+
+def test_handle_clicked_change_page_with_unexpected_action(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    mocked_slack_client: mock.MagicMock,
+    slack_body: SlackBody,
+) -> None:
+    controller_with_mocks.handle_clicked_change_page(
+        ack=mock.MagicMock(), body=SlackBody(user=slack_body["user"], actions=[SlackAction(action_id="other")])
+    )
+
+    mocked_schedule_access.get_sorted_schedules_page.assert_not_called()
+    mocked_slack_client.views_publish.assert_not_called()
 
 
 def test_handle_clicked_create_opens_create_schedule_dialog(
@@ -150,14 +783,15 @@ def test_handle_clicked_create_opens_create_schedule_dialog(
     slack_body: SlackBody,
     schedule: Schedule,
 ) -> None:
-    mocked_schedule_access.get_available_schedules.return_value = [schedule]
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
     with mock.patch(target="sched_slack_bot.views.schedule_dialog.uuid", return_value="uuid"):
         ack = mock.MagicMock()
         controller_with_mocks.handle_clicked_create_schedule(ack=ack, body=slack_body)
 
         ack.assert_called_once()
         mocked_slack_client.views_open.assert_called_once_with(
-            trigger_id=slack_body["trigger_id"], view=get_edit_schedule_block()
+            trigger_id=slack_body["trigger_id"],
+            view={**get_edit_schedule_block().to_dict(), "private_metadata": AppHomeState().as_private_metadata()},
         )
 
 
@@ -203,7 +837,10 @@ def test_handle_clicked_edit_schedule_opens_edit_dialog(
         ack.assert_called_once()
         mocked_slack_client.views_open.assert_called_once_with(
             trigger_id=slack_body["trigger_id"],
-            view=get_edit_schedule_block(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG),
+            view={
+                **get_edit_schedule_block(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG).to_dict(),
+                "private_metadata": AppHomeState().as_private_metadata(),
+            },
         )
 
 
@@ -216,7 +853,7 @@ def test_handle_submitted_create_schedule_creates_new_schedule(
     mocked_reminder_sender: mock.MagicMock,
     schedule: Schedule,
 ) -> None:
-    mocked_schedule_access.get_available_schedules.return_value = [schedule]
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
     ack = mock.MagicMock()
     with mock.patch("sched_slack_bot.controller.Schedule.from_modal_submission") as mocked_from_model_submission:
         mocked_from_model_submission.return_value = schedule
@@ -230,6 +867,26 @@ def test_handle_submitted_create_schedule_creates_new_schedule(
     assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=slack_body["user"]["id"])
 
 
+def test_handle_submitted_create_schedule_beyond_the_horizon_arms_no_reminder(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    slack_body: SlackBody,
+    mocked_reminder_scheduler: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    reminder_horizon = mock.MagicMock(spec=ReminderHorizon)
+    reminder_horizon.contains.return_value = False
+    controller_with_mocks._reminder_horizon = reminder_horizon
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    with mock.patch("sched_slack_bot.controller.Schedule.from_modal_submission") as mocked_from_model_submission:
+        mocked_from_model_submission.return_value = schedule
+        controller_with_mocks.handle_submitted_create_schedule(ack=mock.MagicMock(), body=slack_body)
+
+    mocked_schedule_access.save_schedule.assert_called_once_with(schedule=schedule)
+    reminder_horizon.contains.assert_called_once_with(date=schedule.next_rotation)
+    mocked_reminder_scheduler.schedule_reminder.assert_not_called()
+
+
 def test_handle_submitted_edit_schedule_updates_existing_schedule(
     controller_with_mocks: AppController,
     mocked_schedule_access: mock.MagicMock,
@@ -239,7 +896,10 @@ def test_handle_submitted_edit_schedule_updates_existing_schedule(
     mocked_reminder_sender: mock.MagicMock,
     schedule: Schedule,
 ) -> None:
-    mocked_schedule_access.get_available_schedules.return_value = [schedule]
+    mocked_schedule_access.get_sorted_schedules_page.return_value = [schedule]
+    # the reminder is armed with the version stored by the update
+    updated_schedule = dataclasses.replace(schedule, version=3)
+    mocked_schedule_access.update_schedule.return_value = updated_schedule
     ack = mock.MagicMock()
 
     with mock.patch("sched_slack_bot.controller.Schedule.from_modal_submission") as mocked_from_model_submission:
@@ -249,12 +909,28 @@ def test_handle_submitted_edit_schedule_updates_existing_schedule(
     mocked_schedule_access.update_schedule.assert_called_once_with(schedule_id_to_update=schedule.id, new_schedule=schedule)
     mocked_reminder_scheduler.remove_reminder_for_schedule.assert_called_once_with(schedule_id=schedule.id)
     mocked_reminder_scheduler.schedule_reminder.assert_called_once_with(
-        schedule=schedule, reminder_sender=mocked_reminder_sender
+        schedule=updated_schedule, reminder_sender=mocked_reminder_sender
     )
     ack.assert_called_once()
     assert_published_home_view(mocked_slack_client=mocked_slack_client, schedules=[schedule], user=slack_body["user"]["id"])
 
 
+def test_handle_submitted_edit_of_deleted_schedule_arms_no_reminder(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    slack_body: SlackBody,
+    mocked_reminder_scheduler: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.update_schedule.return_value = None
+
+    with mock.patch("sched_slack_bot.controller.Schedule.from_modal_submission") as mocked_from_model_submission:
+        mocked_from_model_submission.return_value = schedule
+        controller_with_mocks.handle_submitted_edit_schedule(ack=mock.MagicMock(), body=slack_body)
+
+    mocked_reminder_scheduler.schedule_reminder.assert_not_called()
+
+
 def test_handle_delete_does_nothing_without_schedule(
     controller_with_mocks: AppController,
     mocked_schedule_access: mock.MagicMock,
@@ -299,6 +975,22 @@ def test_handle_delete_does_nothing_with_wrong_action(
     mocked_reminder_scheduler.remove_reminder_for_schedule.assert_not_called()
 
 
+def test_handle_delete_does_not_remove_unarmed_reminder(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    slack_body: SlackBody,
+    mocked_reminder_scheduler: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    slack_body["actions"] = [SlackAction(action_id=DELETE_SCHEDULE_ACTION_ID, block_id=schedule.id)]
+    mocked_reminder_scheduler.has_reminder_for_schedule.return_value = False
+
+    controller_with_mocks.handle_clicked_delete_button(ack=mock.MagicMock(), body=slack_body)
+
+    mocked_schedule_access.delete_schedule.assert_called_once_with(schedule_id=schedule.id)
+    mocked_reminder_scheduler.remove_reminder_for_schedule.assert_not_called()
+
+
 def test_handle_delete_deletes_matching_schedule(
     controller_with_mocks: AppController,
     mocked_schedule_access: mock.MagicMock,
@@ -332,7 +1024,7 @@ def test_handle_skip_does_nothing_without_schedule(
 
     ack.assert_called_once()
 
-    mocked_schedule_access.update_schedule.assert_not_called()
+    mocked_schedule_access.advance_rotation.assert_not_called()
 
 
 def test_handle_skip_does_nothing_without_matching_schedule(
@@ -350,7 +1042,7 @@ def test_handle_skip_does_nothing_without_matching_schedule(
 
     ack.assert_called_once()
 
-    mocked_schedule_access.update_schedule.assert_not_called()
+    mocked_schedule_access.advance_rotation.assert_not_called()
 
 
 def test_handle_skip_skips_matching_schedule(
@@ -362,7 +1054,7 @@ def test_handle_skip_skips_matching_schedule(
     mocked_reminder_scheduler: mock.MagicMock,
     schedule: Schedule,
 ) -> None:
-    schedule_with_skipped_index = dataclasses.replace(schedule, current_index=schedule.next_index)
+    schedule_with_skipped_index = dataclasses.replace(schedule, current_index=schedule.next_index, version=1)
 
     mocked_schedule_access.get_schedule.return_value = schedule
     slack_body["actions"] = [SlackAction(action_id="SKIP", block_id=schedule.id)]
@@ -372,10 +1064,31 @@ def test_handle_skip_skips_matching_schedule(
     ack.assert_called_once()
 
     mocked_reminder_sender.send_skip_message.assert_called_once_with(reminder=Reminder(schedule))
-    mocked_schedule_access.update_schedule.assert_called_once_with(
-        schedule_id_to_update=schedule.id, new_schedule=schedule_with_skipped_index
+    mocked_schedule_access.advance_rotation.assert_called_once_with(
+        schedule_id=schedule.id,
+        next_rotation=schedule.next_rotation,
+        current_index=schedule.next_index,
+        expected_version=schedule.version,
     )
     mocked_reminder_scheduler.remove_reminder_for_schedule.assert_called_once_with(schedule_id=schedule.id)
     mocked_reminder_scheduler.schedule_reminder.assert_called_once_with(
         schedule=schedule_with_skipped_index, reminder_sender=mocked_reminder_sender
     )
+
+
+def test_handle_skip_does_nothing_for_concurrently_changed_schedule(
+    controller_with_mocks: AppController,
+    mocked_schedule_access: mock.MagicMock,
+    slack_body: SlackBody,
+    mocked_reminder_sender: mock.MagicMock,
+    mocked_reminder_scheduler: mock.MagicMock,
+    schedule: Schedule,
+) -> None:
+    mocked_schedule_access.get_schedule.return_value = schedule
+    mocked_schedule_access.advance_rotation.return_value = False
+    slack_body["actions"] = [SlackAction(action_id="SKIP", block_id=schedule.id)]
+
+    controller_with_mocks.handle_clicked_confirm_skip(ack=mock.MagicMock(), body=slack_body)
+
+    mocked_reminder_sender.send_skip_message.assert_not_called()
+    mocked_reminder_scheduler.schedule_reminder.assert_not_called()
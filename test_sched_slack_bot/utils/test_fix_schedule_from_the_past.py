@@ -1,3 +1,4 @@
+import dataclasses
 import datetime
 from typing import Generator
 from unittest import mock
@@ -5,7 +6,7 @@ from unittest import mock
 import pytest
 
 from sched_slack_bot.model.schedule import Schedule
-from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past
+from sched_slack_bot.utils.fix_schedule_from_the_past import fix_schedule_from_the_past, fix_schedules_from_the_past
 
 
 @pytest.fixture()
@@ -65,3 +66,45 @@ def test_it_correctly_fixes_schedule_in_the_past(schedule_in_the_past: Schedule,
 
 def test_it_doesnt_change_schedule_in_the_future(schedule_in_the_future: Schedule) -> None:
     assert fix_schedule_from_the_past(schedule=schedule_in_the_future) == schedule_in_the_future
+
+
+def test_it_fixes_many_missed_rotations_at_once(schedule_in_the_past: Schedule, datetime_now: datetime.datetime) -> None:
+    schedule = dataclasses.replace(
+        schedule_in_the_past,
+        next_rotation=datetime_now - datetime.timedelta(days=30, seconds=30),
+        time_between_rotations=datetime.timedelta(minutes=1),
+    )
+
+    fixed_schedule = fix_schedule_from_the_past(schedule=schedule)
+
+    assert fixed_schedule.next_rotation == datetime_now + datetime.timedelta(seconds=30)
+    assert fixed_schedule.current_index == schedule.current_index
+
+
+def test_rotation_due_right_now_is_moved(schedule_in_the_past: Schedule, datetime_now: datetime.datetime) -> None:
+    schedule = dataclasses.replace(schedule_in_the_past, next_rotation=datetime_now)
+
+    fixed_schedule = fix_schedule_from_the_past(schedule=schedule)
+
+    assert fixed_schedule.next_rotation == datetime_now + schedule.time_between_rotations
+
+
+@pytest.mark.parametrize("missed_rotations, expected_index", [(1, 1), (2, 0), (5, 1)])
+def test_it_advances_index_for_missed_rotations(
+    schedule_in_the_past: Schedule, datetime_now: datetime.datetime, missed_rotations: int, expected_index: int
+) -> None:
+    schedule = dataclasses.replace(
+        schedule_in_the_past,
+        next_rotation=datetime_now - (missed_rotations - 1) * schedule_in_the_past.time_between_rotations,
+    )
+
+    fixed_schedule = fix_schedule_from_the_past(schedule=schedule, advance_index=True)
+
+    assert fixed_schedule.current_index == expected_index
+
+
+def test_it_fixes_all_schedules(schedule_in_the_past: Schedule, schedule_in_the_future: Schedule) -> None:
+    assert fix_schedules_from_the_past(schedules=[schedule_in_the_past, schedule_in_the_future]) == [
+        fix_schedule_from_the_past(schedule=schedule_in_the_past),
+        schedule_in_the_future,
+    ]
@@ -0,0 +1,190 @@
+import dataclasses
+import datetime
+
+import pytest
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.utils.rotation_calendar import RotationCalendar, Rotation
+
+
+@pytest.fixture()
+def next_rotation() -> datetime.datetime:
+    return datetime.datetime(year=2000, month=1, day=3, hour=9)
+
+
+@pytest.fixture
+def schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id="id",
+        display_name="display",
+        members=["first", "second", "third"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(days=7),
+        channel_id_to_notify_in="channelId",
+        created_by="creator",
+        current_index=1,
+    )
+
+
+@pytest.fixture
+def other_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id="other_id",
+        display_name="other display",
+        members=["first", "fourth"],
+        next_rotation=next_rotation + datetime.timedelta(days=2),
+        time_between_rotations=datetime.timedelta(days=3),
+        channel_id_to_notify_in="channelId",
+        created_by="creator",
+        current_index=0,
+    )
+
+
+def _replay_member_on_duty(schedule: Schedule, at: datetime.datetime) -> str:
+    # the reference implementation, advancing the schedule one rotation at a time
+    on_duty = schedule.members[(schedule.current_index - 1) % len(schedule.members)]
+    while schedule.next_rotation <= at:
+        on_duty = schedule.current_user_to_notify
+        schedule = schedule.next_schedule
+
+    return on_duty
+
+
+def test_get_member_on_duty_matches_replaying_rotations(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+
+    for hours in range(-24 * 7, 24 * 7 * 10, 5):
+        at = next_rotation + datetime.timedelta(hours=hours)
+        assert calendar.get_member_on_duty(schedule_id=schedule.id, at=at) == _replay_member_on_duty(schedule=schedule, at=at)
+
+
+def test_get_member_on_duty_at_rotation_boundaries(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+
+    assert calendar.get_member_on_duty(schedule_id=schedule.id, at=next_rotation - datetime.timedelta(seconds=1)) == "first"
+    assert calendar.get_member_on_duty(schedule_id=schedule.id, at=next_rotation) == "second"
+    assert calendar.get_member_on_duty(schedule_id=schedule.id, at=next_rotation + datetime.timedelta(days=7)) == "third"
+    assert calendar.get_member_on_duty(schedule_id=schedule.id, at=next_rotation + datetime.timedelta(days=14)) == "first"
+
+
+def test_get_member_on_duty_of_unknown_schedule(next_rotation: datetime.datetime) -> None:
+    assert RotationCalendar().get_member_on_duty(schedule_id="unknown", at=next_rotation) is None
+
+
+def test_get_members_on_duty(schedule: Schedule, other_schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule, other_schedule])
+
+    assert calendar.get_members_on_duty(at=next_rotation + datetime.timedelta(days=4)) == {
+        schedule.id: "second",
+        other_schedule.id: "first",
+    }
+
+
+def test_get_upcoming_rotations(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+
+    assert calendar.get_upcoming_rotations(schedule_id=schedule.id, count=4) == [
+        Rotation(
+            schedule_id=schedule.id,
+            member=member,
+            start=next_rotation + datetime.timedelta(days=7 * i),
+            end=next_rotation + datetime.timedelta(days=7 * (i + 1)),
+        )
+        for i, member in enumerate(["second", "third", "first", "second"])
+    ]
+
+
+def test_get_upcoming_rotations_is_cached_per_schedule_version(schedule: Schedule) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+
+    rotations = calendar.get_upcoming_rotations(schedule_id=schedule.id, count=3)
+    assert calendar.get_upcoming_rotations(schedule_id=schedule.id, count=2) == rotations[:2]
+    assert calendar.get_upcoming_rotations(schedule_id=schedule.id, count=3)[0] is rotations[0]
+
+    next_schedule = schedule.next_schedule
+    calendar.update_schedule(schedule=next_schedule)
+
+    assert calendar.get_upcoming_rotations(schedule_id=schedule.id, count=2) == rotations[1:3]
+    assert calendar.get_upcoming_rotations(schedule_id=schedule.id, count=1)[0] is not rotations[1]
+
+
+def test_get_upcoming_rotations_of_unknown_schedule() -> None:
+    assert RotationCalendar().get_upcoming_rotations(schedule_id="unknown", count=3) == []
+
+
+def test_get_rotations_of_member_across_schedules(
+    schedule: Schedule, other_schedule: Schedule, next_rotation: datetime.datetime
+) -> None:
+    calendar = RotationCalendar(schedules=[schedule, other_schedule])
+
+    rotations = calendar.get_rotations_of_member(
+        member="first", start=next_rotation, end=next_rotation + datetime.timedelta(days=21)
+    )
+
+    assert [(r.schedule_id, r.start) for r in rotations] == [
+        (other_schedule.id, next_rotation + datetime.timedelta(days=2)),
+        (other_schedule.id, next_rotation + datetime.timedelta(days=8)),
+        (schedule.id, next_rotation + datetime.timedelta(days=14)),
+        (other_schedule.id, next_rotation + datetime.timedelta(days=14)),
+        (other_schedule.id, next_rotation + datetime.timedelta(days=20)),
+    ]
+    assert all(r.member == "first" for r in rotations)
+
+
+def test_get_rotations_of_member_includes_the_rotation_in_progress(
+    schedule: Schedule, next_rotation: datetime.datetime
+) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+
+    rotations = calendar.get_rotations_of_member(
+        member="first", start=next_rotation - datetime.timedelta(days=1), end=next_rotation + datetime.timedelta(days=14)
+    )
+
+    assert [r.start for r in rotations] == [next_rotation - datetime.timedelta(days=7)]
+
+
+def test_get_rotations_of_member_listed_twice(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    schedule = dataclasses.replace(schedule, members=["first", "second", "first"], current_index=0)
+    calendar = RotationCalendar(schedules=[schedule])
+
+    rotations = calendar.get_rotations_of_member(
+        member="first", start=next_rotation, end=next_rotation + datetime.timedelta(days=21)
+    )
+
+    assert [r.start for r in rotations] == [next_rotation, next_rotation + datetime.timedelta(days=14)]
+
+
+def test_get_rotations_of_member_listed_at_interleaving_positions(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    schedule = dataclasses.replace(
+        schedule, members=["x", "y", "x", "z"], time_between_rotations=datetime.timedelta(days=1), current_index=0
+    )
+    calendar = RotationCalendar(schedules=[schedule])
+
+    rotations = calendar.get_rotations_of_member(
+        member="x", start=next_rotation, end=next_rotation + datetime.timedelta(days=12)
+    )
+
+    assert [(r.start - next_rotation).days for r in rotations] == [0, 2, 4, 6, 8, 10]
+
+
+def test_removed_schedules_have_no_rotations(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+    calendar.get_upcoming_rotations(schedule_id=schedule.id, count=3)
+    calendar.remove_schedule(schedule_id=schedule.id)
+
+    assert calendar._upcoming_rotations == dict()
+    assert calendar.get_member_on_duty(schedule_id=schedule.id, at=next_rotation) is None
+    assert (
+        calendar.get_rotations_of_member(member="first", start=next_rotation, end=next_rotation + datetime.timedelta(days=21))
+        == []
+    )
+
+
+def test_updated_members_replace_the_previous_members(schedule: Schedule, next_rotation: datetime.datetime) -> None:
+    calendar = RotationCalendar(schedules=[schedule])
+    calendar.update_schedule(schedule=dataclasses.replace(schedule, members=["second", "third"], current_index=0))
+
+    assert (
+        calendar.get_rotations_of_member(member="first", start=next_rotation, end=next_rotation + datetime.timedelta(days=21))
+        == []
+    )
@@ -0,0 +1,58 @@
+import datetime
+import json
+import uuid
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.views.app_home import (
+    get_app_home_view,
+    SCHEDULES_PER_PAGE,
+    get_schedule_page_block,
+    PREVIOUS_PAGE_ACTION_ID,
+    NEXT_PAGE_ACTION_ID,
+)
+
+# the maximum number of blocks of a view
+MAX_VIEW_BLOCKS = 100
+
+
+def _create_schedule(index: int) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name=f"Rotation Schedule {index}",
+        members=["U1", "U2"],
+        next_rotation=datetime.datetime.now() + datetime.timedelta(hours=index),
+        time_between_rotations=datetime.timedelta(hours=2),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+def test_full_page_fits_into_a_view() -> None:
+    schedules = [_create_schedule(index=i) for i in range(SCHEDULES_PER_PAGE)]
+
+    view = get_app_home_view(
+        schedules=schedules,
+        previous_page_cursor=SchedulePageCursor.before(schedule=schedules[0], sort_order=ScheduleSortOrder.NEXT_ROTATION),
+        next_page_cursor=SchedulePageCursor.after(schedule=schedules[-1], sort_order=ScheduleSortOrder.NEXT_ROTATION),
+    )
+
+    # serializing validates the number of blocks as well
+    assert len(view.to_dict()["blocks"]) <= MAX_VIEW_BLOCKS
+
+
+def test_page_buttons_carry_their_cursor() -> None:
+    schedule = _create_schedule(index=0)
+    previous_page_cursor = SchedulePageCursor.before(schedule=schedule, sort_order=ScheduleSortOrder.NEXT_ROTATION)
+    next_page_cursor = SchedulePageCursor.after(schedule=schedule, sort_order=ScheduleSortOrder.DISPLAY_NAME)
+
+    page_block = get_schedule_page_block(previous_page_cursor=previous_page_cursor, next_page_cursor=next_page_cursor)
+
+    assert page_block is not None
+    buttons = {b["action_id"]: b["value"] for b in page_block.to_dict()["elements"]}
+    assert SchedulePageCursor.from_json(json.loads(buttons[PREVIOUS_PAGE_ACTION_ID])) == previous_page_cursor
+    assert SchedulePageCursor.from_json(json.loads(buttons[NEXT_PAGE_ACTION_ID])) == next_page_cursor
+
+
+def test_single_page_has_no_page_buttons() -> None:
+    assert get_schedule_page_block(previous_page_cursor=None, next_page_cursor=None) is None
@@ -0,0 +1,156 @@
+import datetime
+import threading
+from typing import List, Dict
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.views.app_home_publisher import AppHomePublisher, AppHomePublisherMetrics, SerializedView
+
+
+class RecordingViews:
+    def __init__(self) -> None:
+        self.views_by_user: Dict[str, SerializedView] = dict()
+        self.published: List[SerializedView] = list()
+        self.published_event = threading.Event()
+
+    def render_view(self, user_id: str) -> SerializedView:
+        return self.views_by_user[user_id]
+
+    def publish_view(self, user_id: str, view: SerializedView) -> None:
+        self.published.append(view)
+        self.published_event.set()
+
+
+@pytest.fixture
+def views() -> RecordingViews:
+    return RecordingViews()
+
+
+def test_publisher_rejects_negative_window(views: RecordingViews) -> None:
+    with pytest.raises(ValueError):
+        AppHomePublisher(render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(seconds=-1))
+
+
+def test_publisher_without_window_publishes_immediately(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(0))
+    views.views_by_user["U1"] = {"blocks": [1]}
+
+    publisher.request_publish(user_id="U1")
+
+    assert views.published == [{"blocks": [1]}]
+
+
+def test_publisher_skips_unchanged_views(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(0))
+    views.views_by_user["U1"] = {"type": "home", "blocks": [1]}
+    views.views_by_user["U2"] = {"type": "home", "blocks": [1]}
+
+    publisher.request_publish(user_id="U1")
+    # equal views with a different key order are unchanged as well
+    views.views_by_user["U1"] = {"blocks": [1], "type": "home"}
+    publisher.request_publish(user_id="U1")
+    # the last view is remembered per user
+    publisher.request_publish(user_id="U2")
+    views.views_by_user["U1"] = {"type": "home", "blocks": [2]}
+    publisher.request_publish(user_id="U1")
+
+    assert views.published == [
+        {"type": "home", "blocks": [1]},
+        {"type": "home", "blocks": [1]},
+        {"type": "home", "blocks": [2]},
+    ]
+    assert publisher.metrics == AppHomePublisherMetrics(requested=4, published=3, unchanged=1)
+
+
+def test_publisher_publishes_view_again_after_failure(views: RecordingViews) -> None:
+    publish_view = mock.MagicMock(side_effect=[RuntimeError("Slack is down"), None])
+    publisher = AppHomePublisher(render_view=views.render_view, publish_view=publish_view, window=datetime.timedelta(0))
+    views.views_by_user["U1"] = {"blocks": [1]}
+
+    publisher.request_publish(user_id="U1")
+    publisher.request_publish(user_id="U1")
+
+    assert publish_view.call_count == 2
+    assert publisher.metrics == AppHomePublisherMetrics(requested=2, published=1, failed=1)
+
+
+def test_publisher_counts_failed_renders(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(0))
+
+    publisher.request_publish(user_id="unknown")
+
+    assert views.published == []
+    assert publisher.metrics == AppHomePublisherMetrics(requested=1, failed=1)
+
+
+def test_publisher_coalesces_requests_within_window(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(
+        render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(milliseconds=50)
+    )
+    views.views_by_user["U1"] = {"blocks": [1]}
+
+    for _ in range(3):
+        publisher.request_publish(user_id="U1")
+    # the view is rendered once the window is over and shows the latest state
+    views.views_by_user["U1"] = {"blocks": [2]}
+
+    assert views.published_event.wait(timeout=5)
+    assert views.published == [{"blocks": [2]}]
+    assert publisher.metrics.requested == 3
+    assert publisher.metrics.coalesced == 2
+
+    # requests after the publish start a new window
+    views.published_event.clear()
+    views.views_by_user["U1"] = {"blocks": [3]}
+    publisher.request_publish(user_id="U1")
+
+    assert views.published_event.wait(timeout=5)
+    assert views.published == [{"blocks": [2]}, {"blocks": [3]}]
+
+
+def test_publisher_publishes_again_after_a_running_publish_of_the_same_user(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(render_view=views.render_view, publish_view=views.publish_view, window=datetime.timedelta(0))
+    views.views_by_user["U1"] = {"blocks": [1]}
+    publishing = threading.Event()
+    release = threading.Event()
+
+    def publish_view(user_id: str, view: SerializedView) -> None:
+        publishing.set()
+        assert release.wait(timeout=5)
+        views.publish_view(user_id=user_id, view=view)
+
+    publisher._publish_view = publish_view
+    running_publish = threading.Thread(target=publisher.request_publish, args=("U1",))
+    running_publish.start()
+    assert publishing.wait(timeout=5)
+
+    # both requests are published once, after the running publish and with the latest state
+    views.views_by_user["U1"] = {"blocks": [2]}
+    publisher.request_publish(user_id="U1")
+    views.views_by_user["U1"] = {"blocks": [3]}
+    publisher.request_publish(user_id="U1")
+    assert views.published == []
+
+    release.set()
+    running_publish.join(timeout=5)
+
+    assert views.published == [{"blocks": [1]}, {"blocks": [3]}]
+    assert publisher.metrics == AppHomePublisherMetrics(requested=3, published=2, coalesced=1)
+
+
+def test_publisher_without_skipping_unchanged_views_publishes_every_view(views: RecordingViews) -> None:
+    publisher = AppHomePublisher(
+        render_view=views.render_view,
+        publish_view=views.publish_view,
+        window=datetime.timedelta(0),
+        skip_unchanged_views=False,
+    )
+    views.views_by_user["U1"] = {"blocks": [1]}
+
+    publisher.request_publish(user_id="U1")
+    # another replica may have published another view since
+    publisher.request_publish(user_id="U1")
+
+    assert views.published == [{"blocks": [1]}, {"blocks": [1]}]
+    assert publisher.metrics == AppHomePublisherMetrics(requested=2, published=2)
@@ -0,0 +1,92 @@
+import datetime
+import uuid
+from typing import Any, Dict, List, Generator
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.model.schedule_page import ScheduleSortOrder, SchedulePageCursor
+from sched_slack_bot.views import app_home_render_cache
+from sched_slack_bot.views.app_home import get_app_home_view
+from sched_slack_bot.views.app_home_render_cache import AppHomeRenderCache
+from sched_slack_bot.views.schedule_blocks import blocks_for_schedule
+
+
+@pytest.fixture
+def schedules() -> List[Schedule]:
+    return [
+        Schedule(
+            id=str(uuid.uuid4()),
+            display_name=f"Rotation Schedule {i}",
+            members=["U1", "U2"],
+            next_rotation=datetime.datetime.now() + datetime.timedelta(hours=i),
+            time_between_rotations=datetime.timedelta(hours=2),
+            channel_id_to_notify_in="C1",
+            created_by="creator",
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def mocked_blocks_for_schedule() -> Generator[mock.MagicMock, None, None]:
+    with mock.patch.object(app_home_render_cache, "blocks_for_schedule", wraps=blocks_for_schedule) as mocked:
+        yield mocked
+
+
+@pytest.mark.parametrize("show_all_schedules", [True, False])
+def test_get_app_home_view_equals_rendered_view(schedules: List[Schedule], show_all_schedules: bool) -> None:
+    render_cache = AppHomeRenderCache()
+
+    for _ in range(2):
+        assert (
+            render_cache.get_app_home_view(schedules=schedules, show_all_schedules=show_all_schedules)
+            == get_app_home_view(schedules=schedules, show_all_schedules=show_all_schedules).to_dict()
+        )
+
+
+def test_get_app_home_view_of_a_page(schedules: List[Schedule]) -> None:
+    page_view: Dict[str, Any] = {
+        "schedules": schedules,
+        "sort_order": ScheduleSortOrder.DISPLAY_NAME,
+        "previous_page_cursor": SchedulePageCursor.before(schedule=schedules[0], sort_order=ScheduleSortOrder.DISPLAY_NAME),
+        "next_page_cursor": SchedulePageCursor.after(schedule=schedules[-1], sort_order=ScheduleSortOrder.DISPLAY_NAME),
+        "private_metadata": '{"show_all_schedules": false}',
+    }
+
+    assert AppHomeRenderCache().get_app_home_view(**page_view) == get_app_home_view(**page_view).to_dict()
+
+
+def test_get_app_home_view_without_schedules() -> None:
+    assert AppHomeRenderCache().get_app_home_view(schedules=[]) == get_app_home_view(schedules=[]).to_dict()
+
+
+def test_only_changed_schedules_are_rendered_again(
+    schedules: List[Schedule], mocked_blocks_for_schedule: mock.MagicMock
+) -> None:
+    render_cache = AppHomeRenderCache()
+    render_cache.get_app_home_view(schedules=schedules)
+    assert mocked_blocks_for_schedule.call_count == len(schedules)
+
+    mocked_blocks_for_schedule.reset_mock()
+    changed_schedules = [schedules[0].next_schedule, *schedules[1:]]
+
+    assert (
+        render_cache.get_app_home_view(schedules=changed_schedules) == get_app_home_view(schedules=changed_schedules).to_dict()
+    )
+    mocked_blocks_for_schedule.assert_called_once_with(schedule=changed_schedules[0])
+
+
+def test_least_recently_shown_schedules_are_evicted(
+    schedules: List[Schedule], mocked_blocks_for_schedule: mock.MagicMock
+) -> None:
+    render_cache = AppHomeRenderCache(max_cached_schedules=2)
+    render_cache.get_app_home_view(schedules=schedules)
+
+    mocked_blocks_for_schedule.reset_mock()
+    render_cache.get_app_home_view(schedules=schedules[1:])
+    mocked_blocks_for_schedule.assert_not_called()
+
+    render_cache.get_app_home_view(schedules=schedules[:1])
+    mocked_blocks_for_schedule.assert_called_once_with(schedule=schedules[0])
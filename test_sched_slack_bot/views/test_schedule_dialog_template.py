@@ -0,0 +1,64 @@
+import datetime
+import uuid
+from typing import Optional, Generator
+from unittest import mock
+
+import pytest
+
+from sched_slack_bot.model.schedule import Schedule
+from sched_slack_bot.views import schedule_dialog_template
+from sched_slack_bot.views.schedule_dialog import get_edit_schedule_block, ScheduleDialogCallback
+from sched_slack_bot.views.schedule_dialog_template import get_schedule_dialog_view
+
+
+@pytest.fixture(autouse=True)
+def mocked_uuid() -> Generator[mock.MagicMock, None, None]:
+    with mock.patch(target="sched_slack_bot.views.schedule_dialog.uuid", return_value="uuid") as mocked:
+        yield mocked
+
+
+def _create_schedule(next_rotation: datetime.datetime) -> Schedule:
+    return Schedule(
+        id=str(uuid.uuid4()),
+        display_name="Rotation Schedule",
+        members=["U1", "U2"],
+        next_rotation=next_rotation,
+        time_between_rotations=datetime.timedelta(hours=2, minutes=1),
+        channel_id_to_notify_in="C1",
+        created_by="creator",
+    )
+
+
+@pytest.mark.parametrize(
+    "schedule",
+    [
+        None,
+        _create_schedule(next_rotation=datetime.datetime(year=2022, month=1, day=1, hour=0, minute=0)),
+        _create_schedule(next_rotation=datetime.datetime(year=2022, month=12, day=31, hour=23, minute=59)),
+    ],
+)
+@pytest.mark.parametrize("callback", list(ScheduleDialogCallback))
+def test_get_schedule_dialog_view_equals_built_view(schedule: Optional[Schedule], callback: ScheduleDialogCallback) -> None:
+    assert (
+        get_schedule_dialog_view(schedule=schedule, callback=callback)
+        == get_edit_schedule_block(schedule=schedule, callback=callback).to_dict()
+    )
+
+
+def test_templates_are_not_modified_by_rendered_views() -> None:
+    schedule = _create_schedule(next_rotation=datetime.datetime(year=2022, month=1, day=1, hour=10, minute=30))
+    other_schedule = _create_schedule(next_rotation=datetime.datetime(year=2023, month=2, day=2, hour=11, minute=45))
+
+    view = get_schedule_dialog_view(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG)
+    get_schedule_dialog_view(schedule=other_schedule, callback=ScheduleDialogCallback.EDIT_DIALOG)
+
+    assert view == get_edit_schedule_block(schedule=schedule, callback=ScheduleDialogCallback.EDIT_DIALOG).to_dict()
+    assert get_schedule_dialog_view() == get_edit_schedule_block().to_dict()
+
+
+def test_get_schedule_dialog_view_shows_current_timezone() -> None:
+    with mock.patch.object(schedule_dialog_template, "get_timezone_name", return_value="CEST"):
+        view = get_schedule_dialog_view()
+
+    hints = [b["hint"]["text"] for b in view["blocks"] if "hint" in b]
+    assert len([h for h in hints if h.endswith("(in CEST)")]) == 2